@@ -1,7 +1,7 @@
 from .automaton import Automaton
 from .flow import TasksFlow
 from .run_context import RunContext
-from .types import BaseTask, FileTask, InstructionForAutomaton, TaskReturn
+from .types import BaseTask, BatchFileTask, FileTask, InstructionForAutomaton, TaskReturn
 
 __all__ = [
     "Automaton",
@@ -9,6 +9,7 @@ __all__ = [
     "RunContext",
     "FileTask",
     "BaseTask",
+    "BatchFileTask",
     "TaskReturn",
     "TasksFlow",
 ]
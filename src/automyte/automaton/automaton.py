@@ -1,12 +1,18 @@
+import asyncio
+import dataclasses
+import time
 import typing as t
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
 
 from automyte.config import Config, ConfigParams
-from automyte.history import AutomatonRunResult, History, InMemoryHistory
+from automyte.history import AutomatonRunResult, History, InMemoryHistory, RunMetrics
 from automyte.project import Project, ProjectURI
+from automyte.utils.processes import workers_mp_context
+from automyte.utils.random import random_hash
 
 from .flow import TasksFlow
 from .run_context import RunContext
-from .types import FileTask
+from .types import BatchFileTask, FileTask
 
 
 class Automaton:
@@ -14,13 +20,14 @@ class Automaton:
         self,
         name: str,
         projects: list[Project | ProjectURI],
-        tasks: TasksFlow | list[FileTask],
+        tasks: TasksFlow | list[FileTask | BatchFileTask],
         config: Config | None = None,
         history: History | None = None,
     ):
         self.name = name
         self.config: Config = config or Config.get_default()
         self.history: History = history or InMemoryHistory()
+        self.run_id = random_hash()  # Regenerated for each run, to tell apart history records of different runs.
 
         self.projects: list[Project] = []
         for project in projects:
@@ -37,49 +44,216 @@ class Automaton:
     def run(self, skip_validation: bool = False, config_overrides: ConfigParams | None = None):
         self.setup(config=self.config, config_overrides=config_overrides)
         self.validate(skip_validation)
+        self.run_id = random_hash()
 
-        for project in self._get_target_projects():
+        try:
+            if self.config.workers > 1:
+                return self._run_in_worker_processes(max_workers=self.config.workers)
+
+            for project in self._get_target_projects():
+                result = AutomatonRunResult(status="running")
+                previous_result = self.history.get_status(self.name, project.project_id)
+                self.history.mark_running(self.name, [project.project_id])
+
+                try:
+                    result = self._run_project(project, previous_result=previous_result)
+
+                finally:
+                    self._update_history(project, result)
+
+                if self.config.stop_on_fail and result.status == "fail":
+                    break
+
+        finally:
+            self.history.flush()
+
+    def _run_in_worker_processes(self, max_workers: int):
+        """Run projects in a pool of worker processes, keeping at most `max_workers` of them in flight.
+
+        History is only ever updated from the main process, as soon as each project is finished.
+        If `stop_on_fail` is set - no new projects are submitted after the first failure,
+            but the ones already in flight are allowed to finish and get their results saved.
+        """
+        targets = self._get_target_projects()
+        in_flight: dict[Future[AutomatonRunResult], Project] = {}
+        should_stop = False
+
+        with ProcessPoolExecutor(
+            max_workers=max_workers,
+            mp_context=workers_mp_context(),
+            initializer=_init_worker,
+            initargs=(self,),
+        ) as executor:
+            while True:
+                batch: list[tuple[Project, AutomatonRunResult]] = []
+                while not should_stop and len(in_flight) + len(batch) < max_workers:
+                    project = next(targets, None)
+                    if project is None:
+                        break
+
+                    batch.append((project, self.history.get_status(self.name, project.project_id)))
+
+                # Whole batch is marked as running at once, right before it's submitted.
+                if batch:
+                    self.history.mark_running(self.name, [project.project_id for project, _ in batch])
+                for project, previous_result in batch:
+                    in_flight[executor.submit(_run_project_in_worker, project.project_id, previous_result)] = project
+
+                if not in_flight:
+                    break
+
+                finished, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    project = in_flight.pop(future)
+                    try:
+                        result = future.result()
+                    except Exception as e:  # Worker process itself has died, like BrokenProcessPool.
+                        result = AutomatonRunResult(status="fail", error=str(e))
+
+                    self._update_history(project, result)
+
+                    if self.config.stop_on_fail and result.status == "fail":
+                        should_stop = True
+
+    async def arun(
+        self,
+        skip_validation: bool = False,
+        config_overrides: ConfigParams | None = None,
+        concurrency: int | None = None,
+    ):
+        """Coroutine counterpart of `run`, which keeps up to `concurrency` projects in flight on the event loop.
+
+        Useful when most of the time is spent waiting for vcs commands or files, rather than on actual processing.
+        If `concurrency` is not given - `config.workers` is used as the limit.
+        If `stop_on_fail` is set - no new projects are started after the first failure,
+            but the ones already in flight are allowed to finish and get their results saved.
+        """
+        self.setup(config=self.config, config_overrides=config_overrides)
+        self.validate(skip_validation)
+        self.run_id = random_hash()
+
+        slots = asyncio.Semaphore(concurrency or self.config.workers)
+        should_stop = False
+        # History backends (like InFileHistory) can block on I/O and are not thread-safe,
+        #   so their calls are run in a thread, but still one at a time.
+        history_lock = asyncio.Lock()
+
+        async def call_history(method: t.Callable[..., t.Any], *args: t.Any) -> t.Any:
+            async with history_lock:
+                return await asyncio.to_thread(method, *args)
+
+        async def run_project(project: Project):
+            nonlocal should_stop
             result = AutomatonRunResult(status="running")
-            previous_result = self.history.get_status(self.name, project.project_id)
-            ctx = RunContext(
-                automaton_name=self.name,
-                config=self.config,
-                vcs=project.vcs,
-                project=project,
-                current_status=result,
-                previous_status=previous_result,
-                global_tasks_returns=[],
-                file_tasks_returns=[],
-            )
 
             try:
-                result = self._execute_for_project(project, ctx)
-
-            except Exception as e:
-                result = AutomatonRunResult(status="fail", error=str(e))
+                previous_result = await call_history(self.history.get_status, self.name, project.project_id)
+                await call_history(self.history.mark_running, self.name, [project.project_id])
+                result = await self._arun_project(project, previous_result=previous_result)
 
             finally:
-                self._update_history(project, result)
+                await call_history(self._update_history, project, result)
+                # Has to be set before releasing the slot, so that no new projects are started after the failure.
+                if self.config.stop_on_fail and result.status == "fail":
+                    should_stop = True
+                slots.release()
+
+        try:
+            async with asyncio.TaskGroup() as in_flight:
+                for project in await call_history(lambda: list(self._get_target_projects())):
+                    await slots.acquire()
+                    if should_stop:
+                        slots.release()
+                        break
+
+                    in_flight.create_task(run_project(project))
+
+        finally:
+            await call_history(self.history.flush)
+
+    def _run_project(self, project: Project, previous_result: AutomatonRunResult) -> AutomatonRunResult:
+        ctx = self._build_run_context(project, previous_result=previous_result)
+        project.explorer.reset_stats()
+        started_at, started_counter, started_cpu = time.time(), time.perf_counter(), time.process_time()
+
+        try:
+            result = self._execute_for_project(project, ctx)
+
+        except Exception as e:
+            result = AutomatonRunResult(status="fail", error=str(e))
+
+        return self._with_metrics(result, project, started_at, started_counter, started_cpu)
+
+    async def _arun_project(self, project: Project, previous_result: AutomatonRunResult) -> AutomatonRunResult:
+        ctx = self._build_run_context(project, previous_result=previous_result)
+        project.explorer.reset_stats()
+        started_at, started_counter, started_cpu = time.time(), time.perf_counter(), time.process_time()
+
+        try:
+            async with project.ain_working_state(ctx.config):
+                result = await self.flow.aexecute(project=project, ctx=ctx)
+
+        except Exception as e:
+            result = AutomatonRunResult(status="fail", error=str(e))
 
-            if self.config.stop_on_fail and result.status == "fail":
-                break
+        return self._with_metrics(result, project, started_at, started_counter, started_cpu)
+
+    def _with_metrics(
+        self,
+        result: AutomatonRunResult,
+        project: Project,
+        started_at: float,
+        started_counter: float,
+        started_cpu: float,
+    ) -> AutomatonRunResult:
+        stats = project.explorer.get_stats()
+        metrics = RunMetrics(
+            run_id=self.run_id,
+            started_at=started_at,
+            finished_at=time.time(),
+            wall_time=time.perf_counter() - started_counter,
+            cpu_time=time.process_time() - started_cpu,
+        )
+        if stats is not None:
+            metrics.files_scanned = stats.files_scanned
+            metrics.files_modified = stats.files_modified
+            metrics.bytes_read = stats.bytes_read
+            metrics.bytes_written = stats.bytes_written
+            metrics.files_skipped = stats.files_skipped
+
+        return dataclasses.replace(result, metrics=metrics)
+
+    def _build_run_context(self, project: Project, previous_result: AutomatonRunResult) -> RunContext:
+        return RunContext(
+            automaton_name=self.name,
+            config=self.config,
+            vcs=project.vcs,
+            project=project,
+            current_status=AutomatonRunResult(status="running"),
+            previous_status=previous_result,
+            global_tasks_returns=[],
+            file_tasks_returns=[],
+        )
 
     def _get_target_projects(self) -> t.Generator[Project, None, None]:
         targets = {p.project_id: p for p in self.projects}
-        projects_in_history = self.history.read(self.name)
         filter_by_status = lambda status: {  # Get projects from targets based on their status in history.
-            proj_id: targets[proj_id] for proj_id, run in projects_in_history.items() if run.status == status
+            proj_id: targets[proj_id]
+            for proj_id, _ in self.history.query(self.name, statuses=[status])
+            if proj_id in targets
         }
 
         match self.config.target:
             case "all":
                 pass
             case "new":
-                new_targets = filter_by_status("new")
-                targets = {  # Including projects that are not in the history yet (if added for 2nd run for example).
-                    **new_targets,
-                    **{pid: proj for pid, proj in targets.items() if pid not in projects_in_history},
+                # Projects that are not in the history yet are new as well (if added for 2nd run for example).
+                already_ran = {
+                    proj_id
+                    for proj_id, run in self.history.query(self.name, project_ids=targets)
+                    if run.status != "new"
                 }
+                targets = {pid: proj for pid, proj in targets.items() if pid not in already_ran}
             case "failed":
                 targets = filter_by_status("fail")
             case "successful":
@@ -120,3 +294,21 @@ class Automaton:
 
         for project in self.projects:
             project.run_validations()
+
+
+# Worker processes state, populated once per process by the pool initializer.
+_worker_automaton: Automaton | None = None
+_worker_projects: dict[str, Project] = {}
+
+
+def _init_worker(automaton: Automaton):
+    global _worker_automaton, _worker_projects
+    _worker_automaton = automaton
+    _worker_projects = {p.project_id: p for p in automaton.projects}
+
+
+def _run_project_in_worker(project_id: str, previous_result: AutomatonRunResult) -> AutomatonRunResult:
+    if _worker_automaton is None:
+        raise RuntimeError("Worker process has not been initialized with an automaton.")
+
+    return _worker_automaton._run_project(_worker_projects[project_id], previous_result=previous_result)
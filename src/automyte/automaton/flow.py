@@ -1,22 +1,37 @@
+import asyncio
+import inspect
+import itertools
 import typing as t
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 
 from automyte.discovery import File
 from automyte.history import AutomatonRunResult
 from automyte.project import Project
 
 from .run_context import RunContext
-from .types import BaseTask, FileTask, InstructionForAutomaton, TaskReturn
+from .types import BaseTask, BatchFileTask, FileTask, InstructionForAutomaton, TaskReturn
 
 
 class TasksFlow:
     def __init__(
         self,
-        *tasks: FileTask | list[FileTask],
+        *tasks: FileTask | BatchFileTask | list[FileTask | BatchFileTask],
         preprocess: list[BaseTask] | None = None,
         postprocess: list[BaseTask] | None = None,
+        file_workers: int = 1,
     ):
+        """Setup tasks to be run by automaton for each project.
+
+        If `file_workers` is above 1 - tasks for different files are run concurrently on a pool of that many threads
+            (or that many files at a time for `aexecute()`).
+            Only makes sense for tasks which release GIL (like doing I/O or calling subprocesses)
+            and requires project explorer to support `mark_changed()`.
+
+        If any of the tasks is a BatchFileTask - files are processed in chunks (see `_process_files_in_batches`).
+        """
         self.preprocess_tasks = preprocess or []
         self.postprocess_tasks = postprocess or []
+        self.file_workers = file_workers
 
         self.tasks = []
         for task in tasks:
@@ -31,13 +46,15 @@ class TasksFlow:
             if result:
                 return result
 
-        for file in project.explorer.explore():
-            for process_file_task in self.tasks:
-                result = execute_task(ctx=ctx, task=process_file_task, file=file)
-                if result:
-                    return result
+        if any(isinstance(task, BatchFileTask) for task in self.tasks):
+            result = self._process_files_in_batches(project=project, ctx=ctx)
+        elif self.file_workers > 1:
+            result = self._process_files_concurrently(project=project, ctx=ctx)
+        else:
+            result = self._process_files(project=project, ctx=ctx)
 
-            ctx.cleanup_file_returns()
+        if result:
+            return result
 
         # Has to be called prior to postprocess tasks, otherwise files changes are not reflected on disk before vcs calls.
         project.apply_changes()
@@ -49,6 +66,204 @@ class TasksFlow:
 
         return AutomatonRunResult(status="success")
 
+    def _process_files(self, project: Project, ctx: "RunContext") -> AutomatonRunResult | None:
+        for file in project.explorer.explore():
+            result = self._process_file(ctx=ctx, file=file)
+            if result:
+                return result
+
+            ctx.cleanup_file_returns()
+
+        return None
+
+    def _process_files_concurrently(self, project: Project, ctx: "RunContext") -> AutomatonRunResult | None:
+        """Run tasks for each file on a bounded thread pool.
+
+        Each file gets its own copy of ctx, so that tasks returns of different files don't get mixed up.
+        Explorer is still iterated in the calling thread, queueing at most 2 files per worker at a time.
+        On the first abort/skip - outstanding files are cancelled and returns of that file are copied into ctx,
+            so the result is the same as if files were processed one by one.
+        """
+        files = project.explorer.explore()
+        in_flight: dict[Future[AutomatonRunResult | None], tuple[File, RunContext]] = {}
+
+        executor = ThreadPoolExecutor(max_workers=self.file_workers)
+        try:
+            while True:
+                for file in itertools.islice(files, self.file_workers * 2 - len(in_flight)):
+                    file_ctx = ctx.for_file()
+                    in_flight[executor.submit(self._process_file, ctx=file_ctx, file=file)] = (file, file_ctx)
+
+                if not in_flight:
+                    return None
+
+                finished, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    file, file_ctx = in_flight.pop(future)
+                    result = future.result()
+
+                    if result:
+                        ctx.file_tasks_returns.extend(file_ctx.file_tasks_returns)
+                        return result
+
+                    # Explorer might have already moved past this file, so it has to be notified about changes.
+                    if file.is_tainted:
+                        project.explorer.mark_changed(file)
+
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def _process_files_in_batches(self, project: Project, ctx: "RunContext") -> AutomatonRunResult | None:
+        """Collect files into chunks and run each task over the whole chunk, before moving on to the next task.
+
+        Chunk size is the smallest `batch_size` among batch tasks of the flow.
+        Batch tasks are called once per chunk, plain file tasks - once for each file of the chunk
+            (concurrently, if `file_workers` is above 1); each file keeps its own ctx copy,
+            so `previous_return` is still the return of the previous task for that same file.
+        On the first abort/skip - returns immediately with returns of that file copied into ctx.
+        """
+        batch_size = min(task.batch_size for task in self.tasks if isinstance(task, BatchFileTask))
+        files = project.explorer.explore()
+        executor = ThreadPoolExecutor(max_workers=self.file_workers) if self.file_workers > 1 else None
+
+        try:
+            while chunk := list(itertools.islice(files, batch_size)):
+                contexts = [ctx.for_file() for _ in chunk]
+
+                for task in self.tasks:
+                    if isinstance(task, BatchFileTask):
+                        instructions = handle_batch_task_call(ctx=ctx, task=task, files=chunk, files_ctx=contexts)
+                    elif executor:
+                        instructions = list(
+                            executor.map(lambda f, c: handle_task_call(ctx=c, task=task, file=f), chunk, contexts)
+                        )
+                    else:
+                        instructions = []
+                        for file, file_ctx in zip(chunk, contexts):
+                            instructions.append(handle_task_call(ctx=file_ctx, task=task, file=file))
+                            if instructions[-1] != "continue":
+                                break
+
+                    for instruction, file_ctx in zip(instructions, contexts):
+                        if instruction == "continue":
+                            continue
+
+                        ctx.file_tasks_returns.extend(file_ctx.file_tasks_returns)
+                        if instruction == "skip":
+                            return AutomatonRunResult(status="skipped")
+                        else:
+                            return AutomatonRunResult(status="fail", error=str(file_ctx.previous_return.value))
+
+                # Explorer has already moved past the files of the chunk, so it has to be notified about changes.
+                for file in chunk:
+                    if file.is_tainted:
+                        project.explorer.mark_changed(file)
+
+        finally:
+            if executor:
+                executor.shutdown(wait=True, cancel_futures=True)
+
+        return None
+
+    def _process_file(self, ctx: "RunContext", file: File) -> AutomatonRunResult | None:
+        for process_file_task in self.tasks:
+            result = execute_task(ctx=ctx, task=process_file_task, file=file)
+            if result:
+                return result
+
+        return None
+
+    async def aexecute(self, project: Project, ctx: "RunContext"):
+        """Coroutine counterpart of `execute`, used by `Automaton.arun()`.
+
+        Async tasks are awaited directly, plain sync tasks and explorer's files discovery are offloaded to a thread,
+            so that they don't block other projects running on the same event loop.
+        Flows with batch tasks process files in a thread as a whole.
+        """
+        for preprocess_task in self.preprocess_tasks:
+            result = await aexecute_task(ctx=ctx, task=preprocess_task, file=None)
+            if result:
+                return result
+
+        if any(isinstance(task, BatchFileTask) for task in self.tasks):
+            result = await asyncio.to_thread(self._process_files_in_batches, project=project, ctx=ctx)
+        elif self.file_workers > 1:
+            result = await self._aprocess_files_concurrently(project=project, ctx=ctx)
+        else:
+            result = await self._aprocess_files(project=project, ctx=ctx)
+
+        if result:
+            return result
+
+        await asyncio.to_thread(project.apply_changes)
+
+        for post_task in self.postprocess_tasks:
+            result = await aexecute_task(ctx=ctx, task=post_task, file=None)
+            if result:
+                return result
+
+        return AutomatonRunResult(status="success")
+
+    async def _aprocess_files(self, project: Project, ctx: "RunContext") -> AutomatonRunResult | None:
+        files = project.explorer.explore()
+        while (file := await asyncio.to_thread(next, files, None)) is not None:
+            result = await self._aprocess_file(ctx=ctx, file=file)
+            if result:
+                return result
+
+            ctx.cleanup_file_returns()
+
+        return None
+
+    async def _aprocess_files_concurrently(self, project: Project, ctx: "RunContext") -> AutomatonRunResult | None:
+        """Coroutine counterpart of `_process_files_concurrently`, processing at most `file_workers` files at a time.
+
+        Each file is processed in its own asyncio task with its own copy of ctx, sync tasks still go to threads.
+        """
+        files = project.explorer.explore()
+        in_flight: dict[asyncio.Task[AutomatonRunResult | None], tuple[File, RunContext]] = {}
+        files_left = True
+
+        try:
+            while True:
+                while files_left and len(in_flight) < self.file_workers:
+                    file = await asyncio.to_thread(next, files, None)
+                    if file is None:
+                        files_left = False
+                        break
+
+                    file_ctx = ctx.for_file()
+                    in_flight[asyncio.create_task(self._aprocess_file(ctx=file_ctx, file=file))] = (file, file_ctx)
+
+                if not in_flight:
+                    return None
+
+                finished, _ = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+                for task in finished:
+                    file, file_ctx = in_flight.pop(task)
+                    result = task.result()
+
+                    if result:
+                        ctx.file_tasks_returns.extend(file_ctx.file_tasks_returns)
+                        return result
+
+                    # Explorer might have already moved past this file, so it has to be notified about changes.
+                    if file.is_tainted:
+                        project.explorer.mark_changed(file)
+
+        finally:
+            for task in in_flight:
+                task.cancel()
+            await asyncio.gather(*in_flight, return_exceptions=True)
+
+    async def _aprocess_file(self, ctx: "RunContext", file: File) -> AutomatonRunResult | None:
+        for process_file_task in self.tasks:
+            result = await aexecute_task(ctx=ctx, task=process_file_task, file=file)
+            if result:
+                return result
+
+        return None
+
 
 def execute_tasks_sequence(tasks: list[BaseTask], ctx: RunContext, file: File | None):
     """Similar to 'execute_task', except designed to run a sequence of tasks.
@@ -112,6 +327,77 @@ def handle_task_call(ctx: "RunContext", task: BaseTask, file: File | None) -> "I
         return task_result.instruction
 
 
+async def aexecute_task(ctx: "RunContext", task: BaseTask, file: File | None) -> AutomatonRunResult | None:
+    """Coroutine counterpart of `execute_task`."""
+    instruction = await ahandle_task_call(ctx=ctx, task=task, file=file)
+
+    if instruction == "skip":
+        return AutomatonRunResult(status="skipped")
+    elif instruction == "abort":
+        return AutomatonRunResult(status="fail", error=str(ctx.previous_return.value))
+
+    return None
+
+
+async def ahandle_task_call(ctx: "RunContext", task: BaseTask, file: File | None) -> "InstructionForAutomaton":
+    """Coroutine counterpart of `handle_task_call`."""
+    try:
+        task_result = wrap_task_result(await acall_task(ctx=ctx, task=task, file=file))
+
+    except Exception as e:
+        ctx.save_task_result(result=TaskReturn(instruction="abort", value=str(e), status="errored"), file=file)
+        return "abort"
+
+    else:
+        ctx.save_task_result(result=task_result, file=file)
+        return task_result.instruction
+
+
+async def acall_task(ctx: "RunContext", task: BaseTask, file: File | None) -> t.Any:
+    """Call the task in a way, that doesn't block event loop.
+
+    Tasks providing `acall` method (like vcs tasks) or defined as coroutines are awaited directly;
+    Plain sync tasks are run in a separate thread, if they return an awaitable - it is awaited as well.
+    """
+    if hasattr(task, "acall"):
+        return await task.acall(ctx, file)  # pyright: ignore
+
+    if inspect.iscoroutinefunction(task) or inspect.iscoroutinefunction(getattr(task, "__call__", None)):
+        return await task(ctx, file)
+
+    value = await asyncio.to_thread(task, ctx, file)
+    if inspect.isawaitable(value):
+        return await value
+
+    return value
+
+
+def handle_batch_task_call(
+    ctx: "RunContext", task: BatchFileTask, files: list[File], files_ctx: list["RunContext"]
+) -> list["InstructionForAutomaton"]:
+    """Batch counterpart of `handle_task_call`, returns instruction for each of the files.
+
+    Each file's return is saved into that file's own ctx.
+    If the task raised an Exception or returned wrong number of results - all files of the chunk are aborted.
+    """
+    try:
+        values = task(ctx, files)
+        if values is None:
+            values = [None] * len(files)
+        elif len(values) != len(files):
+            raise ValueError(f"Batch task returned {len(values)} results for {len(files)} files.")
+
+        task_results = [wrap_task_result(value) for value in values]
+
+    except Exception as e:
+        task_results = [TaskReturn(instruction="abort", value=str(e), status="errored") for _ in files]
+
+    for file, file_ctx, task_result in zip(files, files_ctx, task_results):
+        file_ctx.save_task_result(result=task_result, file=file)
+
+    return [task_result.instruction for task_result in task_results]
+
+
 def wrap_task_result(value: t.Any) -> TaskReturn:
     if isinstance(value, TaskReturn):
         return value
@@ -1,4 +1,5 @@
 import contextlib
+import dataclasses
 from dataclasses import dataclass
 
 from automyte.config import Config
@@ -11,7 +12,7 @@ from automyte.vcs import VCS
 from .types import TaskReturn
 
 
-@dataclass
+@dataclass(slots=True)
 class RunContext:
     automaton_name: str
     config: Config
@@ -50,3 +51,10 @@ class RunContext:
 
     def cleanup_file_returns(self):
         self.file_tasks_returns.clear()
+
+    def for_file(self) -> "RunContext":
+        """Copy of the context with its own file tasks returns, to process files concurrently.
+
+        Everything else (including pre/post process tasks returns) is shared with the original context.
+        """
+        return dataclasses.replace(self, file_tasks_returns=[])
@@ -9,7 +9,7 @@ if t.TYPE_CHECKING:
 InstructionForAutomaton: t.TypeAlias = t.Literal["abort", "skip", "continue"]
 
 
-@dataclass
+@dataclass(slots=True)
 class TaskReturn:
     value: t.Any = None
     instruction: "InstructionForAutomaton" = "continue"
@@ -18,3 +18,21 @@ class TaskReturn:
 
 BaseTask: t.TypeAlias = t.Callable[["RunContext", File | None], TaskReturn | t.Any]
 FileTask: t.TypeAlias = t.Callable[["RunContext", File], TaskReturn | t.Any]
+
+
+class BatchFileTask:
+    """Base class for tasks, which process files in chunks instead of one by one.
+
+    Useful for tasks with expensive setup, like spawning a subprocess or compiling a lot of patterns,
+        so that it is amortized across many files.
+
+    TasksFlow collects files from explorer into chunks of `batch_size` and calls such tasks once per chunk,
+        while plain file tasks in the same flow are still called for each file of the chunk.
+    Has to return either None (continue for all files) or a list of returns, one per file in the same order;
+        plain values are wrapped into TaskReturns, same as for regular tasks.
+    """
+
+    batch_size: int = 500
+
+    def __call__(self, ctx: "RunContext", files: list[File]) -> list[TaskReturn | t.Any] | None:
+        raise NotImplementedError
@@ -51,6 +51,9 @@ class FileConfigMixin:
             field_name = field.metadata.get("name", field.name)
             kind = field.metadata.get("kind", str)
 
+            if not cfg.has_option(section, param_name):
+                continue
+
             if kind is bool:
                 value = cfg.getboolean(section, param_name)
             elif kind is int:
@@ -46,7 +46,11 @@ def cli_args_parser(fields: t.Sequence[ConfigField]) -> ArgumentParser:
 
         else:
             parser.add_argument(
-                *field.argnames, dest=save_to, type=str, default=field.default_value, help=field.description
+                *field.argnames,
+                dest=save_to,
+                type=int if field.kind is int else str,
+                default=field.default_value,
+                help=field.description,
             )
 
     return parser
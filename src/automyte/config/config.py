@@ -15,6 +15,7 @@ class Config(FileConfigMixin, EnvVarsConfigMixin):
     vcs: VCSConfig
     stop_on_fail: bool = field(default=True, metadata=f.STOP_ON_FAIL.to_dict())
     target: AutomatonTarget = field(default="all", metadata=f.TARGET.to_dict())
+    workers: int = field(default=1, metadata=f.WORKERS.to_dict())
 
     @classmethod
     def setup(
@@ -15,6 +15,7 @@ class ConfigParams(t.TypedDict, total=False):
     stop_on_fail: bool
     target: AutomatonTarget
     mode: RUN_MODES
+    workers: int
     vcs: VCSConfigParams
 
 
@@ -81,6 +82,15 @@ TARGET = ConfigField(
     file_param="config.target",
     env_var="AUTOMYTE_TARGET",
 )
+WORKERS = ConfigField(
+    name="workers",
+    argnames=["-w", "--workers"],
+    default_value=1,
+    kind=int,
+    description="Number of worker processes used to run automaton for several projects at once.",
+    file_param="config.workers",
+    env_var="AUTOMYTE_WORKERS",
+)
 
 #################################################################
 # VCS related fields.
@@ -138,5 +148,5 @@ ALLOW_PUBLISHING = ConfigField(
 )
 
 
-CONFIG_FIELDS = (MODE, STOP_ON_FAIL, TARGET)
+CONFIG_FIELDS = (MODE, STOP_ON_FAIL, TARGET, WORKERS)
 VCS_FIELDS = (DEFAULT_VCS, BASE_BRANCH, WORK_BRANCH, DONT_DISRUPT_PRIOR_STATE, ALLOW_PUBLISHING)
@@ -1,13 +1,26 @@
-from .explorers import LocalFilesExplorer, ProjectExplorer
+from .analysis import ExplorationAnalysis, FilterAnalysis
+from .explorers import FileTable, LocalFilesExplorer, ProjectExplorer
 from .file import File, OSFile
-from .filters import ContainsFilter, Filter, PathFilter
+from .filters import ContainsFilter, ExtensionFilter, Filter, FilterCache, ModifiedFilter, PathFilter, SizeFilter
+from .index import ContentIndex, TrigramIndex
+from .stats import ExplorationStats
 
 __all__ = [
+    "ContentIndex",
+    "ExplorationAnalysis",
+    "ExplorationStats",
     "File",
+    "FileTable",
     "Filter",
+    "FilterCache",
+    "FilterAnalysis",
     "LocalFilesExplorer",
     "ContainsFilter",
+    "ExtensionFilter",
+    "ModifiedFilter",
+    "SizeFilter",
     "OSFile",
     "ProjectExplorer",
     "PathFilter",
+    "TrigramIndex",
 ]
@@ -0,0 +1,156 @@
+import time
+import typing as t
+from dataclasses import dataclass, field
+
+from .file import File
+from .filters.base import AndFilter, Filter, NotFilter, OrFilter
+from .filters.cache import _CachedFilter
+from .filters.planner import AllOf, AnyOf, _SharedFilter
+from .stats import ExplorationStats
+
+if t.TYPE_CHECKING:
+    from .index import ContentIndex
+
+
+@dataclass
+class FilterAnalysis:
+    """How a single node of the filters tree performed, including time and bytes read by its children.
+
+    Nodes shared between several branches of the tree (see `plan_filter`) are reported in each of them,
+        but with the same counters, as they are evaluated only once per file.
+    """
+
+    name: str
+    evaluations: int = 0
+    passes: int = 0
+    time: float = 0.0
+    bytes_read: int = 0
+    children: list["FilterAnalysis"] = field(default_factory=list)
+
+    def format(self, indent: int = 0) -> str:
+        line = (
+            f"{'  ' * indent}{self.name}: {self.evaluations} evaluated, {self.passes} passed, "
+            f"{self.time:.6f}s, {self.bytes_read} bytes read"
+        )
+        return "\n".join([line, *(child.format(indent + 1) for child in self.children)])
+
+    def __str__(self) -> str:
+        return self.format()
+
+
+@dataclass
+class ExplorationAnalysis:
+    """Where the time of the last exploration went: walking folders, matching ignore patterns or filtering.
+
+    Walk time includes matching ignore patterns, but not filtering files. Filters are only evaluated
+        for files which were not dropped before that, like by index or because filters tell upfront
+        that the whole folder matches.
+    """
+
+    dirs_walked: int = 0
+    dirs_pruned: int = 0
+    dirs_ignored: int = 0
+    files_ignored: int = 0
+    files_not_candidates: int = 0
+    walk_time: float = 0.0
+    ignore_time: float = 0.0
+    index_time: float = 0.0
+    filter: FilterAnalysis | None = None
+
+    def format(self) -> str:
+        lines = [
+            f"Walked {self.dirs_walked} folders in {self.walk_time:.6f}s, pruned {self.dirs_pruned} by filters",
+            f"Ignored {self.dirs_ignored} folders and {self.files_ignored} files in {self.ignore_time:.6f}s",
+        ]
+        if self.index_time:
+            lines.append(f"Dropped {self.files_not_candidates} files by index in {self.index_time:.6f}s")
+        if self.filter is not None:
+            lines.extend(["Filters:", self.filter.format(indent=1)])
+
+        return "\n".join(lines)
+
+    def __str__(self) -> str:
+        return self.format()
+
+
+class _AnalyzedFilter(Filter):
+    """Filter which counts how it performs into the analysis, without changing what it does."""
+
+    def __init__(self, filter: Filter, analysis: FilterAnalysis, stats: ExplorationStats) -> None:
+        self.analyzed_filter = filter
+        self.analysis = analysis
+        self.stats = stats
+        self.cost = filter.cost
+
+    def filter(self, file: File) -> bool:
+        bytes_read, started_at = self.stats.bytes_read, time.perf_counter()
+        result = self.analyzed_filter.filter(file)
+
+        self.analysis.time += time.perf_counter() - started_at
+        self.analysis.bytes_read += self.stats.bytes_read - bytes_read
+        self.analysis.evaluations += 1
+        self.analysis.passes += result
+        return result
+
+    def dir_verdict(self, relative_dir: str) -> bool | None:
+        return self.analyzed_filter.dir_verdict(relative_dir)
+
+    def candidates(self, index: "ContentIndex") -> set[str] | None:
+        return self.analyzed_filter.candidates(index)
+
+    def _params(self) -> tuple | None:
+        return self.analyzed_filter._params()
+
+    def children(self) -> list[Filter]:
+        return [self.analyzed_filter]
+
+    def unwrap(self) -> Filter:
+        return self.analyzed_filter.unwrap()
+
+
+def analyze_filter(filter: Filter, stats: ExplorationStats) -> tuple[Filter, FilterAnalysis]:
+    """Wrap every node of the filters tree to count how it performs, returning the root of the analysis tree.
+
+    Bytes read by filters are counted from explorer stats, which files found by the explorer report to.
+    """
+    return _analyze(filter, stats=stats, analyzed={})
+
+
+def _analyze(
+    filter: Filter, stats: ExplorationStats, analyzed: dict[int, tuple[Filter, FilterAnalysis]]
+) -> tuple[Filter, FilterAnalysis]:
+    # Shared nodes are wrapped only once, so that they are still evaluated once per file.
+    if id(filter) in analyzed:
+        return analyzed[id(filter)]
+
+    analysis = FilterAnalysis(name=_describe(filter))
+    children = [_analyze(child, stats, analyzed) for child in filter.children()]
+    analysis.children = [child_analysis for _, child_analysis in children]
+    wrapped_children = [wrapped for wrapped, _ in children]
+
+    inner: Filter
+    if isinstance(filter, (AllOf, AnyOf, AndFilter, OrFilter)):
+        inner = type(filter)(*wrapped_children)
+    elif isinstance(filter, NotFilter):
+        inner = NotFilter(wrapped_children[0])
+    elif isinstance(filter, _SharedFilter):
+        inner = _SharedFilter(wrapped_children[0])
+    elif isinstance(filter, _CachedFilter):
+        inner = _CachedFilter(wrapped_children[0], fingerprint=filter._key, cache=filter.cache)
+    else:
+        inner = filter
+
+    analyzed[id(filter)] = result = (_AnalyzedFilter(inner, analysis=analysis, stats=stats), analysis)
+    return result
+
+
+def _describe(filter: Filter) -> str:
+    if isinstance(filter, (AllOf, AnyOf, AndFilter, OrFilter, NotFilter)):
+        return type(filter).__name__
+    if isinstance(filter, _SharedFilter):
+        return "Shared (evaluated once per file)"
+    if isinstance(filter, _CachedFilter):
+        return "Cached (evaluated on cache misses)"
+
+    params = filter._params()
+    return f"{type(filter).__name__}({', '.join(map(repr, params))})" if params is not None else type(filter).__name__
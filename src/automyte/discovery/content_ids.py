@@ -0,0 +1,58 @@
+import hashlib
+import logging
+import os
+import subprocess
+
+logger = logging.getLogger(__name__)
+
+# Gitlinks (submodules) and symlinks are stored by git as something else than contents of files they point to.
+_NOT_FILE_MODES = ("160000", "120000")
+
+
+def blob_id(contents: bytes) -> str:
+    """Id of the contents, same as git would give to them (`git hash-object`)."""
+    return hashlib.sha1(b"blob %d\0" % len(contents) + contents).hexdigest()
+
+
+def git_blob_ids(rootdir: str) -> dict[str, str]:
+    """Blob ids of files tracked by git under rootdir, which are not changed in the working tree.
+
+    Lets files be recognized by their contents without reading them, including in fresh copies of the project
+        (like worktrees), where every file has a new path and mtime. Paths are relative to rootdir, using "/".
+    Returns nothing if rootdir is not inside of a git repository.
+    """
+    # Both have to list paths relative to rootdir, which can be a subfolder of the repository.
+    tracked = _git(rootdir, "ls-files", "--stage", "-z")
+    changed = _git(rootdir, "diff-files", "--name-only", "--relative", "-z")
+    if tracked is None or changed is None:
+        return {}
+
+    blob_ids = {}
+    for line in tracked.split("\0"):
+        if not line:
+            continue
+
+        info, path = line.split("\t", 1)
+        mode, object_id, stage = info.split(" ")
+        if stage == "0" and mode not in _NOT_FILE_MODES:
+            blob_ids[path] = object_id
+
+    for path in changed.split("\0"):
+        blob_ids.pop(path, None)
+
+    return blob_ids
+
+
+def _git(rootdir: str, *args: str) -> str | None:
+    # Not decoding as text, because file names don't have to be valid utf-8.
+    try:
+        result = subprocess.run(["git", *args], cwd=rootdir, capture_output=True)
+    except OSError as e:
+        logger.debug("[Git %s]: Failed to run %s: %s", rootdir, args, e)
+        return None
+
+    if result.returncode != 0:
+        logger.debug("[Git %s]: Failed to run %s: %s", rootdir, args, os.fsdecode(result.stderr).strip())
+        return None
+
+    return os.fsdecode(result.stdout)
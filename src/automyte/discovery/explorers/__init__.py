@@ -1,7 +1,9 @@
 from .base import ProjectExplorer
+from .file_table import FileTable
 from .local_files import LocalFilesExplorer
 
 __all__ = [
+    "FileTable",
     "ProjectExplorer",
     "LocalFilesExplorer",
 ]
@@ -1,7 +1,9 @@
 import abc
 import typing as t
 
+from ..analysis import ExplorationAnalysis
 from ..file import File
+from ..stats import ExplorationStats
 
 
 # NOTE: Maybe split it into FilesBackend + ProjectExplorer class, so then ProjectExplorer is responsible for filters, backend is for getting/saving files
@@ -18,10 +20,31 @@ class ProjectExplorer(abc.ABC):
         """To be inherited from and override accessing/saving project's files logic"""
         raise NotImplementedError
 
+    def mark_changed(self, file: File):
+        """To be overriden by child classes, to track changes of files processed after explore() has moved past them.
+
+        Used when files are processed out of order, like by concurrent TasksFlow.
+        """
+        raise NotImplementedError
+
     def flush(self):
         """Centralised hook to actually apply all necessary changes for all files that require it."""
         raise NotImplementedError
 
+    def get_stats(self) -> ExplorationStats | None:
+        """To be overriden by child classes which keep track of files I/O done during the last explore() and flush()."""
+        return None
+
+    def reset_stats(self):
+        """To be overriden by child classes which keep track of files I/O, to start counting it from scratch.
+
+        Called by automaton before each project run, so that runs which fail before exploring don't report stale stats.
+        """
+
+    def get_analysis(self) -> ExplorationAnalysis | None:
+        """To be overriden by child classes which can report where the time of the last explore() went."""
+        return None
+
     def add_file(self, path, content):
         """To be overriden by child classes to provide implementation to create a new file"""
         raise NotImplementedError
@@ -0,0 +1,187 @@
+from __future__ import annotations
+
+import os
+import typing as t
+from pathlib import Path
+
+from ..filters.base import AndFilter, Filter, NotFilter, OrFilter
+from ..filters.metadata import ExtensionFilter, ModifiedFilter, SizeFilter
+from ..filters.path import PathFilter
+from ..filters.planner import AllOf, AnyOf
+
+try:
+    import numpy as np
+except ImportError:  # Optional dependency, installed with "automyte[numpy]".
+    np = None  # type: ignore[assignment]
+
+
+class FileTable:
+    """Metadata of all files under explorer rootdir, stored column by column in numpy arrays.
+
+    Lets explorers check path and metadata filters for all files at once, as vectorized masks,
+        and only create file objects for the ones which pass. Each row has folder id, extension id,
+        size and mtime, with folders and extensions kept once in their own lookup tables.
+
+    Same table can be passed to explorers of several automatons running in the same process,
+        it's built on the first exploration and reused by explorers which walk the same rootdir
+        with the same ignore settings, until files get changed by explorer flush() or ignore files it respected change.
+    Table is built without pruning folders by filters, so explorers with any filters can share it.
+    Projects explored in fresh worktrees get a new rootdir (and new mtimes) every run, so a table is rebuilt for them.
+    Other changes made to files outside of explorers are not picked up, `invalidate()` the table for that.
+    """
+
+    def __init__(self) -> None:
+        if np is None:
+            raise ImportError("FileTable requires numpy, install it with: pip install automyte[numpy]")
+
+        self.key: t.Hashable | None = None
+        self.ignore_files: dict[str, tuple[int, int] | None] = {}
+        self.rootdir: str | None = None
+        self.dirs: list[str] = []
+        self.extensions: list[str] = []
+        self.names: list[str] = []
+        self.dir_ids = np.empty(0, dtype=np.int32)
+        self.extension_ids = np.empty(0, dtype=np.int32)
+        self.sizes = np.empty(0, dtype=np.int64)
+        self.mtimes = np.empty(0, dtype=np.float64)
+
+    def is_built_for(self, key: t.Hashable) -> bool:
+        """Whether the table was built by a walk with the same key and none of the ignore files it used changed."""
+        if self.key is None or self.key != key:
+            return False
+
+        return all(_file_version(path) == version for path, version in self.ignore_files.items())
+
+    def invalidate(self):
+        self.key = None
+
+    def build(
+        self,
+        key: t.Hashable,
+        rootdir: str,
+        entries: t.Iterable[tuple[str, os.DirEntry]],
+        ignore_files: t.Iterable[str] = (),
+    ):
+        """Fill the table with files, given as directory listing entries along with their folders relative to rootdir.
+
+        Folder paths are expected to be either empty (for rootdir itself) or end with "/".
+        `key` identifies the walk which listed the entries and `ignore_files` are the ones it respected,
+            so that the table is only reused while they stay the same (see `is_built_for()`).
+        """
+        dir_ids: dict[str, int] = {}
+        extension_ids: dict[str, int] = {}
+        names, rows_dirs, rows_extensions, sizes, mtimes = [], [], [], [], []
+
+        for relative_dir, entry in entries:
+            try:
+                stat = entry.stat()
+            except OSError:  # File was deleted since the folder has been listed.
+                continue
+
+            name = entry.name
+            extension = name[name.rfind(".") :].lower() if "." in name else ""
+            names.append(name)
+            rows_dirs.append(dir_ids.setdefault(relative_dir.rstrip("/"), len(dir_ids)))
+            rows_extensions.append(extension_ids.setdefault(extension, len(extension_ids)))
+            sizes.append(stat.st_size)
+            mtimes.append(stat.st_mtime)
+
+        self.key = key
+        self.ignore_files = {path: _file_version(path) for path in ignore_files}
+        self.rootdir = rootdir
+        self.dirs = list(dir_ids)
+        self.extensions = list(extension_ids)
+        self.names = names
+        self.dir_ids = np.array(rows_dirs, dtype=np.int32)
+        self.extension_ids = np.array(rows_extensions, dtype=np.int32)
+        self.sizes = np.array(sizes, dtype=np.int64)
+        self.mtimes = np.array(mtimes, dtype=np.float64)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def relative_path(self, row: int) -> str:
+        dir = self.dirs[self.dir_ids[row]]
+        return f"{dir}/{self.names[row]}" if dir else self.names[row]
+
+    def fullpath(self, row: int) -> str:
+        return os.path.join(t.cast(str, self.rootdir), self.relative_path(row))
+
+    def select(self, filter: Filter | None) -> tuple[np.ndarray, bool]:
+        """Rows of files which can pass the filter and whether they are known to pass it for sure.
+
+        Only path and metadata filters are evaluated against the table, the rest of the filters
+            are assumed to pass here, so then the rows still have to be checked by the filter itself.
+        """
+        if filter is None:
+            return np.arange(len(self)), True
+
+        mask, exact = self._mask(filter)
+        return np.flatnonzero(mask), exact
+
+    def _mask(self, filter: Filter) -> tuple[np.ndarray, bool]:
+        filter = filter.unwrap()
+        if isinstance(filter, (AllOf, AnyOf, AndFilter, OrFilter)):
+            masks = [self._mask(child) for child in filter.children()]
+            combine = np.logical_and if isinstance(filter, (AllOf, AndFilter)) else np.logical_or
+            return combine.reduce([mask for mask, _ in masks]), all(exact for _, exact in masks)
+
+        if isinstance(filter, NotFilter):
+            mask, exact = self._mask(filter.inverted_filter)
+            # Rows which only might pass the inverted filter can still pass or fail once inverted.
+            return (~mask, True) if exact else (np.ones(len(self), dtype=bool), False)
+
+        if isinstance(filter, SizeFilter):
+            return _range_mask(self.sizes, filter.min_size, filter.max_size), True
+        if isinstance(filter, ModifiedFilter):
+            return _range_mask(self.mtimes, filter.after, filter.before), True
+        if isinstance(filter, ExtensionFilter):
+            return self._extensions_mask(filter)
+        if isinstance(filter, PathFilter):
+            return self._path_mask(filter), True
+
+        return np.ones(len(self), dtype=bool), False
+
+    def _extensions_mask(self, filter: ExtensionFilter) -> tuple[np.ndarray, bool]:
+        # Only the last part of extension is stored, multipart ones (like ".tar.gz") are narrowed down by it.
+        last_parts = {extension[extension.rfind(".") :] for extension in filter.extensions}
+        matching_ids = [i for i, extension in enumerate(self.extensions) if extension in last_parts]
+        exact = all(extension.count(".") == 1 for extension in filter.extensions)
+        return np.isin(self.extension_ids, matching_ids), exact
+
+    def _path_mask(self, filter: PathFilter) -> np.ndarray:
+        mask = np.ones(len(self), dtype=bool)
+        if filter._name_regex is not None:
+            regex = filter._name_regex
+            mask &= np.fromiter((regex.search(name) is not None for name in self.names), dtype=bool, count=len(self))
+
+        # Folders are checked once for each of them, same way as for files found by walking.
+        if filter._anchored_folder is not None:
+            matching_dirs = [i for i, dir in enumerate(self.dirs) if filter._is_inside_folder(dir)]
+            mask &= np.isin(self.dir_ids, matching_dirs)
+        elif filter.folder:
+            folder = str(filter.folder)
+            rootdir = t.cast(str, self.rootdir)
+            matching_dirs = [i for i, dir in enumerate(self.dirs) if folder in str(Path(rootdir) / dir)]
+            mask &= np.isin(self.dir_ids, matching_dirs)
+
+        return mask
+
+
+def _file_version(path: str) -> tuple[int, int] | None:
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+def _range_mask(values: np.ndarray, min_value: float | None, max_value: float | None) -> np.ndarray:
+    mask = np.ones(len(values), dtype=bool)
+    if min_value is not None:
+        mask &= values >= min_value
+    if max_value is not None:
+        mask &= values <= max_value
+
+    return mask
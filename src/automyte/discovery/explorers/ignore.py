@@ -0,0 +1,153 @@
+import os
+import re
+import typing as t
+from dataclasses import dataclass
+from pathlib import Path
+
+
+@dataclass
+class _IgnoreRule:
+    regex: str
+    negate: bool
+    dir_only: bool
+
+
+class IgnoreMatcher:
+    """Gitignore-like patterns, compiled once, to check paths relative to explorer rootdir against.
+
+    Supported syntax is the one of .gitignore:
+        patterns without a slash (like "node_modules" or "*.pyc") match a file or folder name at any depth,
+        patterns with a slash in the beginning or middle (like "/build" or "docs/_build") are anchored to rootdir,
+        trailing slash ("node_modules/") only matches folders, "*", "?", "[...]" and "**" work as globs
+        and "!" in front of pattern re-includes paths excluded by the patterns before it (last match wins).
+
+    Folders are expected to be checked before their contents and pruned if ignored (like `os.walk` allows),
+        so that patterns for folders are never matched against every file inside of them.
+    Paths always use "/" as a separator, regardless of the platform.
+    """
+
+    def __init__(self, patterns: t.Iterable[str]) -> None:
+        self.rules = [rule for rule in map(_compile_rule, patterns) if rule is not None]
+        self._has_negations = any(rule.negate for rule in self.rules)
+
+        # Without negations order doesn't matter, so all patterns can be checked with a single regex call.
+        self._files_regex = _combine(rule.regex for rule in self.rules if not rule.dir_only)
+        self._dirs_regex = _combine(rule.regex for rule in self.rules)
+        self._compiled_rules = [(re.compile(rule.regex, re.DOTALL), rule) for rule in reversed(self.rules)]
+
+    @classmethod
+    def from_file(cls, filepath: str | Path) -> "IgnoreMatcher":
+        with open(filepath, "r", errors="replace") as ignore_file:
+            return cls(ignore_file.read().splitlines())
+
+    def is_ignored(self, relative_path: str, is_dir: bool = False) -> bool:
+        return self.match(relative_path, is_dir=is_dir) is True
+
+    def match(self, relative_path: str, is_dir: bool = False) -> bool | None:
+        """Return whether path is ignored or re-included by the last matching pattern, or None if none match."""
+        if not self._has_negations:
+            regex = self._dirs_regex if is_dir else self._files_regex
+            return True if regex is not None and regex.fullmatch(relative_path) is not None else None
+
+        for regex, rule in self._compiled_rules:
+            if rule.dir_only and not is_dir:
+                continue
+
+            if regex.fullmatch(relative_path):
+                return not rule.negate
+
+        return None
+
+    def __bool__(self) -> bool:
+        return bool(self.rules)
+
+
+IgnoreChain: t.TypeAlias = list[tuple[str, IgnoreMatcher]]
+"""Matchers from ignore files applicable to a folder, paired with their folders, from the least to most specific."""
+
+
+def is_ignored_by_chain(chain: IgnoreChain, relative_path: str, is_dir: bool = False) -> bool:
+    """Check path against nested ignore files, where the ones deeper in the tree take precedence, same as for git."""
+    for base, matcher in reversed(chain):
+        verdict = matcher.match(relative_path[len(base) :], is_dir=is_dir)
+        if verdict is not None:
+            return verdict
+
+    return False
+
+
+def default_global_ignore_files(rootdir: str) -> list[Path]:
+    """Files with ignore patterns which apply to the whole repository, same as git uses by default."""
+    config_home = Path(os.environ.get("XDG_CONFIG_HOME") or Path.home() / ".config")
+    return [config_home / "git" / "ignore", Path(rootdir) / ".git" / "info" / "exclude"]
+
+
+def _combine(regexes: t.Iterable[str]) -> re.Pattern | None:
+    regexes = list(regexes)
+    if not regexes:
+        return None
+
+    return re.compile("|".join(f"(?:{regex})" for regex in regexes), re.DOTALL)
+
+
+def _compile_rule(pattern: str) -> _IgnoreRule | None:
+    # Trailing spaces are ignored, unless escaped with a backslash.
+    pattern = pattern.rstrip(" ") if not pattern.endswith("\\ ") else pattern
+    if not pattern.strip() or pattern.startswith("#"):
+        return None
+
+    negate = pattern.startswith("!")
+    if negate:
+        pattern = pattern[1:]
+
+    dir_only = pattern.endswith("/")
+    pattern = pattern.rstrip("/")
+    anchored = "/" in pattern
+    pattern = pattern.lstrip("/")
+    if not pattern:
+        return None
+
+    # Unanchored patterns can match at any depth, same as "**/<pattern>" would.
+    regex = _translate(pattern) if anchored else f"(?:.*/)?{_translate(pattern)}"
+    return _IgnoreRule(regex=regex, negate=negate, dir_only=dir_only)
+
+
+def _translate(pattern: str) -> str:
+    """Translate a single glob into a regex string, meant to match the whole relative path."""
+    result = []
+    i, n = 0, len(pattern)
+
+    while i < n:
+        char = pattern[i]
+
+        if char == "*" and pattern.startswith("**", i) and (i == 0 or pattern[i - 1] == "/"):
+            i += 2
+            if i == n:  # Trailing "/**" - everything inside.
+                result.append(".*")
+                continue
+            if pattern[i] == "/":  # "**/" - any number of folders, including none.
+                result.append("(?:.*/)?")
+                i += 1
+                continue
+            result.append("[^/]*")  # Otherwise "**" is just a regular "*".
+            continue
+
+        if char == "*":
+            result.append("[^/]*")
+        elif char == "?":
+            result.append("[^/]")
+        elif char == "[" and (end := pattern.find("]", i + 2)) != -1:
+            body = pattern[i + 1 : end].replace("\\", "\\\\")
+            if body.startswith("!"):
+                body = f"^{body[1:]}"
+            result.append(f"(?!/)[{body}]")
+            i = end
+        elif char == "\\" and i + 1 < n:
+            i += 1
+            result.append(re.escape(pattern[i]))
+        else:
+            result.append(re.escape(char))
+
+        i += 1
+
+    return "".join(result)
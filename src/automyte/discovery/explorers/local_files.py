@@ -1,11 +1,22 @@
 import logging
 import os
+import time
 import typing as t
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
 from pathlib import Path
 
+from automyte.utils.iterables import batched
+from automyte.utils.processes import workers_mp_context
+
+from ..analysis import ExplorationAnalysis, analyze_filter
 from ..file import File, OSFile
-from ..filters import Filter
+from ..filters import Filter, FilterCache
+from ..filters.planner import plan_filter
+from ..index import ContentIndex
+from ..stats import ExplorationStats
 from .base import ProjectExplorer
+from .file_table import FileTable
+from .ignore import IgnoreChain, IgnoreMatcher, default_global_ignore_files, is_ignored_by_chain
 
 logger = logging.getLogger(__name__)
 
@@ -13,37 +24,336 @@ IGNORE_FILES_LIST_PATTERNS = [
     ".git",
     "node_modules/",
 ]
+IGNORE_FILENAMES = (".gitignore", ".ignore")
 
 
 class LocalFilesExplorer(ProjectExplorer):
+    """Explore files on local filesystem under the rootdir.
+
+    `ignore_locations` are gitignore-like patterns (see IgnoreMatcher) relative to the rootdir;
+        ignored folders are not descended into at all.
+
+    If `respect_ignore_files` is set - files and folders are also skipped based on `ignore_filenames`
+        (.gitignore and .ignore by default) found anywhere in the project, with the nested ones taking precedence,
+        and based on `global_ignore_files`, which default to the same ones git uses:
+        "$XDG_CONFIG_HOME/git/ignore" and ".git/info/exclude" (core.excludesFile setting is not looked up).
+    Compiled ignore files are cached between explorations and only recompiled once they change.
+
+    `skip_binary` skips files with NUL bytes among their first few thousands bytes (same heuristic git uses)
+        and `max_file_size` skips files bigger than the given amount of bytes, before any filters or tasks
+        get to read them. Amounts of skipped files are counted in explorer stats.
+
+    If `index` is set (like TrigramIndex or GitGrepIndex) - it is updated with the files changed
+        since the previous exploration and content filters use it to only read the files
+        which can contain texts or match regexps they look for.
+
+    If `filter_workers` is set - filters are evaluated in a pool of that many worker processes, in batches of files,
+        ahead of files being consumed, so that heavy content filters use several cores while tasks are running.
+        Files are still yielded in the walk order, unless `filter_ordered` is unset - then as soon as they pass.
+        Filters have to be picklable on platforms where worker processes can't be forked.
+
+    If `filter_cache` is set - results of content filters are stored there and reused for unchanged files.
+
+    If `file_table` is set - metadata of all files is first put into it, path and metadata filters are applied
+        to the whole table at once and only files which pass them are walked through further. See FileTable.
+
+    If `analyze` is set - explorer also measures where the time of each exploration goes and how each node
+        of the filters tree performs, see `get_analysis()`. Filters are then evaluated in the main process only.
+    """
+
     def __init__(
         self,
         rootdir: str,
         filter_by: Filter | None = None,
         ignore_locations: list[str] = IGNORE_FILES_LIST_PATTERNS,
+        respect_ignore_files: bool = False,
+        ignore_filenames: t.Sequence[str] = IGNORE_FILENAMES,
+        global_ignore_files: t.Sequence[str | Path] | None = None,
+        skip_binary: bool = False,
+        max_file_size: int | None = None,
+        index: ContentIndex | None = None,
+        filter_workers: int | None = None,
+        filter_ordered: bool = True,
+        filter_cache: FilterCache | None = None,
+        file_table: FileTable | None = None,
+        analyze: bool = False,
     ):
         self.rootdir = rootdir
         self.filter_by = filter_by
-        self._changed_files: list[OSFile] = []
+        self._changed_files: dict[OSFile, None] = {}  # Used as an ordered set.
         self.ignore_locations = ignore_locations
+        self.respect_ignore_files = respect_ignore_files
+        self.ignore_filenames = ignore_filenames
+        self.global_ignore_files = global_ignore_files
+        self.skip_binary = skip_binary
+        self.max_file_size = max_file_size
+        self.index = index
+        self.filter_workers = filter_workers
+        self.filter_ordered = filter_ordered
+        self._filter_batch_size = 256
+        self.filter_cache = filter_cache
+        self.file_table = file_table
+        self.analyze = analyze
+        self.analysis = ExplorationAnalysis()
+        self.stats = ExplorationStats()
+
+        self._ignore_files_cache: dict[str, tuple[tuple[int, int], IgnoreMatcher]] = {}
+
+    def _all_files(self, filter_by: Filter | None) -> t.Generator[tuple[str, OSFile, bool | None], None, None]:
+        """Walk rootdir, yielding files with their relative paths and what filters are known to return for them."""
+        for prefix, entry, verdict in self._walk(filter_by):
+            file = OSFile(fullname=entry.path, stats=self.stats, entry=entry, rootdir=self.rootdir)
+            yield f"{prefix}{entry.name}", file, verdict
+
+    def _walk(self, filter_by: Filter | None) -> t.Generator[tuple[str, os.DirEntry, bool | None], None, None]:
+        """Walk rootdir, yielding listing entries of files along with their folders relative to rootdir.
+
+        Folders for which filters can tell upfront that none of the files will match are not walked at all.
+        """
+        ignore, analysis = IgnoreMatcher(self.ignore_locations), self.analysis
+        # Folders yet to be walked, with their paths relative to rootdir, ignore files and filters verdict for them.
+        pending: list[tuple[str, str, IgnoreChain, bool | None]] = [
+            (self.rootdir, "", self._get_global_ignore_chain(), None)
+        ]
+
+        while pending:
+            folder, prefix, chain, verdict = pending.pop()
+            try:
+                with os.scandir(folder) as listing:
+                    entries = list(listing)
+            except OSError as e:  # Same as os.walk, unreadable folders are just skipped.
+                logger.warning("[Explorer %s]: Failed to list %s: %s", self.rootdir, folder, e)
+                continue
+
+            analysis.dirs_walked += 1
+
+            if self.respect_ignore_files:
+                chain = chain + self._get_ignore_files_chain(folder, prefix=prefix, files=[e.name for e in entries])
+
+            subfolders = []
+            for entry in entries:
+                relative_path, is_dir = f"{prefix}{entry.name}", _is_dir(entry)
+                if (ignore or chain) and self._is_ignored(ignore, chain, relative_path, is_dir=is_dir):
+                    if is_dir:
+                        analysis.dirs_ignored += 1
+                    else:
+                        analysis.files_ignored += 1
+                    continue
+
+                if not is_dir:
+                    yield prefix, entry, verdict
+                    continue
 
-    def _all_files(self) -> t.Generator[OSFile, None, None]:
-        for root, dirs, files in os.walk(self.rootdir):
-            for f in files:
-                file = OSFile(fullname=str(Path(root) / f))
-                if self.ignore_locations and self._should_ignore_file(file):
+                if entry.is_symlink():  # Same as os.walk, symlinks to folders are not followed.
                     continue
+
+                # Once filters have a verdict for a folder - it holds for everything inside of it as well.
+                subfolder_verdict = verdict
+                if subfolder_verdict is None and filter_by:
+                    subfolder_verdict = filter_by.dir_verdict(relative_path)
+                if subfolder_verdict is not False:
+                    subfolders.append((entry.path, f"{relative_path}/", chain, subfolder_verdict))
                 else:
-                    yield file
+                    analysis.dirs_pruned += 1
+
+            # Walking depth-first, in the same order as os.walk does.
+            pending.extend(reversed(subfolders))
+
+    def _walk_key(self) -> tuple:
+        """Everything which decides what files `_walk()` finds, when it's not given any filters."""
+        global_files = self.global_ignore_files
+        return (
+            self.rootdir,
+            tuple(self.ignore_locations),
+            self.respect_ignore_files,
+            tuple(self.ignore_filenames),
+            tuple(map(str, global_files)) if global_files is not None else None,
+        )
+
+    def _is_ignored(self, ignore: IgnoreMatcher, chain: IgnoreChain, relative_path: str, is_dir: bool) -> bool:
+        if not self.analyze:
+            return _is_ignored(ignore, chain, relative_path, is_dir=is_dir)
+
+        started_at = time.perf_counter()
+        try:
+            return _is_ignored(ignore, chain, relative_path, is_dir=is_dir)
+        finally:
+            self.analysis.ignore_time += time.perf_counter() - started_at
+
+    def _get_global_ignore_chain(self) -> IgnoreChain:
+        if not self.respect_ignore_files:
+            return []
+
+        global_files = self.global_ignore_files
+        if global_files is None:
+            global_files = default_global_ignore_files(self.rootdir)
+
+        return [("", matcher) for matcher in map(self._load_ignore_file, global_files) if matcher]
+
+    def _get_ignore_files_chain(self, folder: str, prefix: str, files: list[str]) -> IgnoreChain:
+        chain = []
+        for filename in self.ignore_filenames:
+            if filename in files and (matcher := self._load_ignore_file(os.path.join(folder, filename))):
+                chain.append((prefix, matcher))
+
+        return chain
+
+    def _load_ignore_file(self, filepath: str | Path) -> IgnoreMatcher | None:
+        filepath = str(filepath)
+        try:
+            stat = os.stat(filepath)
+        except OSError:
+            return None
+
+        version = (stat.st_mtime_ns, stat.st_size)
+        cached = self._ignore_files_cache.get(filepath)
+        if cached is None or cached[0] != version:
+            cached = (version, IgnoreMatcher.from_file(filepath))
+            self._ignore_files_cache[filepath] = cached
+
+        return cached[1]
 
     def explore(self) -> t.Generator[OSFile, None, None]:
-        for file in self._all_files():
-            # Don't filter at all if no filters supplied or actually apply them
-            if not self.filter_by or self.filter_by.filter(file):
-                yield file
+        self.stats = ExplorationStats()
+        self.analysis = ExplorationAnalysis()
+        filter_by = plan_filter(self.filter_by, cache=self.filter_cache) if self.filter_by else None
+        if filter_by and self.filter_cache is not None:
+            self.filter_cache.evict()
+        if filter_by and self.analyze:
+            filter_by, self.analysis.filter = analyze_filter(filter_by, stats=self.stats)
+
+        all_files: t.Iterable[tuple[str, OSFile, bool | None]]
+        if self.file_table is not None:
+            all_files = self._table_files(self.file_table, filter_by=filter_by)
+        else:
+            all_files = self._all_files(filter_by)
+        if self.analyze:
+            all_files = _timed(all_files, analysis=self.analysis)
+
+        candidates = None
+        if self.index is not None and filter_by:
+            # Index has to be up to date before it's queried, so the whole project is walked first.
+            all_files = list(all_files)
+            started_at = time.perf_counter()
+            candidates = self._index_candidates(self.index, all_files, filter_by=filter_by)
+            self.analysis.index_time = time.perf_counter() - started_at
+
+        files_to_check = self._files_to_check(all_files, candidates=candidates, filter_by=filter_by)
+        if filter_by and self.filter_workers and not self.analyze:
+            passed_files = self._filter_in_workers(files_to_check, filter_by=filter_by)
+        else:
+            passed_files = (file for file, needs_filter in files_to_check if not needs_filter or filter_by.filter(file))
+
+        for file in passed_files:
+            yield file
+
+            if file.is_tainted:
+                self._changed_files[file] = None
+
+        if self.analyze:
+            logger.debug("[Explorer %s]: Exploration analysis:\n%s", self.rootdir, self.analysis)
+
+    def _table_files(
+        self, table: FileTable, filter_by: Filter | None
+    ) -> t.Generator[tuple[str, OSFile, bool | None], None, None]:
+        key = self._walk_key()
+        if not table.is_built_for(key):
+            # Only ignore files read by this walk are kept, so that the table is not rebuilt for the stale ones.
+            self._ignore_files_cache.clear()
+            entries = [(prefix, entry) for prefix, entry, _ in self._walk(None)]
+            table.build(key, self.rootdir, entries, ignore_files=list(self._ignore_files_cache))
 
-                if file.is_tainted:
-                    self._changed_files.append(file)
+        rows, exact = table.select(filter_by)
+        # Files which passed the table have to be filtered again, unless it could evaluate filters completely.
+        verdict = True if exact else None
+        for row in rows.tolist():
+            file = OSFile(fullname=table.fullpath(row), stats=self.stats, rootdir=self.rootdir)
+            yield table.relative_path(row), file, verdict
+
+    def _files_to_check(
+        self,
+        all_files: t.Iterable[tuple[str, OSFile, bool | None]],
+        candidates: set[str] | None,
+        filter_by: Filter | None,
+    ) -> t.Generator[tuple[OSFile, bool], None, None]:
+        """Drop files which are known not to match upfront, telling for the rest if they still need to be filtered."""
+        for relative_path, file, verdict in all_files:
+            self.stats.add(files_scanned=1)
+            if candidates is not None and not verdict and relative_path not in candidates:
+                self.analysis.files_not_candidates += 1
+                continue
+
+            if self._should_skip(file):
+                continue
+
+            # Don't filter at all if no filters supplied or if they are known to match all files in the folder.
+            yield file, bool(filter_by) and not verdict
+
+    def _filter_in_workers(
+        self, files: t.Iterable[tuple[OSFile, bool]], filter_by: Filter
+    ) -> t.Generator[OSFile, None, None]:
+        """Filter batches of files in worker processes, keeping only a few batches per worker in flight.
+
+        Passed files are streamed back while the rest of the project is still being walked.
+        """
+        batches = batched(files, self._filter_batch_size)
+        max_in_flight = t.cast(int, self.filter_workers) * 2
+        in_flight: dict[Future[tuple[list[bool], int]], tuple[tuple[OSFile, bool], ...]] = {}
+
+        with ProcessPoolExecutor(
+            max_workers=self.filter_workers,
+            mp_context=workers_mp_context(),
+            initializer=_init_filter_worker,
+            initargs=(filter_by, self.rootdir),
+        ) as executor:
+            while True:
+                while len(in_flight) < max_in_flight and (batch := next(batches, None)) is not None:
+                    paths = [str(file) if needs_filter else None for file, needs_filter in batch]
+                    in_flight[executor.submit(_filter_in_worker, paths)] = batch
+
+                if not in_flight:
+                    break
+
+                if self.filter_ordered:  # Batches are kept in the order of submission.
+                    finished: t.Iterable[Future] = [next(iter(in_flight))]
+                else:
+                    finished, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+
+                for future in finished:
+                    batch = in_flight.pop(future)
+                    passed, bytes_read = future.result()
+                    self.stats.add(bytes_read=bytes_read)
+                    yield from (file for (file, _), is_passed in zip(batch, passed) if is_passed)
+
+    def _index_candidates(
+        self, index: ContentIndex, all_files: list[tuple[str, OSFile, bool | None]], filter_by: Filter
+    ) -> set[str] | None:
+        # No point in indexing files which filters won't look at anyway.
+        index.update(
+            {relative_path: file for relative_path, file, verdict in all_files if verdict is None}, rootdir=self.rootdir
+        )
+
+        candidates = filter_by.candidates(index)
+        if candidates is not None:
+            walked = {relative_path for relative_path, _, _ in all_files}
+            # Files deleted since they were indexed, if their folders were walked this time.
+            index.forget(path for path in candidates - walked if not (Path(self.rootdir) / path).exists())
+
+        return candidates
+
+    def _should_skip(self, file: OSFile) -> bool:
+        # Size comes from directory listing, so it is checked before opening the file to sniff it.
+        if self.max_file_size is not None and file.size > self.max_file_size:
+            logger.debug("[Explorer %s]: Skipping file over the size limit: %s", self.rootdir, file.fullpath)
+            self.stats.add(files_skipped_oversized=1)
+            return True
+
+        if self.skip_binary and file.is_binary():
+            logger.debug("[Explorer %s]: Skipping binary file: %s", self.rootdir, file.fullpath)
+            self.stats.add(files_skipped_binary=1)
+            return True
+
+        return False
 
     def get_rootdir(self) -> str:
         return self.rootdir
@@ -52,18 +362,25 @@ class LocalFilesExplorer(ProjectExplorer):
         self.rootdir = newdir
         return newdir
 
+    def get_stats(self) -> ExplorationStats:
+        return self.stats
+
+    def reset_stats(self):
+        self.stats = ExplorationStats()
+
+    def get_analysis(self) -> ExplorationAnalysis | None:
+        return self.analysis if self.analyze else None
+
+    def mark_changed(self, file: OSFile):
+        self._changed_files[file] = None
+
     def flush(self):
-        logger.debug("[Explorer %s]: Flushing following files: %s", self.rootdir, self._changed_files)
+        logger.debug("[Explorer %s]: Flushing following files: %s", self.rootdir, list(self._changed_files))
         for file in self._changed_files:
             file.flush()
 
-    def _should_ignore_file(self, file: OSFile) -> bool:
-        relative_to_rootdir_path = file.fullpath.resolve().relative_to(Path(self.rootdir).resolve())
-        for pattern in self.ignore_locations:
-            if pattern in str(relative_to_rootdir_path):
-                return True
-
-        return False
+        if self._changed_files and self.file_table is not None:
+            self.file_table.invalidate()
 
     def add_file(self, path: Path, content: str) -> OSFile:
         root_path = Path(self.rootdir).resolve()
@@ -71,9 +388,66 @@ class LocalFilesExplorer(ProjectExplorer):
 
         path.parent.mkdir(parents=True, exist_ok=True)
         path.touch()
+        if self.file_table is not None:
+            self.file_table.invalidate()
 
-        file = OSFile(fullname=str(path))
+        file = OSFile(fullname=str(path), stats=self.stats)
         file.edit(content)
-        
+
         return file
-    
\ No newline at end of file
+
+
+def _timed(
+    all_files: t.Iterable[tuple[str, OSFile, bool | None]], analysis: ExplorationAnalysis
+) -> t.Generator[tuple[str, OSFile, bool | None], None, None]:
+    """Count time spent on walking into the analysis, leaving out the time files spend being processed."""
+    iterator = iter(all_files)
+    while True:
+        started_at = time.perf_counter()
+        item = next(iterator, None)
+        analysis.walk_time += time.perf_counter() - started_at
+        if item is None:
+            return
+
+        yield item
+
+
+def _is_dir(entry: os.DirEntry) -> bool:
+    try:
+        return entry.is_dir()
+    except OSError:
+        return False
+
+
+def _is_ignored(ignore: IgnoreMatcher, chain: IgnoreChain, relative_path: str, is_dir: bool) -> bool:
+    return bool(
+        (ignore and ignore.is_ignored(relative_path, is_dir=is_dir))
+        or (chain and is_ignored_by_chain(chain, relative_path, is_dir=is_dir))
+    )
+
+
+# Filter worker processes state, populated once per process by the pool initializer.
+_worker_filter: Filter | None = None
+_worker_rootdir: str | None = None
+
+
+def _init_filter_worker(filter_by: Filter, rootdir: str):
+    global _worker_filter, _worker_rootdir
+    _worker_filter = filter_by
+    _worker_rootdir = rootdir
+
+
+def _filter_in_worker(paths: list[str | None]) -> tuple[list[bool], int]:
+    """Tell which files pass the filter, None paths are for files which are already known to pass.
+
+    Amount of bytes read is sent back as well, so that it can be accounted for in explorer stats.
+    """
+    if _worker_filter is None:
+        raise RuntimeError("Worker process has not been initialized with a filter.")
+
+    stats = ExplorationStats()
+    passed = [
+        path is None or _worker_filter.filter(OSFile(fullname=path, stats=stats, rootdir=_worker_rootdir))
+        for path in paths
+    ]
+    return passed, stats.bytes_read
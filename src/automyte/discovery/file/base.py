@@ -1,14 +1,23 @@
 from __future__ import annotations
 
 import abc
+import re
 import typing as t
 
 
 class File(abc.ABC):
+    # Lets implementations define their own __slots__, otherwise they get __dict__ as usual.
+    __slots__ = ()
+
     @property
     def folder(self) -> str:
         raise NotImplementedError
 
+    @property
+    def relative_folder(self) -> str:
+        """Folder relative to the project rootdir, if file implementation knows it."""
+        return self.folder
+
     @property
     def name(self) -> str:
         raise NotImplementedError
@@ -28,6 +37,13 @@ class File(abc.ABC):
     def get_contents(self) -> str:
         raise NotImplementedError
 
+    def search_raw(self, pattern: re.Pattern[bytes]) -> bool | None:
+        """Search the raw bytes of the file, without decoding or keeping its contents around.
+
+        Returns None if file doesn't support it at the moment, then contents have to be searched instead.
+        """
+        return None
+
     def edit(self, text: str) -> File:
         raise NotImplementedError
 
@@ -37,3 +53,11 @@ class File(abc.ABC):
     @property
     def is_tainted(self) -> bool:
         raise NotImplementedError
+
+    @property
+    def size(self) -> int:
+        raise NotImplementedError
+
+    @property
+    def mtime(self) -> float:
+        raise NotImplementedError
@@ -1,14 +1,64 @@
 from __future__ import annotations
 
+import functools
+import mmap
 import os
+import re
 import typing as t
-from pathlib import Path
+from pathlib import Path, PurePath
 
+from ..stats import ExplorationStats
 from .base import File
 
+# Smaller files are just read, as mapping them into memory costs more than that.
+MMAP_THRESHOLD = 64 * 1024
+# Same as git, file is considered binary if there is a NUL byte among its first bytes.
+BINARY_SNIFF_SIZE = 8000
+
+
+@functools.lru_cache(maxsize=4096)
+def _normalized_folder(folder: str) -> str:
+    """Normalized folder path, computed once per folder and shared by all files inside of it.
+
+    Explorers walk folders one by one, so files of the same folder come in a row and hit the cache.
+    """
+    return str(PurePath(folder))
+
 
 class OSFile(File):
-    def __init__(self, fullname: str):
+    # Explorers create a file object for each file of the project, so keeping them compact matters for big ones:
+    # only the path (as given) is kept, folder and name are derived from it and metadata is stat-ed once asked for.
+    __slots__ = (
+        "stats",
+        "rootdir",
+        "_is_symlink",
+        "_stat",
+        "_initial_location",
+        "_location",
+        "_inital_contents",
+        "_contents",
+        "_marked_for_delete",
+        "tainted",
+    )
+
+    def __init__(
+        self,
+        fullname: str,
+        stats: ExplorationStats | None = None,
+        entry: os.DirEntry | None = None,
+        rootdir: str | None = None,
+    ):
+        """`stats` - counters of explorer which has found the file, to account for bytes read/written by it.
+
+        `entry` - directory listing entry the file was found by, to tell if it's a symlink without an extra syscall.
+            Entry itself is not kept, as it holds its own copies of the path and name.
+
+        `rootdir` - rootdir of explorer which has found the file, to resolve `relative_folder` against.
+        """
+        self.stats = stats
+        self.rootdir = rootdir
+        self._is_symlink: bool | None = entry.is_symlink() if entry is not None else None
+        self._stat: os.stat_result | None = None
         self._initial_location = fullname
         self._location = fullname
 
@@ -20,11 +70,23 @@ class OSFile(File):
 
     @property
     def folder(self) -> str:
-        return str(Path(self._location).parent)
+        return _normalized_folder(os.path.dirname(self._location))
+
+    @property
+    def relative_folder(self) -> str:
+        """Folder relative to the rootdir of explorer which has found the file, using "/" as a separator.
+
+        Empty for files directly in the rootdir. Same as `folder` if file is not coming from an explorer.
+        """
+        if self.rootdir is None:
+            return self.folder
+
+        relative = os.path.relpath(os.path.dirname(self._location), self.rootdir).replace(os.sep, "/")
+        return "" if relative == "." else relative
 
     @property
     def name(self) -> str:
-        return str(Path(self._location).name)
+        return os.path.basename(self._location)
 
     @property
     def fullpath(self) -> Path:
@@ -37,9 +99,36 @@ class OSFile(File):
         with open(current_location, "r") as physical_file:
             self._inital_contents = physical_file.read()
             self._contents = self._inital_contents
+            if self.stats is not None:
+                self.stats.add(bytes_read=os.fstat(physical_file.fileno()).st_size)
 
         return self
 
+    def is_binary(self) -> bool:
+        """Sniff the beginning of the file on the disk for NUL bytes, which text files don't have."""
+        try:
+            with open(self._initial_location, "rb") as physical_file:
+                return b"\0" in physical_file.read(BINARY_SNIFF_SIZE)
+        except OSError:
+            return False
+
+    def search_raw(self, pattern: re.Pattern[bytes]) -> bool | None:
+        # Once contents are loaded they might have been edited, so they are the source of truth from then on.
+        if self._contents is not None:
+            return None
+
+        current_location = self._location if self.fullpath.exists() else self._initial_location
+        with open(current_location, "rb") as physical_file:
+            size = os.fstat(physical_file.fileno()).st_size
+            if self.stats is not None:
+                self.stats.add(bytes_read=size)
+
+            if size < MMAP_THRESHOLD:
+                return pattern.search(physical_file.read()) is not None
+
+            with mmap.mmap(physical_file.fileno(), 0, access=mmap.ACCESS_READ) as mapped_file:
+                return pattern.search(mapped_file) is not None
+
     def flush(self) -> None:
         if not self.tainted:
             return
@@ -47,21 +136,27 @@ class OSFile(File):
         if self._marked_for_delete:
             if self.fullpath.exists():
                 self.fullpath.unlink()
+            if self.stats is not None:
+                self.stats.add(files_modified=1)
             return
 
         # If file has been moved - self._location will have been changed, so we write to new location.
         with open(self._location, "w") as physical_file:
             physical_file.write(self.get_contents())
+            bytes_written = physical_file.tell()
 
         # Cleanup old file after move() call.
         if self._initial_location != self._location:
             Path(self._initial_location).unlink()
 
+        if self.stats is not None:
+            self.stats.add(files_modified=1, bytes_written=bytes_written)
+
     def contains(self, text: str) -> bool:
         return text in self.get_contents()
 
     def move(self, to: str | None = None, new_name: str | None = None) -> File:
-        self._location = str(Path(to or self.folder) / (new_name or self.name))
+        self._location = os.path.join(to or self.folder, new_name or self.name)
         self.tainted = True
         return self
 
@@ -85,5 +180,29 @@ class OSFile(File):
     def is_tainted(self) -> bool:
         return self.tainted
 
+    def stat(self) -> os.stat_result:
+        """Metadata of the file as it was found, not reflecting any changes made to it since."""
+        if self._stat is None:
+            self._stat = os.stat(self._initial_location)
+        return self._stat
+
+    @property
+    def size(self) -> int:
+        return self.stat().st_size
+
+    @property
+    def mtime(self) -> float:
+        return self.stat().st_mtime
+
+    @property
+    def inode(self) -> int:
+        return self.stat().st_ino
+
+    @property
+    def is_symlink(self) -> bool:
+        if self._is_symlink is None:
+            self._is_symlink = os.path.islink(self._initial_location)
+        return self._is_symlink
+
     def __str__(self):
         return self._location
@@ -1,9 +1,15 @@
 from .base import Filter
+from .cache import FilterCache
 from .contains import ContainsFilter
+from .metadata import ExtensionFilter, ModifiedFilter, SizeFilter
 from .path import PathFilter
 
 __all__ = [
     "ContainsFilter",
+    "ExtensionFilter",
     "Filter",
+    "FilterCache",
+    "ModifiedFilter",
     "PathFilter",
+    "SizeFilter",
 ]
@@ -1,47 +1,224 @@
 from __future__ import annotations
 
+import typing as t
+
 from ..file import File
 
+if t.TYPE_CHECKING:
+    from ..index import ContentIndex
+
 
 class Filter:
+    """Base class for all files filters.
+
+    `cost` is a rough estimate of how expensive it is to check a single file, used to evaluate cheap filters first:
+        ~1 for checks by path, ~10 for ones which need file metadata and ~100 for ones which read contents.
+    Custom filters are assumed to be expensive unless they say otherwise.
+
+    `cacheable` filters are the ones whose result only depends on the file contents,
+        so it can be stored by contents hash and reused for unchanged files (see FilterCache).
+    """
+
+    cost: int = 50
+    cacheable: bool = False
+
     def filter(self, file: File) -> bool:
         raise NotImplementedError
 
+    def _params(self) -> tuple | None:
+        """Values which fully define what the filter does, so that equal filters can be deduplicated.
+
+        Filters returning None (which is the default) are only equal to themselves.
+        """
+        return None
+
+    def fingerprint(self) -> str | None:
+        """Identifier of what the filter does, which stays the same across processes and runs, based on `_params()`.
+
+        None for filters which are only equal to themselves or have params which can't be represented reliably.
+        """
+        params = self._params()
+        if params is None:
+            return None
+
+        values = [_fingerprint_value(value) for value in params]
+        if any(value is None for value in values):
+            return None
+
+        return f"{type(self).__module__}.{type(self).__qualname__}({', '.join(t.cast(list[str], values))})"
+
+    def __eq__(self, other: object) -> bool:
+        if self is other:
+            return True
+
+        if type(self) is not type(other):
+            return False
+
+        params = self._params()
+        return params is not None and params == t.cast(Filter, other)._params()
+
+    def __hash__(self) -> int:
+        params = self._params()
+        return hash((type(self), params)) if params is not None else id(self)
+
+    def dir_verdict(self, relative_dir: str) -> bool | None:
+        """Tell upfront, for all files somewhere under a folder, what `filter()` will return for them.
+
+        Used by explorers to avoid walking folders which can't have any matching files (False)
+            and to skip filtering files in folders, where all of them are known to match (True).
+        `relative_dir` is relative to explorer rootdir and uses "/" as a separator.
+        Filters which can't tell anything by the folder alone (like ones looking at contents) return None.
+        """
+        return None
+
+    def candidates(self, index: ContentIndex) -> set[str] | None:
+        """Narrow down files which can pass the filter by content index, to only read those ones.
+
+        Returns paths relative to explorer rootdir, using "/" as a separator, which still need to be filtered,
+            files outside of them are known not to match. Filters which can't use the index return None.
+        """
+        return None
+
+    def children(self) -> list[Filter]:
+        """Filters this one is made of, for code which walks the whole filters tree (like planner or analysis)."""
+        return []
+
+    def unwrap(self) -> Filter:
+        """Filter which this one evaluates the same as, for wrappers only changing how it's evaluated (like caching).
+
+        Lets code which evaluates filters on its own (like FileTable) see through such wrappers.
+        """
+        return self
+
     def __call__(self, file: File) -> bool:
         return self.filter(file=file)
 
-    def __and__(self, other: "Filter") -> "Filter":
+    def __and__(self, other: Filter) -> Filter:
         """Returns a filter that represents logical AND."""
+        return AndFilter(self, other)
 
-        class AndFilter(Filter):
-            def __init__(self, filter1: Filter, filter2: Filter):
-                self.filter1 = filter1
-                self.filter2 = filter2
+    def __or__(self, other: Filter) -> Filter:
+        """Returns a filter that represents logical OR."""
+        return OrFilter(self, other)
 
-            def filter(self, file: File) -> bool:
-                return self.filter1.filter(file) and self.filter2.filter(file)
+    def __invert__(self) -> Filter:
+        return NotFilter(self)
 
-        return AndFilter(self, other)
 
-    def __or__(self, other: "Filter") -> "Filter":
-        """Returns a filter that represents logical OR."""
+class AndFilter(Filter):
+    def __init__(self, filter1: Filter, filter2: Filter):
+        self.filter1 = filter1
+        self.filter2 = filter2
+        self.cost = filter1.cost + filter2.cost
 
-        class OrFilter(Filter):
-            def __init__(self, filter1: Filter, filter2: Filter):
-                self.filter1 = filter1
-                self.filter2 = filter2
+    def _params(self) -> tuple | None:
+        return (self.filter1, self.filter2)
 
-            def filter(self, file: File) -> bool:
-                return self.filter1.filter(file) or self.filter2.filter(file)
+    def children(self) -> list[Filter]:
+        return [self.filter1, self.filter2]
 
-        return OrFilter(self, other)
+    def filter(self, file: File) -> bool:
+        return self.filter1.filter(file) and self.filter2.filter(file)
 
-    def __invert__(self) -> "Filter":
-        class NotFilter(Filter):
-            def __init__(self, filter: Filter) -> None:
-                self.inverted_filter = filter
+    def dir_verdict(self, relative_dir: str) -> bool | None:
+        verdict1 = self.filter1.dir_verdict(relative_dir)
+        if verdict1 is False:
+            return False
 
-            def filter(self, file: File) -> bool:
-                return not self.inverted_filter.filter(file)
+        verdict2 = self.filter2.dir_verdict(relative_dir)
+        if verdict2 is False:
+            return False
 
-        return NotFilter(self)
+        return True if verdict1 and verdict2 else None
+
+    def candidates(self, index: ContentIndex) -> set[str] | None:
+        return intersect_candidates([self.filter1.candidates(index), self.filter2.candidates(index)])
+
+
+class OrFilter(Filter):
+    def __init__(self, filter1: Filter, filter2: Filter):
+        self.filter1 = filter1
+        self.filter2 = filter2
+        self.cost = filter1.cost + filter2.cost
+
+    def _params(self) -> tuple | None:
+        return (self.filter1, self.filter2)
+
+    def children(self) -> list[Filter]:
+        return [self.filter1, self.filter2]
+
+    def filter(self, file: File) -> bool:
+        return self.filter1.filter(file) or self.filter2.filter(file)
+
+    def dir_verdict(self, relative_dir: str) -> bool | None:
+        verdict1 = self.filter1.dir_verdict(relative_dir)
+        if verdict1 is True:
+            return True
+
+        verdict2 = self.filter2.dir_verdict(relative_dir)
+        if verdict2 is True:
+            return True
+
+        return False if verdict1 is False and verdict2 is False else None
+
+    def candidates(self, index: ContentIndex) -> set[str] | None:
+        return unite_candidates([self.filter1.candidates(index), self.filter2.candidates(index)])
+
+
+class NotFilter(Filter):
+    def __init__(self, filter: Filter) -> None:
+        self.inverted_filter = filter
+        self.cost = filter.cost
+
+    def _params(self) -> tuple | None:
+        return (self.inverted_filter,)
+
+    def children(self) -> list[Filter]:
+        return [self.inverted_filter]
+
+    def filter(self, file: File) -> bool:
+        return not self.inverted_filter.filter(file)
+
+    def dir_verdict(self, relative_dir: str) -> bool | None:
+        verdict = self.inverted_filter.dir_verdict(relative_dir)
+        return None if verdict is None else not verdict
+
+
+def intersect_candidates(candidates: t.Iterable[set[str] | None]) -> set[str] | None:
+    """Candidates for all of the filters to match, where None (any file can match) is ignored."""
+    result = None
+    for paths in candidates:
+        if paths is not None:
+            result = paths if result is None else result & paths
+
+    return result
+
+
+def unite_candidates(candidates: t.Iterable[set[str] | None]) -> set[str] | None:
+    """Candidates for any of the filters to match, which can be any file if any of the filters can't tell."""
+    result: set[str] = set()
+    for paths in candidates:
+        if paths is None:
+            return None
+        result |= paths
+
+    return result
+
+
+def _fingerprint_value(value: t.Any) -> str | None:
+    if isinstance(value, Filter):
+        return value.fingerprint()
+
+    if isinstance(value, (tuple, list, set, frozenset)):
+        values = [_fingerprint_value(item) for item in value]
+        if any(item is None for item in values):
+            return None
+
+        # Sets have no order of their own, so it has to be fixed to be the same every time.
+        items = sorted(t.cast(list[str], values)) if isinstance(value, (set, frozenset)) else values
+        return f"[{', '.join(items)}]"
+
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return repr(value)
+
+    return None
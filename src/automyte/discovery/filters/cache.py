@@ -0,0 +1,232 @@
+from __future__ import annotations
+
+import logging
+import os
+import sqlite3
+import time
+import typing as t
+from pathlib import Path
+
+from automyte.utils.filesystem import resolve_storage_path
+
+from ..content_ids import blob_id, git_blob_ids
+from ..file import File, OSFile
+from .base import Filter
+
+if t.TYPE_CHECKING:
+    from ..index import ContentIndex
+
+logger = logging.getLogger(__name__)
+
+# Bumped whenever tables change, cache is just dropped then.
+_SCHEMA_VERSION = 2
+
+
+class FilterCache:
+    """Results of `cacheable` filters for files contents, persisted in a sqlite database.
+
+    Results are keyed by filter fingerprint and hash of the file contents, so they are reused for unchanged files
+        across runs and automatons, as long as they use filters with the same params.
+    Contents hashes are git blob ids, so files tracked by git and unchanged in the working tree aren't even read,
+        including in fresh copies of the project (like worktrees).
+        Hashes of other files are remembered by their path relative to the rootdir, mtime and size,
+        so they are only read again once they change.
+
+    Only up to `max_entries` of the most recently used results and hashes are kept,
+        the rest are evicted on each exploration.
+    Meant to be used for a single project, as hashes are remembered by relative files paths.
+    """
+
+    def __init__(self, filename: str | Path | None = None, max_entries: int = 1_000_000) -> None:
+        """If filename is a directory - will create a new "automyte_filters.db" file there.
+
+        Can set filename to either None, "./", "current", "local" to create cache file in the script launch dir.
+        """
+        self.filepath = resolve_storage_path(filename, default_filename="automyte_filters.db")
+        self.max_entries = max_entries
+        self._connection: sqlite3.Connection | None = None
+        self._connection_pid: int | None = None
+        self._used_at = time.time()
+        self._git_blob_ids: dict[str, dict[str, str]] = {}  # By rootdir, looked up once per exploration.
+
+    def get(self, fingerprint: str, content_hash: str) -> bool | None:
+        row = (
+            self._connect()
+            .execute(
+                "SELECT result, used_at FROM results WHERE fingerprint = ? AND content_hash = ?",
+                (fingerprint, content_hash),
+            )
+            .fetchone()
+        )
+        if row is None:
+            return None
+
+        # Only touching results once per exploration, so that cache hits don't turn into writes for each file.
+        if row[1] < self._used_at:
+            self._connect().execute(
+                "UPDATE results SET used_at = ? WHERE fingerprint = ? AND content_hash = ?",
+                (self._used_at, fingerprint, content_hash),
+            )
+        return bool(row[0])
+
+    def set(self, fingerprint: str, content_hash: str, result: bool):
+        self._connect().execute(
+            "INSERT OR REPLACE INTO results (fingerprint, content_hash, result, used_at) VALUES (?, ?, ?, ?)",
+            (fingerprint, content_hash, result, self._used_at),
+        )
+
+    def content_hash(self, file: OSFile) -> str:
+        path = _relative_path(file)
+        if file.rootdir is not None:
+            if file.rootdir not in self._git_blob_ids:
+                self._git_blob_ids[file.rootdir] = git_blob_ids(file.rootdir)
+            if (tracked_blob_id := self._git_blob_ids[file.rootdir].get(path)) is not None:
+                return tracked_blob_id
+
+        stat = file.stat()
+        row = (
+            self._connect()
+            .execute(
+                "SELECT content_hash, used_at FROM hashes WHERE path = ? AND mtime_ns = ? AND size = ?",
+                (path, stat.st_mtime_ns, stat.st_size),
+            )
+            .fetchone()
+        )
+        if row is not None:
+            if row[1] < self._used_at:
+                self._connect().execute("UPDATE hashes SET used_at = ? WHERE path = ?", (self._used_at, path))
+            return row[0]
+
+        with open(file.fullpath, "rb") as physical_file:
+            contents = physical_file.read()
+        if file.stats is not None:
+            file.stats.add(bytes_read=len(contents))
+
+        content_hash = blob_id(contents)
+        self._connect().execute(
+            "INSERT OR REPLACE INTO hashes (path, mtime_ns, size, content_hash, used_at) VALUES (?, ?, ?, ?, ?)",
+            (path, stat.st_mtime_ns, stat.st_size, content_hash, self._used_at),
+        )
+        return content_hash
+
+    def evict(self):
+        """Drop least recently used entries over the limit and start counting usage for a new exploration."""
+        for table in ("results", "hashes"):
+            self._connect().execute(
+                f"DELETE FROM {table} WHERE rowid IN "
+                f"(SELECT rowid FROM {table} ORDER BY used_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+        self._used_at = time.time()
+        self._git_blob_ids = {}
+
+    def _connect(self) -> sqlite3.Connection:
+        """Keep a connection open per process, as cache is looked up for each file and is used by filter workers too.
+
+        Every statement is committed right away, which is cheap enough with WAL and without syncing on each commit.
+        """
+        if self._connection is not None and self._connection_pid == os.getpid():
+            return self._connection
+
+        if not self.filepath.parent.exists():
+            logger.error("[FilterCache]: Folder %s doesn't exist.", self.filepath.parent)
+            raise ValueError(f"Path {self.filepath} does not exist")
+
+        connection = sqlite3.connect(self.filepath, timeout=30, isolation_level=None, check_same_thread=False)
+        connection.execute("PRAGMA journal_mode = WAL")
+        connection.execute("PRAGMA synchronous = NORMAL")
+        # Schema is checked and created at once, as worker processes can be connecting at the same time.
+        with connection:
+            connection.execute("BEGIN IMMEDIATE")
+            if connection.execute("PRAGMA user_version").fetchone()[0] != _SCHEMA_VERSION:
+                connection.execute("DROP TABLE IF EXISTS results")
+                connection.execute("DROP TABLE IF EXISTS hashes")
+                connection.execute(f"PRAGMA user_version = {_SCHEMA_VERSION}")
+
+            connection.execute(
+                """
+                CREATE TABLE IF NOT EXISTS results (
+                    fingerprint TEXT NOT NULL,
+                    content_hash TEXT NOT NULL,
+                    result INTEGER NOT NULL,
+                    used_at REAL NOT NULL,
+                    PRIMARY KEY (fingerprint, content_hash)
+                )
+                """
+            )
+            connection.execute("CREATE INDEX IF NOT EXISTS results_by_usage ON results (used_at)")
+            connection.execute(
+                """
+                CREATE TABLE IF NOT EXISTS hashes (
+                    path TEXT PRIMARY KEY,
+                    mtime_ns INTEGER NOT NULL,
+                    size INTEGER NOT NULL,
+                    content_hash TEXT NOT NULL,
+                    used_at REAL NOT NULL
+                )
+                """
+            )
+            connection.execute("CREATE INDEX IF NOT EXISTS hashes_by_usage ON hashes (used_at)")
+
+        self._connection, self._connection_pid = connection, os.getpid()
+        return connection
+
+    def __getstate__(self) -> dict:
+        # Connections can't be shared between processes, workers open their own ones.
+        return {**self.__dict__, "_connection": None, "_connection_pid": None, "_git_blob_ids": {}}
+
+
+def _relative_path(file: OSFile) -> str:
+    if file.rootdir is None:
+        return str(file.fullpath)
+
+    folder = file.relative_folder
+    return f"{folder}/{file.name}" if folder else file.name
+
+
+class _CachedFilter(Filter):
+    """Filter which reuses results stored in the cache for files with the same contents."""
+
+    def __init__(self, filter: Filter, fingerprint: str, cache: FilterCache) -> None:
+        self.cached_filter = filter
+        self._key = fingerprint
+        self.cache = cache
+        self.cost = filter.cost
+
+    def filter(self, file: File) -> bool:
+        # Edited files don't match what is on the disk anymore, so there is nothing to look up by.
+        if not isinstance(file, OSFile) or file.is_tainted:
+            return self.cached_filter.filter(file)
+
+        try:
+            content_hash = self.cache.content_hash(file)
+        except OSError:
+            return self.cached_filter.filter(file)
+
+        result = self.cache.get(self._key, content_hash)
+        if result is None:
+            result = self.cached_filter.filter(file)
+            self.cache.set(self._key, content_hash, result)
+
+        return result
+
+    def dir_verdict(self, relative_dir: str) -> bool | None:
+        return self.cached_filter.dir_verdict(relative_dir)
+
+    def candidates(self, index: ContentIndex) -> set[str] | None:
+        return self.cached_filter.candidates(index)
+
+    def children(self) -> list[Filter]:
+        return [self.cached_filter]
+
+    def unwrap(self) -> Filter:
+        return self.cached_filter.unwrap()
+
+    def _params(self) -> tuple | None:
+        return self.cached_filter._params()
+
+
+def cached(filter: Filter, cache: FilterCache) -> Filter:
+    """Wrap filter into the one using cache, if its results can be cached."""
+    fingerprint = filter.fingerprint() if filter.cacheable else None
+    return _CachedFilter(filter, fingerprint=fingerprint, cache=cache) if fingerprint else filter
@@ -1,16 +1,135 @@
+import codecs
+import locale
 import re
+import typing as t
 
 from .base import File, Filter
 
+if t.TYPE_CHECKING:
+    from ..index import ContentIndex
+
+_BACKREFERENCE = re.compile(r"\\[1-9]|\(\?P=")
+
+# Constructs which match differently against bytes than against decoded text: ones matching a single character
+#   (multibyte in utf-8) or depending on unicode classes/case folding, escapes of non-ascii characters
+#   and line endings, as "\r\n" is read as "\n" in text mode.
+_NOT_BYTES_SAFE = re.compile(r"\.|\[\^|\\[wWbBdDsSxuUNnrZ0]|\$|\(\?[a-zA-Z]*[iLu]|[\r\n]")
+
+# Files are read with the default encoding, bytes can only be searched instead if they decode to the same text.
+_TEXT_IS_UTF8 = codecs.lookup(locale.getpreferredencoding(False)).name == "utf-8"
+
 
 class ContainsFilter(Filter):
+    """Filter files which contain any of the given texts or, if `regexp` is set, match any of the given patterns.
+
+    Multiple texts/patterns are compiled once into a single regex, so each file is scanned only once
+        regardless of how many of them there are. Texts are arranged into a prefix tree,
+        so that texts sharing a beginning are checked together, similar to Aho-Corasick matching.
+    Patterns which can't be combined (like ones with backreferences or inline flags) are searched for one by one.
+
+    Whenever texts/patterns would match utf-8 bytes exactly as they would match the decoded text,
+        raw bytes of the file are searched instead, so that rejected files are never decoded nor kept in memory.
+    """
+
+    cost = 100
+    cacheable = True
+
     def __init__(self, contains: str | list[str], regexp: bool = False) -> None:
         self.text = contains if isinstance(contains, list) else [contains]
         self.use_regexp = regexp
 
+        self._combined: re.Pattern | None = None
+        self._patterns: list[re.Pattern] = []
+        if regexp:
+            self._patterns = [re.compile(pattern) for pattern in self.text]
+            self._combined = _combine_patterns(self.text)
+        elif len(self.text) > 1:
+            self._combined = re.compile(_literals_regex(self.text))
+
+        self._raw_pattern = _raw_pattern(self.text, self._combined, regexp) if _TEXT_IS_UTF8 else None
+
     def filter(self, file: File) -> bool:
+        if self._raw_pattern is not None:
+            found = file.search_raw(self._raw_pattern)
+            if found is not None:
+                return found
+
+        if self._combined is not None:
+            return self._combined.search(file.get_contents()) is not None
+
         if not self.use_regexp:
             return any(file.contains(occurance) for occurance in self.text)
 
         file_contents = file.get_contents()
-        return any(re.search(pattern, file_contents) for pattern in self.text)
+        return any(pattern.search(file_contents) for pattern in self._patterns)
+
+    def candidates(self, index: "ContentIndex") -> set[str] | None:
+        # Indexes work with raw bytes, so they are only usable for the same texts which can be searched in bytes.
+        if self._raw_pattern is None:
+            return None
+
+        return index.files_matching(self.text) if self.use_regexp else index.files_containing(self.text)
+
+    def _params(self) -> tuple | None:
+        return (tuple(self.text), self.use_regexp)
+
+
+def _combine_patterns(patterns: list[str]) -> re.Pattern | None:
+    if len(patterns) == 1:
+        return re.compile(patterns[0])
+
+    # Group numbers change once patterns are joined together, so numbered/named backreferences would break.
+    if any(_BACKREFERENCE.search(pattern) for pattern in patterns):
+        return None
+
+    try:
+        return re.compile("|".join(f"(?:{pattern})" for pattern in patterns))
+    except re.error:  # Like inline global flags, which are only allowed at the start, or repeated group names.
+        return None
+
+
+def _raw_pattern(texts: list[str], combined: re.Pattern | None, regexp: bool) -> re.Pattern[bytes] | None:
+    if not texts:
+        return None
+
+    if not regexp:
+        if any(char in text for text in texts for char in "\r\n"):
+            return None
+        return re.compile(_literals_regex([text.encode("utf-8") for text in texts]))
+
+    if combined is None or not combined.pattern.isascii() or _NOT_BYTES_SAFE.search(combined.pattern):
+        return None
+    return re.compile(combined.pattern.encode("ascii"))
+
+
+def _literals_regex(literals: list[t.AnyStr]) -> t.AnyStr:
+    """Build a regex matching any of the literals, with common prefixes factored out into a prefix tree.
+
+    Works the same for bytes literals, which are split into single bytes instead of characters.
+    """
+    end = literals[0][:0]  # Marks nodes at which one of the literals ends, can't clash with single characters.
+    trie: dict = {}
+    for literal in literals:
+        node = trie
+        for i in range(len(literal)):
+            node = node.setdefault(literal[i : i + 1], {})
+        node[end] = {}
+
+    return _trie_regex(trie, end=end)
+
+
+def _trie_regex(node: dict, end: t.AnyStr) -> t.AnyStr:
+    prefix = []
+    # Following chains of single characters without recursion, so that long literals don't hit recursion limit.
+    while end not in node and len(node) == 1:
+        char, node = next(iter(node.items()))
+        prefix.append(re.escape(char))
+
+    # Only presence matters, so once any literal is matched - there is no need to look for longer ones.
+    if end in node:
+        return end.join(prefix)
+
+    alternatives = [re.escape(char) + _trie_regex(child, end=end) for char, child in node.items()]
+    if isinstance(end, bytes):
+        return end.join(prefix) + b"(?:" + b"|".join(alternatives) + b")"
+    return end.join(prefix) + f"(?:{'|'.join(alternatives)})"
@@ -0,0 +1,74 @@
+from datetime import datetime
+
+from .base import File, Filter
+
+
+class SizeFilter(Filter):
+    """Filter files by their size in bytes, `min_size` and `max_size` are both inclusive.
+
+    Size is taken from the directory listing the file has been found by, so it doesn't read the file.
+    """
+
+    cost = 10
+
+    def __init__(self, min_size: int | None = None, max_size: int | None = None) -> None:
+        self.min_size = min_size
+        self.max_size = max_size
+
+    def filter(self, file: File) -> bool:
+        size = file.size
+        if self.min_size is not None and size < self.min_size:
+            return False
+
+        if self.max_size is not None and size > self.max_size:
+            return False
+
+        return True
+
+    def _params(self) -> tuple | None:
+        return (self.min_size, self.max_size)
+
+
+class ModifiedFilter(Filter):
+    """Filter files by their last modification time, both `after` and `before` are inclusive.
+
+    Accepts either datetimes or unix timestamps.
+    """
+
+    cost = 10
+
+    def __init__(self, after: datetime | float | None = None, before: datetime | float | None = None) -> None:
+        self.after = after.timestamp() if isinstance(after, datetime) else after
+        self.before = before.timestamp() if isinstance(before, datetime) else before
+
+    def filter(self, file: File) -> bool:
+        mtime = file.mtime
+        if self.after is not None and mtime < self.after:
+            return False
+
+        if self.before is not None and mtime > self.before:
+            return False
+
+        return True
+
+    def _params(self) -> tuple | None:
+        return (self.after, self.before)
+
+
+class ExtensionFilter(Filter):
+    """Filter files by their extension, like `ExtensionFilter(".py", ".pyi")`.
+
+    Extensions are matched case-insensitively and the leading dot is optional.
+    Multipart extensions are supported as well, like `ExtensionFilter("tar.gz")`.
+    """
+
+    cost = 1
+
+    def __init__(self, *extensions: str) -> None:
+        self.extensions = tuple(f".{ext.lstrip('.').lower()}" for ext in extensions)
+
+    def filter(self, file: File) -> bool:
+        return file.name.lower().endswith(self.extensions)
+
+    def _params(self) -> tuple | None:
+        return (frozenset(self.extensions),)
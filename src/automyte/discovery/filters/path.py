@@ -1,4 +1,5 @@
 import re
+import typing as t
 from pathlib import Path
 
 from .base import File, Filter
@@ -11,15 +12,23 @@ class PathFilter(Filter):
         to search for file extension for example.
     `folder` search is performed by just checking if given folder is present in file path
 
+    If `anchored` is set - `folder` is instead a path relative to explorer rootdir (like "src/api")
+        and only files inside of it match. Then explorers don't even walk folders outside of it.
+
     If both params are passed - they are treated as "and" filter.
     """
 
+    cost = 1
+
     def __init__(
         self,
         filename: str | None = None,
         folder: str | Path | None = None,
+        anchored: bool = False,
     ) -> None:
         self.name = filename
+        self.anchored = anchored
+        self._name_regex = re.compile(filename) if filename else None
 
         if isinstance(folder, Path):
             self.folder = folder
@@ -28,13 +37,39 @@ class PathFilter(Filter):
         else:
             self.folder = None
 
+        self._anchored_folder = self.folder.as_posix().strip("/") if self.folder and anchored else None
+
     def filter(self, file: File) -> bool:
-        if self.name:
-            if not re.search(self.name, file.name):
+        if self._name_regex is not None:
+            if not self._name_regex.search(file.name):
                 return False
 
-        if self.folder:
+        if self._anchored_folder is not None:
+            if not self._is_inside_folder(file.relative_folder):
+                return False
+
+        elif self.folder:
             if str(self.folder) not in file.folder:
                 return False
 
         return True
+
+    def _params(self) -> tuple | None:
+        return (self.name, str(self.folder) if self.folder else None, self.anchored)
+
+    def dir_verdict(self, relative_dir: str) -> bool | None:
+        if self._anchored_folder is None:
+            return None
+
+        if self._is_inside_folder(relative_dir):
+            return None if self.name else True
+
+        # Folders on the way to the anchored one still have to be walked.
+        if not relative_dir or self._anchored_folder.startswith(f"{relative_dir}/"):
+            return None
+
+        return False
+
+    def _is_inside_folder(self, relative_dir: str) -> bool:
+        folder = t.cast(str, self._anchored_folder)
+        return not folder or relative_dir == folder or relative_dir.startswith(f"{folder}/")
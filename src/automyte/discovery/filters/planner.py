@@ -0,0 +1,174 @@
+from __future__ import annotations
+
+import typing as t
+from collections import Counter
+
+from .base import AndFilter, File, Filter, NotFilter, OrFilter, intersect_candidates, unite_candidates
+from .cache import FilterCache, cached
+
+if t.TYPE_CHECKING:
+    from ..index import ContentIndex
+
+
+class AllOf(Filter):
+    """N-ary logical AND, children are evaluated in the given order."""
+
+    def __init__(self, *filters: Filter) -> None:
+        self.filters = filters
+        self.cost = sum(f.cost for f in filters)
+
+    def filter(self, file: File) -> bool:
+        return all(f.filter(file) for f in self.filters)
+
+    def dir_verdict(self, relative_dir: str) -> bool | None:
+        verdicts = []
+        for f in self.filters:
+            verdict = f.dir_verdict(relative_dir)
+            if verdict is False:
+                return False
+            verdicts.append(verdict)
+
+        return True if all(verdicts) else None
+
+    def candidates(self, index: ContentIndex) -> set[str] | None:
+        return intersect_candidates(f.candidates(index) for f in self.filters)
+
+    def _params(self) -> tuple | None:
+        return (frozenset(self.filters),)
+
+    def children(self) -> list[Filter]:
+        return list(self.filters)
+
+
+class AnyOf(Filter):
+    """N-ary logical OR, children are evaluated in the given order."""
+
+    def __init__(self, *filters: Filter) -> None:
+        self.filters = filters
+        self.cost = sum(f.cost for f in filters)
+
+    def filter(self, file: File) -> bool:
+        return any(f.filter(file) for f in self.filters)
+
+    def dir_verdict(self, relative_dir: str) -> bool | None:
+        verdicts = []
+        for f in self.filters:
+            verdict = f.dir_verdict(relative_dir)
+            if verdict is True:
+                return True
+            verdicts.append(verdict)
+
+        return False if not any(v is None for v in verdicts) else None
+
+    def candidates(self, index: ContentIndex) -> set[str] | None:
+        return unite_candidates(f.candidates(index) for f in self.filters)
+
+    def _params(self) -> tuple | None:
+        return (frozenset(self.filters),)
+
+    def children(self) -> list[Filter]:
+        return list(self.filters)
+
+
+class _SharedFilter(Filter):
+    """Subexpression used in several places of the filter tree, evaluated only once per file."""
+
+    def __init__(self, filter: Filter) -> None:
+        self.shared_filter = filter
+        self.cost = filter.cost
+        self._last_file: File | None = None
+        self._last_result = False
+
+    def filter(self, file: File) -> bool:
+        if file is not self._last_file:
+            self._last_result = self.shared_filter.filter(file)
+            self._last_file = file
+
+        return self._last_result
+
+    def dir_verdict(self, relative_dir: str) -> bool | None:
+        return self.shared_filter.dir_verdict(relative_dir)
+
+    def candidates(self, index: ContentIndex) -> set[str] | None:
+        return self.shared_filter.candidates(index)
+
+    def _params(self) -> tuple | None:
+        return self.shared_filter._params()
+
+    def children(self) -> list[Filter]:
+        return [self.shared_filter]
+
+    def unwrap(self) -> Filter:
+        return self.shared_filter.unwrap()
+
+
+def plan_filter(filter: Filter, cache: FilterCache | None = None) -> Filter:
+    """Rewrite filter tree into an equivalent one, which is cheaper to evaluate.
+
+    Nested and/or filters are flattened, so that all of the conditions on the same level can be reordered
+        by their cost, making cheap checks (like by file path) short-circuit the expensive ones (like reading files).
+    Duplicated conditions on the same level are dropped, double negations are removed
+        and subexpressions repeated in different branches of the tree are evaluated only once per file.
+    If `cache` is given - results of cacheable conditions are reused from it for unchanged files.
+    """
+    normalized = _normalize(filter)
+
+    occurrences: Counter[Filter] = Counter()
+    _count_subexpressions(normalized, occurrences)
+    return _share_subexpressions(normalized, occurrences, shared={}, cache=cache)
+
+
+def _normalize(filter: Filter) -> Filter:
+    if isinstance(filter, NotFilter):
+        inverted = _normalize(filter.inverted_filter)
+        if isinstance(inverted, NotFilter):
+            return inverted.inverted_filter
+        return NotFilter(inverted)
+
+    if isinstance(filter, (AndFilter, AllOf)):
+        return _build(AllOf, [_normalize(child) for child in filter.children()])
+
+    if isinstance(filter, (OrFilter, AnyOf)):
+        return _build(AnyOf, [_normalize(child) for child in filter.children()])
+
+    return filter
+
+
+def _build(node_type: type[AllOf] | type[AnyOf], children: list[Filter]) -> Filter:
+    flattened = []
+    for child in children:
+        flattened.extend(child.filters if isinstance(child, node_type) else [child])
+
+    unique = list(dict.fromkeys(flattened))
+    if len(unique) == 1:
+        return unique[0]
+
+    # Sorting is stable, so filters of the same cost are still evaluated in the order they were written.
+    return node_type(*sorted(unique, key=lambda f: f.cost))
+
+
+def _count_subexpressions(filter: Filter, occurrences: Counter[Filter]):
+    occurrences[filter] += 1
+    for child in filter.children():
+        _count_subexpressions(child, occurrences)
+
+
+def _share_subexpressions(
+    filter: Filter, occurrences: Counter[Filter], shared: dict[Filter, Filter], cache: FilterCache | None
+) -> Filter:
+    if filter in shared:
+        return shared[filter]
+
+    if isinstance(filter, NotFilter):
+        result: Filter = NotFilter(_share_subexpressions(filter.inverted_filter, occurrences, shared, cache))
+    elif isinstance(filter, (AllOf, AnyOf)):
+        result = type(filter)(*(_share_subexpressions(child, occurrences, shared, cache) for child in filter.filters))
+    else:
+        result = cached(filter, cache) if cache is not None else filter
+
+    # Not worth caching results of the checks which are as cheap as a cache lookup itself.
+    if occurrences[filter] > 1 and filter.cost > 1:
+        result = _SharedFilter(result)
+        shared[filter] = result
+
+    return result
@@ -0,0 +1,312 @@
+import contextlib
+import logging
+import os
+import re
+import sqlite3
+import typing as t
+from pathlib import Path
+from re import _constants as sre_constants  # type: ignore[attr-defined]
+from re import _parser as sre_parser  # type: ignore[attr-defined]
+
+from automyte.utils.filesystem import resolve_storage_path
+
+from .content_ids import blob_id, git_blob_ids
+from .file import OSFile
+
+logger = logging.getLogger(__name__)
+
+# Bumped whenever tables change, index is just rebuilt from scratch then.
+_SCHEMA_VERSION = 2
+
+
+class ContentIndex:
+    """Source of files which can contain given texts, for explorers to only run content filters against those.
+
+    Candidates have to include every file that can match, but they don't have to match,
+        as they are filtered by the actual contents afterwards.
+    Paths are relative to explorer rootdir, using "/" as a separator. None means index can't tell.
+    """
+
+    def update(self, files: t.Mapping[str, OSFile], rootdir: str | None = None):
+        """Catch up with the current state of files, keyed by their paths relative to rootdir."""
+
+    def forget(self, relative_paths: t.Iterable[str]):
+        """Drop files from the index, like ones which no longer exist."""
+
+    def files_containing(self, texts: list[str]) -> set[str] | None:
+        """Files which might contain any of the texts."""
+        return None
+
+    def files_matching(self, patterns: list[str]) -> set[str] | None:
+        """Files which might match any of the regexp patterns."""
+        return None
+
+
+class TrigramIndex(ContentIndex):
+    """On-disk index of which files contain which trigrams (sequences of 3 bytes), kept in a sqlite database.
+
+    Used by explorers to narrow down files which can contain given texts or match given regexps,
+        so that content filters only have to read those candidates instead of every file in the project.
+    Trigrams are stored by contents of files (by their git blob ids), so unchanged files are not read again,
+        even in fresh copies of the project (like worktrees), as long as they are tracked by git.
+        Files which git doesn't know about are read again only if their mtime or size changed.
+    Paths are stored relative to the rootdir, a separate index should be used for each project.
+
+    Files bigger than `max_file_size` are not indexed, they are always returned as candidates instead.
+    """
+
+    def __init__(self, filename: str | Path | None = None, max_file_size: int = 1024 * 1024) -> None:
+        """If filename is a directory - will create a new "automyte_index.db" file there.
+
+        Can set filename to either None, "./", "current", "local" to create index file in the script launch dir.
+        """
+        self.filepath = resolve_storage_path(filename, default_filename="automyte_index.db")
+        self.max_file_size = max_file_size
+        self._is_initialized = False
+
+    def update(self, files: t.Mapping[str, OSFile], rootdir: str | None = None):
+        """Reindex files, which changed since they were indexed last time.
+
+        If rootdir is given and it's a git repository - contents of tracked files are recognized by git blob ids.
+        """
+        tracked: dict[str, str] | None = None
+
+        with self._connect() as connection:
+            indexed = {
+                row[0]: row[1:]
+                for row in connection.execute(
+                    "SELECT files.path, files.mtime_ns, files.size, contents.blob_id "
+                    "FROM files LEFT JOIN contents ON contents.id = files.content_id"
+                )
+            }
+
+            for relative_path, file in files.items():
+                stat = file.stat()
+                previous = indexed.get(relative_path)
+                if previous is not None and previous[:2] == (stat.st_mtime_ns, stat.st_size):
+                    continue
+
+                if stat.st_size > self.max_file_size:
+                    self._save_file(connection, relative_path, stat=stat, content_id=None)
+                    continue
+
+                if tracked is None:
+                    tracked = git_blob_ids(rootdir) if rootdir is not None else {}
+
+                contents = None
+                file_blob_id = tracked.get(relative_path)
+                if file_blob_id is None:
+                    contents = self._read(file)
+                    file_blob_id = blob_id(contents) if contents is not None else None
+
+                content_id = None
+                if file_blob_id is not None:
+                    content_id = self._content_id(connection, file_blob_id, file=file, contents=contents)
+                self._save_file(connection, relative_path, stat=stat, content_id=content_id)
+
+            self._forget_unused_contents(connection)
+
+    def files_containing(self, texts: list[str]) -> set[str] | None:
+        """Files which have all trigrams of any of the texts, can't tell anything for texts shorter than a trigram."""
+        return self._files_with_any(_trigrams(text.encode("utf-8")) for text in texts)
+
+    def files_matching(self, patterns: list[str]) -> set[str] | None:
+        """Files which have all trigrams of literal parts, that every match of the pattern has to contain.
+
+        Can't tell anything for patterns without such parts (like ones with alternations only)
+            or with case insensitive ones.
+        """
+        trigrams = []
+        for pattern in patterns:
+            literals = _required_literals(pattern)
+            if literals is None:
+                return None
+            trigrams.append(set().union(*map(_trigrams, literals)))
+
+        return self._files_with_any(trigrams)
+
+    def _files_with_any(self, trigram_sets: t.Iterable[set[int]]) -> set[str] | None:
+        candidates: set[str] = set()
+        for trigrams in trigram_sets:
+            paths = self._files_with_trigrams(trigrams)
+            if paths is None:
+                return None
+            candidates |= paths
+
+        return candidates
+
+    def _files_with_trigrams(self, trigrams: set[int]) -> set[str] | None:
+        if not trigrams:
+            return None
+
+        with self._connect() as connection:
+            rows = connection.execute(
+                f"""
+                SELECT path FROM files WHERE content_id IS NULL OR content_id IN (
+                    SELECT content_id FROM trigrams WHERE trigram IN ({", ".join("?" * len(trigrams))})
+                    GROUP BY content_id HAVING COUNT(*) = ?
+                )
+                """,
+                (*trigrams, len(trigrams)),
+            ).fetchall()
+
+        return {row[0] for row in rows}
+
+    def forget(self, relative_paths: t.Iterable[str]):
+        with self._connect() as connection:
+            for relative_path in relative_paths:
+                connection.execute("DELETE FROM files WHERE path = ?", (relative_path,))
+            self._forget_unused_contents(connection)
+
+    def _read(self, file: OSFile) -> bytes | None:
+        try:
+            with open(file.fullpath, "rb") as physical_file:
+                contents = physical_file.read()
+        except OSError as e:
+            logger.warning("[Index %s]: Failed to read %s: %s", self.filepath, file.fullpath, e)
+            return None
+
+        if file.stats is not None:
+            file.stats.add(bytes_read=len(contents))
+        return contents
+
+    def _content_id(
+        self, connection: sqlite3.Connection, file_blob_id: str, file: OSFile, contents: bytes | None
+    ) -> int | None:
+        """Row of the contents with given blob id, indexing them first if they haven't been seen yet."""
+        row = connection.execute("SELECT id FROM contents WHERE blob_id = ?", (file_blob_id,)).fetchone()
+        if row is not None:
+            return row[0]
+
+        if contents is None:
+            contents = self._read(file)
+            if contents is None:
+                return None
+
+        content_id = connection.execute("INSERT INTO contents (blob_id) VALUES (?)", (file_blob_id,)).lastrowid
+        connection.executemany(
+            "INSERT INTO trigrams (trigram, content_id) VALUES (?, ?)",
+            ((trigram, content_id) for trigram in _trigrams(contents)),
+        )
+        return content_id
+
+    def _save_file(
+        self, connection: sqlite3.Connection, relative_path: str, stat: os.stat_result, content_id: int | None
+    ):
+        # Files without contents are not indexed, so they are always returned as candidates.
+        connection.execute(
+            "INSERT OR REPLACE INTO files (path, mtime_ns, size, content_id) VALUES (?, ?, ?, ?)",
+            (relative_path, stat.st_mtime_ns, stat.st_size, content_id),
+        )
+
+    def _forget_unused_contents(self, connection: sqlite3.Connection):
+        # Deleting contents cascades to their trigrams, so that stale ones don't stay around.
+        connection.execute(
+            "DELETE FROM contents WHERE id NOT IN (SELECT content_id FROM files WHERE content_id IS NOT NULL)"
+        )
+
+    @contextlib.contextmanager
+    def _connect(self):
+        if not self.filepath.parent.exists():
+            logger.error("[Index]: Folder %s doesn't exist.", self.filepath.parent)
+            raise ValueError(f"Path {self.filepath} does not exist")
+
+        connection = sqlite3.connect(self.filepath, timeout=30)
+        try:
+            connection.execute("PRAGMA foreign_keys = ON")
+            if not self._is_initialized:
+                self._create_schema(connection)
+                self._is_initialized = True
+
+            with connection:  # Commits transaction on success, rolls back on errors.
+                yield connection
+
+        finally:
+            connection.close()
+
+    def _create_schema(self, connection: sqlite3.Connection):
+        connection.execute("PRAGMA journal_mode = WAL")
+        with connection:
+            if connection.execute("PRAGMA user_version").fetchone()[0] != _SCHEMA_VERSION:
+                for table in ("trigrams", "files", "contents"):
+                    connection.execute(f"DROP TABLE IF EXISTS {table}")
+                connection.execute(f"PRAGMA user_version = {_SCHEMA_VERSION}")
+
+            connection.execute(
+                """
+                CREATE TABLE IF NOT EXISTS contents (
+                    id INTEGER PRIMARY KEY,
+                    blob_id TEXT NOT NULL UNIQUE
+                )
+                """
+            )
+            connection.execute(
+                """
+                CREATE TABLE IF NOT EXISTS files (
+                    path TEXT PRIMARY KEY,
+                    mtime_ns INTEGER NOT NULL,
+                    size INTEGER NOT NULL,
+                    content_id INTEGER REFERENCES contents (id)
+                )
+                """
+            )
+            connection.execute("CREATE INDEX IF NOT EXISTS files_by_content ON files (content_id)")
+            connection.execute(
+                """
+                CREATE TABLE IF NOT EXISTS trigrams (
+                    trigram INTEGER NOT NULL,
+                    content_id INTEGER NOT NULL REFERENCES contents (id) ON DELETE CASCADE,
+                    PRIMARY KEY (trigram, content_id)
+                ) WITHOUT ROWID
+                """
+            )
+            connection.execute("CREATE INDEX IF NOT EXISTS trigrams_by_content ON trigrams (content_id)")
+
+
+def _trigrams(data: bytes) -> set[int]:
+    return {(data[i] << 16) | (data[i + 1] << 8) | data[i + 2] for i in range(len(data) - 2)}
+
+
+def _required_literals(pattern: str) -> list[bytes] | None:
+    """Literal parts of the regexp, which every match of it has to contain, None if they can't be relied upon.
+
+    Only parts outside of alternations, optional repeats and case insensitive groups are taken,
+        which is enough for most patterns used to look for code, like "def \\w+\\(self" or "import (os|sys)".
+    """
+    try:
+        parsed = sre_parser.parse(pattern)
+    except re.error:
+        return None
+
+    if parsed.state.flags & re.IGNORECASE:
+        return None
+
+    literals: list[bytes] = []
+    _collect_literals(parsed, literals)
+    return literals
+
+
+def _collect_literals(items: t.Iterable[tuple[t.Any, t.Any]], literals: list[bytes]):
+    run = bytearray()
+    for op, value in items:
+        if op is sre_constants.LITERAL:
+            run += chr(value).encode("utf-8")
+            continue
+
+        if run:
+            literals.append(bytes(run))
+            run = bytearray()
+
+        if op is sre_constants.SUBPATTERN:
+            _, add_flags, _, subpattern = value
+            if not add_flags & re.IGNORECASE:
+                _collect_literals(subpattern, literals)
+        elif op in (sre_constants.MAX_REPEAT, sre_constants.MIN_REPEAT, sre_constants.POSSESSIVE_REPEAT):
+            min_count, _, subpattern = value
+            if min_count > 0:
+                _collect_literals(subpattern, literals)
+        elif op is sre_constants.ATOMIC_GROUP:
+            _collect_literals(value, literals)
+
+    if run:
+        literals.append(bytes(run))
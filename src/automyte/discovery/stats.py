@@ -0,0 +1,37 @@
+import threading
+from dataclasses import dataclass, field
+
+
+@dataclass
+class ExplorationStats:
+    """Counters of files I/O done while exploring a project, safe to update from several threads."""
+
+    files_scanned: int = 0
+    files_modified: int = 0
+    bytes_read: int = 0
+    bytes_written: int = 0
+    files_skipped_binary: int = 0
+    files_skipped_oversized: int = 0
+
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    def add(
+        self,
+        files_scanned: int = 0,
+        files_modified: int = 0,
+        bytes_read: int = 0,
+        bytes_written: int = 0,
+        files_skipped_binary: int = 0,
+        files_skipped_oversized: int = 0,
+    ):
+        with self._lock:
+            self.files_scanned += files_scanned
+            self.files_modified += files_modified
+            self.bytes_read += bytes_read
+            self.bytes_written += bytes_written
+            self.files_skipped_binary += files_skipped_binary
+            self.files_skipped_oversized += files_skipped_oversized
+
+    @property
+    def files_skipped(self) -> int:
+        return self.files_skipped_binary + self.files_skipped_oversized
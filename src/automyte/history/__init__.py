@@ -1,11 +1,16 @@
 from .base import History
+from .buffered import BufferedHistory
 from .in_file import InFileHistory
 from .in_memory import InMemoryHistory
-from .types import AutomatonRunResult
+from .sqlite import SqliteHistory
+from .types import AutomatonRunResult, RunMetrics
 
 __all__ = [
     "AutomatonRunResult",
+    "BufferedHistory",
     "History",
     "InMemoryHistory",
     "InFileHistory",
+    "RunMetrics",
+    "SqliteHistory",
 ]
@@ -1,6 +1,7 @@
 import abc
+import typing as t
 
-from .types import AutomatonRunResult, ProjectID
+from .types import AutomatonRunResult, ProjectID, RunStatus
 
 
 class History(abc.ABC):
@@ -16,3 +17,38 @@ class History(abc.ABC):
         If <automaton_name> automaton has never ran for a project - return status as "new".
         """
         raise NotImplementedError
+
+    def query(
+        self,
+        automaton_name: str,
+        statuses: t.Iterable[RunStatus] | None = None,
+        project_ids: t.Iterable[ProjectID] | None = None,
+    ) -> t.Iterator[tuple[ProjectID, AutomatonRunResult]]:
+        """Iterate over projects in <automaton_name> history, which have any of `statuses` and are in `project_ids`.
+
+        Filters which are not given are not applied; projects missing from history are never returned.
+        Meant to be overriden by backends capable of indexed lookups, by default just filters `read()` results.
+        """
+        wanted_statuses = set(statuses) if statuses is not None else None
+        wanted_projects = set(project_ids) if project_ids is not None else None
+
+        for project_id, run in self.read(automaton_name).items():
+            if wanted_statuses is not None and run.status not in wanted_statuses:
+                continue
+            if wanted_projects is not None and project_id not in wanted_projects:
+                continue
+
+            yield project_id, run
+
+    def mark_running(self, automaton_name: str, project_ids: list[ProjectID]):
+        """Hook for backends, which can cheaply record that projects are being processed right now.
+
+        Called by automaton right before projects are started, so that crashed runs leave a "running" trace.
+        Does nothing by default, as for plain backends it would mean an additional durable write per project.
+        """
+
+    def flush(self):
+        """Hook for backends, which don't write status updates right away, to persist all pending updates.
+
+        Called by automaton at the end of each run, regardless of how it has ended.
+        """
@@ -0,0 +1,143 @@
+import atexit
+import logging
+import threading
+import typing as t
+
+from .base import History
+from .types import AutomatonRunResult, ProjectID, RunStatus
+
+logger = logging.getLogger(__name__)
+
+_HistoryKey = tuple[str, ProjectID]
+
+
+class BufferedHistory(History):
+    """Write-behind wrapper over any other history backend.
+
+    Status updates are collected in memory and written to the wrapped history in batches by a background thread:
+        once `flush_every` updates are pending or every `flush_interval` seconds, whichever comes first,
+        so that automaton never waits for history I/O between projects.
+    Reads see pending updates right away. Whatever is left is written on `flush()`,
+        which automaton calls at the end of each run, and at interpreter exit.
+
+    Projects are marked as "running" when they are started, same as other updates it only goes into memory.
+        Markers of projects which are still in progress by the next batch get written by the background thread,
+        so that crashed runs leave "running" trace, while quick projects only ever write their final status.
+    """
+
+    def __init__(self, history: History, flush_every: int = 100, flush_interval: float = 5.0) -> None:
+        self.history = history
+        self.flush_every = flush_every
+        self.flush_interval = flush_interval
+
+        self._pending: dict[_HistoryKey, AutomatonRunResult] = {}
+        self._being_flushed: dict[_HistoryKey, AutomatonRunResult] = {}
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()  # Only a single batch is written at a time, to keep updates order.
+
+        self._flush_requested = threading.Event()
+        self._flusher: threading.Thread | None = None
+        self._closed = False
+        atexit.register(self.close)
+
+    def get_status(self, automaton_name: str, project_id: str) -> AutomatonRunResult:
+        buffered = self._get_buffered(automaton_name).get(project_id)
+        if buffered is not None:
+            return buffered
+
+        return self.history.get_status(automaton_name=automaton_name, project_id=project_id)
+
+    def set_status(self, automaton_name: str, project_id: str, status: AutomatonRunResult):
+        with self._lock:
+            self._pending[(automaton_name, project_id)] = status
+            pending_count = len(self._pending)
+
+        self._start_flusher()
+        if pending_count >= self.flush_every:
+            self._flush_requested.set()
+
+    def read(self, automaton_name: str) -> dict[ProjectID, AutomatonRunResult]:
+        buffered = self._get_buffered(automaton_name)
+        return {**self.history.read(automaton_name), **buffered}
+
+    def query(
+        self,
+        automaton_name: str,
+        statuses: t.Iterable[RunStatus] | None = None,
+        project_ids: t.Iterable[ProjectID] | None = None,
+    ) -> t.Iterator[tuple[ProjectID, AutomatonRunResult]]:
+        statuses = set(statuses) if statuses is not None else None
+        project_ids = set(project_ids) if project_ids is not None else None
+        buffered = self._get_buffered(automaton_name)
+
+        for project_id, run in self.history.query(automaton_name, statuses=statuses, project_ids=project_ids):
+            if project_id not in buffered:
+                yield project_id, run
+
+        for project_id, run in buffered.items():
+            if (statuses is None or run.status in statuses) and (project_ids is None or project_id in project_ids):
+                yield project_id, run
+
+    def mark_running(self, automaton_name: str, project_ids: list[ProjectID]):
+        with self._lock:
+            for project_id in project_ids:
+                self._pending[(automaton_name, project_id)] = AutomatonRunResult(status="running")
+
+        self._start_flusher()
+
+    def flush(self):
+        with self._flush_lock:
+            with self._lock:
+                self._being_flushed, self._pending = self._pending, {}
+
+            try:
+                while self._being_flushed:
+                    (automaton_name, project_id), status = next(iter(self._being_flushed.items()))
+                    self.history.set_status(automaton_name=automaton_name, project_id=project_id, status=status)
+                    with self._lock:
+                        del self._being_flushed[(automaton_name, project_id)]
+
+                self.history.flush()
+
+            finally:
+                # If wrapped history has failed - keep whatever wasn't written for the next try, unless it's outdated.
+                with self._lock:
+                    self._pending = {**self._being_flushed, **self._pending}
+                    self._being_flushed = {}
+
+    def close(self):
+        """Stop background flushing and write all pending updates."""
+        atexit.unregister(self.close)
+        self._closed = True
+        self._flush_requested.set()
+        if self._flusher is not None and self._flusher is not threading.current_thread():
+            self._flusher.join()
+
+        self.flush()
+
+    def _get_buffered(self, automaton_name: str) -> dict[ProjectID, AutomatonRunResult]:
+        with self._lock:
+            return {
+                project_id: status
+                for (automaton, project_id), status in (*self._being_flushed.items(), *self._pending.items())
+                if automaton == automaton_name
+            }
+
+    def _start_flusher(self):
+        if self._flusher is not None or self._closed:
+            return
+
+        with self._lock:
+            if self._flusher is None:
+                self._flusher = threading.Thread(target=self._flush_in_background, daemon=True)
+                self._flusher.start()
+
+    def _flush_in_background(self):
+        while not self._closed:
+            self._flush_requested.wait(timeout=self.flush_interval)
+            self._flush_requested.clear()
+
+            try:
+                self.flush()
+            except Exception:
+                logger.exception("[History]: Failed to flush buffered status updates, will retry later.")
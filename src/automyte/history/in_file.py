@@ -1,13 +1,19 @@
 import csv
+import dataclasses
+import io
 import logging
 import os
+import shutil
+import tempfile
 import typing as t
 from collections import defaultdict
 from dataclasses import dataclass
 from pathlib import Path
 
+from automyte.utils.filesystem import locked, resolve_storage_path
+
 from .base import History
-from .types import AutomatonRunResult, ProjectID, RunStatus
+from .types import AutomatonRunResult, ProjectID, RunMetrics, RunStatus
 
 logger = logging.getLogger(__name__)
 
@@ -19,9 +25,23 @@ class InFileHistory(History):
         not overriden or lost.
     File extension doesn't matter, internally, file structure is csv.
     Users are free to manipulate that file manually, for manual overrides.
+    Besides status and error, each record holds the run metrics columns, which are left empty if there are none.
+
+    Safe to share between several automaton processes, as each update holds an advisory lock on the file
+        for the whole read-modify-write, and file is rewritten atomically, so readers never see it half-written.
+
+    In `append_only` mode, each status update is appended to the file as a new record instead of rewriting it,
+        with the latest record for a project taking precedence. File is indexed in memory once
+        and afterwards only records appended since the last read are parsed.
+        Old records can be collapsed with `compact()` or automatically, see `compact_after`.
     """
 
-    def __init__(self, filename: str | Path | None = None) -> None:
+    def __init__(
+        self,
+        filename: str | Path | None = None,
+        append_only: bool = False,
+        compact_after: int | None = None,
+    ) -> None:
         """Setup new instance of in-file history.
 
         If filename is a directory - will create a new "automyte_history.csv" file there;
@@ -29,9 +49,14 @@ class InFileHistory(History):
             as long as the parent folder of that file exists.
 
         Can set filename to either None, "./", "current", "local" to create history file in the script launch dir.
+
+        `compact_after` - only for `append_only` mode, compact the file once it has that many superseded records.
         """
-        self.filepath = self._set_storage_path(filename)
-        self.file_io = _HistoryFileIO(filepath=self.filepath)
+        self.filepath = resolve_storage_path(filename, default_filename="automyte_history.csv")
+        if append_only:
+            self.file_io = _AppendOnlyHistoryFileIO(filepath=self.filepath, compact_after=compact_after)
+        else:
+            self.file_io = _HistoryFileIO(filepath=self.filepath)
 
     def get_status(self, automaton_name: str, project_id: str) -> AutomatonRunResult:
         return self.file_io.get_automaton_history(automaton_name=automaton_name).get(
@@ -48,21 +73,19 @@ class InFileHistory(History):
 
         return self.file_io.get_automaton_history(automaton_name=automaton_name)
 
-    def _set_storage_path(self, filepath: str | Path | None):
-        result = Path(os.getcwd())
+    def compact(self, retain: "_RetentionPolicy | None" = None):
+        """Rewrite history file, leaving only the latest record for each project.
 
-        if isinstance(filepath, str):
-            if filepath == "." or filepath == "./" or filepath == "current" or filepath == "local":
-                pass
-            else:
-                result = Path(filepath)
+        `retain` can be used as a retention policy: records for which it returns False are dropped altogether,
+            for example `lambda automaton, project, run: automaton in still_used_automatons`.
+        """
+        self.file_io.compact(retain=retain)
 
-        elif isinstance(filepath, Path):
-            result = filepath
 
-        if result.is_dir():
-            result = result / "automyte_history.csv"
-        return result
+_RetentionPolicy: t.TypeAlias = t.Callable[[str, ProjectID, AutomatonRunResult], bool]
+
+
+_METRICS_FIELDS = [(field.name, field.type) for field in dataclasses.fields(RunMetrics)]
 
 
 @dataclass
@@ -75,21 +98,23 @@ class _HistoryFileIO:
     def __init__(self, filepath: Path) -> None:
         self.filepath = filepath
         self.separator = "|"
+        self.fieldnames = ["automaton", "project", "status", "error", *(name for name, _ in _METRICS_FIELDS)]
 
     def save_project_run(self, automaton_name: str, project_id: ProjectID, run_result: AutomatonRunResult):
-        history_instances = {
-            automaton: _AutomatonHistoryInstance(automaton_name=automaton, projects=projects)
-            for automaton, projects in self._parse_file().items()
-        }
+        with locked(self.filepath):
+            history_instances = {
+                automaton: _AutomatonHistoryInstance(automaton_name=automaton, projects=projects)
+                for automaton, projects in self._parse_file().items()
+            }
 
-        if not history_instances.get(automaton_name):
-            history_instances[automaton_name] = _AutomatonHistoryInstance(
-                automaton_name=automaton_name, projects={project_id: run_result}
-            )
-        else:
-            history_instances[automaton_name].projects[project_id] = run_result
+            if not history_instances.get(automaton_name):
+                history_instances[automaton_name] = _AutomatonHistoryInstance(
+                    automaton_name=automaton_name, projects={project_id: run_result}
+                )
+            else:
+                history_instances[automaton_name].projects[project_id] = run_result
 
-        self._update_history_file(all_automatons_histories=list(history_instances.values()))
+            self._update_history_file(all_automatons_histories=list(history_instances.values()))
 
     def get_automaton_history(self, automaton_name: str) -> dict[ProjectID, AutomatonRunResult]:
         data = self._parse_file()
@@ -105,36 +130,160 @@ class _HistoryFileIO:
         with open(self.filepath, "r") as csv_file:
             reader = csv.reader(csv_file, delimiter=self.separator)
             # Skipping header, as we don't care.
-            next(reader)
-
-            for automaton_name, project_id, status, error in reader:
-                if status not in ("fail", "success", "skipped", "running", "new"):
-                    logger.error(
-                        "[History %s]: Failed to parse history file - wrong project status: %s.",
-                        automaton_name,
-                        status,
-                    )
-                    raise ValueError(f"Incorrect project status in history file: {status}")
-                history_instances[automaton_name][project_id] = AutomatonRunResult(status=status, error=error or None)
+            next(reader, None)
+
+            for row in reader:
+                if not row:
+                    continue
+
+                automaton_name, project_id, run_result = self._parse_row(row)
+                history_instances[automaton_name][project_id] = run_result
 
         return history_instances
 
+    def _parse_row(self, row: list[str]) -> tuple[str, ProjectID, AutomatonRunResult]:
+        automaton_name, project_id, status, error = row[:4]
+        if status not in ("fail", "success", "skipped", "running", "new"):
+            logger.error(
+                "[History %s]: Failed to parse history file - wrong project status: %s.",
+                automaton_name,
+                status,
+            )
+            raise ValueError(f"Incorrect project status in history file: {status}")
+
+        run_result = AutomatonRunResult(status=status, error=error or None, metrics=self._parse_metrics(row[4:]))
+        return automaton_name, project_id, run_result
+
+    def _parse_metrics(self, values: list[str]) -> RunMetrics | None:
+        # Records written without metrics, or before they were introduced, don't have run_id.
+        if not values or not values[0]:
+            return None
+
+        return RunMetrics(**{name: type_(value) for (name, type_), value in zip(_METRICS_FIELDS, values)})
+
+    def _to_record(self, automaton_name: str, project_id: ProjectID, run_result: AutomatonRunResult) -> dict:
+        record = {
+            "automaton": automaton_name,
+            "project": project_id,
+            "status": run_result.status,
+            "error": run_result.error,
+        }
+        if run_result.metrics is not None:
+            record.update(dataclasses.asdict(run_result.metrics))
+
+        return record
+
+    def compact(self, retain: _RetentionPolicy | None = None):
+        with locked(self.filepath):
+            histories = []
+            for automaton_name, projects in self._parse_file().items():
+                if retain is not None:
+                    projects = {pid: run for pid, run in projects.items() if retain(automaton_name, pid, run)}
+                histories.append(_AutomatonHistoryInstance(automaton_name=automaton_name, projects=projects))
+
+            self._update_history_file(all_automatons_histories=histories)
+
     def _update_history_file(self, all_automatons_histories: list[_AutomatonHistoryInstance]):
-        with open(self.filepath, "w") as csv_file:
-            writer = csv.DictWriter(
-                csv_file, delimiter=self.separator, fieldnames=["automaton", "project", "status", "error"]
+        # Writing into a separate file first, so that history is never left half-written.
+        with tempfile.NamedTemporaryFile("w", dir=self.filepath.parent, delete=False) as tmp_file:
+            self._write_histories(tmp_file, all_automatons_histories=all_automatons_histories)
+
+        if self.filepath.exists():
+            shutil.copymode(self.filepath, tmp_file.name)
+        os.replace(tmp_file.name, self.filepath)
+
+    def _write_histories(self, csv_file: t.TextIO, all_automatons_histories: list[_AutomatonHistoryInstance]):
+        writer = csv.DictWriter(csv_file, delimiter=self.separator, fieldnames=self.fieldnames)
+        writer.writeheader()
+
+        for automaton_history in all_automatons_histories:
+            writer.writerows(
+                [
+                    self._to_record(automaton_history.automaton_name, project_id, run_result)
+                    for project_id, run_result in automaton_history.projects.items()
+                ]
             )
-            writer.writeheader()
-
-            for automaton_history in all_automatons_histories:
-                writer.writerows(
-                    [
-                        {
-                            "automaton": automaton_history.automaton_name,
-                            "project": project_id,
-                            "status": run_result.status,
-                            "error": run_result.error,
-                        }
-                        for project_id, run_result in automaton_history.projects.items()
-                    ]
-                )
+
+
+class _AppendOnlyHistoryFileIO(_HistoryFileIO):
+    """History file io, which only ever appends records to the end of the file and keeps an in-memory index of it.
+
+    Index is built by reading the whole file once, afterwards only the tail of the file (after last read offset)
+        is parsed, which also picks up records appended by other instances/processes.
+    If the file has been replaced or truncated (like after compaction or manual edit) - index is rebuilt from scratch.
+    """
+
+    def __init__(self, filepath: Path, compact_after: int | None = None) -> None:
+        super().__init__(filepath=filepath)
+        self.compact_after = compact_after
+
+        self._index: t.DefaultDict[str, dict[ProjectID, AutomatonRunResult]] = defaultdict(dict)
+        self._superseded_records = 0
+        self._offset = 0
+        self._file_id: tuple[int, int] | None = None
+
+    def save_project_run(self, automaton_name: str, project_id: ProjectID, run_result: AutomatonRunResult):
+        with locked(self.filepath):
+            self._refresh_index()
+
+            with open(self.filepath, "a") as csv_file:
+                writer = csv.DictWriter(csv_file, delimiter=self.separator, fieldnames=self.fieldnames)
+                if csv_file.tell() == 0:
+                    writer.writeheader()
+                writer.writerow(self._to_record(automaton_name, project_id, run_result))
+                csv_file.flush()
+
+                # Other writers are locked out, so own record is the only thing after the last read offset.
+                self._offset = csv_file.tell()
+
+        self._add_to_index(automaton_name, project_id, run_result)
+
+        if self.compact_after is not None and self._superseded_records >= self.compact_after:
+            self.compact()
+
+    def get_automaton_history(self, automaton_name: str) -> dict[ProjectID, AutomatonRunResult]:
+        self._refresh_index()
+        return dict(self._index.get(automaton_name, {}))
+
+    def compact(self, retain: _RetentionPolicy | None = None):
+        super().compact(retain=retain)
+        self._reset_index()
+
+    def _refresh_index(self):
+        if not self.filepath.exists():
+            self.filepath.touch()
+
+        stat = self.filepath.stat()
+        if (stat.st_dev, stat.st_ino) != self._file_id or stat.st_size < self._offset:
+            self._reset_index()
+            self._file_id = (stat.st_dev, stat.st_ino)
+
+        if stat.st_size == self._offset:
+            return
+
+        with open(self.filepath, "rb") as history_file:
+            history_file.seek(self._offset)
+            tail = history_file.read()
+
+        # Only consuming complete lines, in case if some other process is in the middle of writing a record.
+        tail = tail[: tail.rfind(b"\n") + 1]
+        reader = csv.reader(io.StringIO(tail.decode(), newline=""), delimiter=self.separator)
+        if self._offset == 0:
+            next(reader, None)  # Skipping header.
+
+        for row in reader:
+            if row:
+                self._add_to_index(*self._parse_row(row))
+
+        self._offset += len(tail)
+
+    def _add_to_index(self, automaton_name: str, project_id: ProjectID, run_result: AutomatonRunResult):
+        if project_id in self._index[automaton_name]:
+            self._superseded_records += 1
+        self._index[automaton_name][project_id] = run_result
+
+    def _reset_index(self):
+        self._index = defaultdict(dict)
+        self._superseded_records = 0
+        self._offset = 0
+        self._file_id = None
@@ -1,18 +1,49 @@
+import typing as t
 from collections import defaultdict
 
 from .base import History
-from .types import AutomatonRunResult
+from .types import AutomatonRunResult, ProjectID, RunStatus
 
 
 class InMemoryHistory(History):
+    """Keep automatons runs in memory, separately for each automaton and indexed by status for quick queries."""
+
     def __init__(self) -> None:
-        self.data: dict[str, AutomatonRunResult] = defaultdict(lambda: AutomatonRunResult(status="new"))
+        self.data: t.DefaultDict[str, dict[ProjectID, AutomatonRunResult]] = defaultdict(dict)
+        self._by_status: t.DefaultDict[str, t.DefaultDict[RunStatus, dict[ProjectID, None]]] = defaultdict(
+            lambda: defaultdict(dict)  # Dicts are used as ordered sets.
+        )
 
     def get_status(self, automaton_name: str, project_id: str) -> AutomatonRunResult:
-        return self.data[project_id]
+        return self.data[automaton_name].get(project_id, AutomatonRunResult(status="new"))
 
     def set_status(self, automaton_name: str, project_id: str, status: AutomatonRunResult):
-        self.data[project_id] = status
+        previous = self.data[automaton_name].get(project_id)
+        if previous is not None:
+            self._by_status[automaton_name][previous.status].pop(project_id, None)
+
+        self.data[automaton_name][project_id] = status
+        self._by_status[automaton_name][status.status][project_id] = None
 
     def read(self, automaton_name: str):
-        return self.data
+        return dict(self.data[automaton_name])
+
+    def query(
+        self,
+        automaton_name: str,
+        statuses: t.Iterable[RunStatus] | None = None,
+        project_ids: t.Iterable[ProjectID] | None = None,
+    ) -> t.Iterator[tuple[ProjectID, AutomatonRunResult]]:
+        # Taking snapshots of the indexes, so that history can be updated while the results are consumed.
+        projects = self.data[automaton_name]
+
+        if statuses is None:
+            candidates = list(projects if project_ids is None else project_ids)
+            yield from ((pid, projects[pid]) for pid in candidates if pid in projects)
+            return
+
+        wanted_projects = set(project_ids) if project_ids is not None else None
+        for status in dict.fromkeys(statuses):
+            for project_id in list(self._by_status[automaton_name][status]):
+                if wanted_projects is None or project_id in wanted_projects:
+                    yield project_id, projects[project_id]
@@ -0,0 +1,150 @@
+import contextlib
+import dataclasses
+import logging
+import sqlite3
+import typing as t
+from pathlib import Path
+
+from automyte.utils.filesystem import resolve_storage_path
+from automyte.utils.iterables import batched
+
+from .base import History
+from .types import AutomatonRunResult, ProjectID, RunMetrics, RunStatus
+
+logger = logging.getLogger(__name__)
+
+_SQL_TYPES = {str: "TEXT", float: "REAL", int: "INTEGER"}
+_METRICS_COLUMNS = {field.name: _SQL_TYPES[field.type] for field in dataclasses.fields(RunMetrics)}
+_RESULT_COLUMNS = ", ".join(["status", "error", *_METRICS_COLUMNS])
+
+
+class SqliteHistory(History):
+    """Store automatons runs for projects in a sqlite database.
+
+    Suited for big fleets of projects better than InFileHistory:
+        each status update is a single row upsert instead of rewriting the whole history
+        and looking up projects by their status goes through an index, without loading all of the history.
+    If history database is reused between automatons - data is separated for automatons, same as for InFileHistory.
+    Run metrics are stored in separate columns, databases created before they were introduced are migrated on open.
+    """
+
+    def __init__(self, filename: str | Path | None = None) -> None:
+        """Setup new instance of sqlite history.
+
+        If filename is a directory - will create a new "automyte_history.db" file there;
+        If filename is a full path to a file - will either use or create database with that name,
+            as long as the parent folder of that file exists.
+
+        Can set filename to either None, "./", "current", "local" to create history file in the script launch dir.
+        """
+        self.filepath = resolve_storage_path(filename, default_filename="automyte_history.db")
+        self._is_initialized = False
+        self._query_chunk_size = 500
+
+    def get_status(self, automaton_name: str, project_id: str) -> AutomatonRunResult:
+        with self._connect() as connection:
+            row = connection.execute(
+                f"SELECT {_RESULT_COLUMNS} FROM history WHERE automaton = ? AND project = ?",
+                (automaton_name, project_id),
+            ).fetchone()
+
+        if row is None:
+            return AutomatonRunResult("new", error=None)
+
+        return self._to_run_result(row)
+
+    def set_status(self, automaton_name: str, project_id: str, status: AutomatonRunResult):
+        with self._connect() as connection:
+            metrics = dataclasses.astuple(status.metrics) if status.metrics else (None,) * len(_METRICS_COLUMNS)
+            connection.execute(
+                f"""
+                INSERT INTO history (automaton, project, {_RESULT_COLUMNS})
+                VALUES (?, ?, ?, ?, {", ".join("?" * len(_METRICS_COLUMNS))})
+                ON CONFLICT (automaton, project) DO UPDATE SET
+                    {", ".join(f"{column} = excluded.{column}" for column in _RESULT_COLUMNS.split(", "))}
+                """,
+                (automaton_name, project_id, status.status, status.error, *metrics),
+            )
+
+    def read(self, automaton_name: str) -> dict[ProjectID, AutomatonRunResult]:
+        with self._connect() as connection:
+            rows = connection.execute(
+                f"SELECT project, {_RESULT_COLUMNS} FROM history WHERE automaton = ?", (automaton_name,)
+            ).fetchall()
+
+        return {row[0]: self._to_run_result(row[1:]) for row in rows}
+
+    def query(
+        self,
+        automaton_name: str,
+        statuses: t.Iterable[RunStatus] | None = None,
+        project_ids: t.Iterable[ProjectID] | None = None,
+    ) -> t.Iterator[tuple[ProjectID, AutomatonRunResult]]:
+        conditions, params = ["automaton = ?"], [automaton_name]
+        if statuses is not None:
+            statuses = list(statuses)
+            conditions.append(f"status IN ({', '.join('?' * len(statuses))})")
+            params.extend(statuses)
+
+        # Projects are looked up in chunks, to stay within sqlite limit on the number of query parameters.
+        project_chunks = [None] if project_ids is None else batched(project_ids, self._query_chunk_size)
+        for chunk in project_chunks:
+            chunk_conditions, chunk_params = conditions, params
+            if chunk is not None:
+                chunk_conditions = [*conditions, f"project IN ({', '.join('?' * len(chunk))})"]
+                chunk_params = [*params, *chunk]
+
+            with self._connect() as connection:
+                rows = connection.execute(
+                    f"SELECT project, {_RESULT_COLUMNS} FROM history WHERE {' AND '.join(chunk_conditions)}",
+                    chunk_params,
+                ).fetchall()
+
+            for row in rows:
+                yield row[0], self._to_run_result(row[1:])
+
+    def _to_run_result(self, row: tuple) -> AutomatonRunResult:
+        status, error, *metrics = row
+        # Records saved without metrics, or before they were introduced, don't have run_id.
+        return AutomatonRunResult(status=status, error=error, metrics=RunMetrics(*metrics) if metrics[0] else None)
+
+    @contextlib.contextmanager
+    def _connect(self):
+        """Open a short-lived connection for each operation, so that history is safe to use from any thread/process."""
+        if not self.filepath.parent.exists():
+            logger.error("[History]: Folder %s doesn't exist.", self.filepath.parent)
+            raise ValueError(f"Path {self.filepath} does not exist")
+
+        connection = sqlite3.connect(self.filepath, timeout=30)
+        try:
+            if not self._is_initialized:
+                self._create_schema(connection)
+                self._is_initialized = True
+
+            with connection:  # Commits transaction on success, rolls back on errors.
+                yield connection
+
+        finally:
+            connection.close()
+
+    def _create_schema(self, connection: sqlite3.Connection):
+        connection.execute("PRAGMA journal_mode = WAL")
+        with connection:
+            connection.execute("BEGIN IMMEDIATE")  # So that processes opening history at once don't race migrations.
+            connection.execute(
+                """
+                CREATE TABLE IF NOT EXISTS history (
+                    automaton TEXT NOT NULL,
+                    project TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    error TEXT,
+                    PRIMARY KEY (automaton, project)
+                )
+                """
+            )
+
+            existing_columns = {row[1] for row in connection.execute("PRAGMA table_info(history)")}
+            for column, column_type in _METRICS_COLUMNS.items():
+                if column not in existing_columns:
+                    connection.execute(f"ALTER TABLE history ADD COLUMN {column} {column_type}")
+            connection.execute("CREATE INDEX IF NOT EXISTS history_by_status ON history (automaton, status, project)")
@@ -1,11 +1,33 @@
 import typing as t
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
 RunStatus: t.TypeAlias = t.Literal["fail", "success", "skipped", "running", "new"]
 ProjectID: t.TypeAlias = str
 
 
 @dataclass
+class RunMetrics:
+    """Timings and amount of work done by automaton for a single project run.
+
+    Timestamps are unix epoch seconds; cpu_time is cpu time of the process running the project,
+        so it overlaps for projects run concurrently in the same process (like by `Automaton.arun`).
+    """
+
+    run_id: str
+    started_at: float
+    finished_at: float
+    wall_time: float
+    cpu_time: float
+    files_scanned: int = 0
+    files_modified: int = 0
+    bytes_read: int = 0
+    bytes_written: int = 0
+    files_skipped: int = 0
+
+
+@dataclass(slots=True)
 class AutomatonRunResult:
     status: RunStatus
     error: str | None = None
+    # Not part of the outcome itself, so results are still compared just by their status and error.
+    metrics: RunMetrics | None = field(default=None, compare=False)
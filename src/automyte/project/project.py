@@ -50,6 +50,19 @@ class Project:
         self.rootdir = original_rootdir
         self.explorer.set_rootdir(newdir=self.rootdir)
 
+    @contextlib.asynccontextmanager
+    async def ain_working_state(self, config: Config):
+        """Coroutine counterpart of `in_working_state`, relies on `vcs.apreserve_state` to not block event loop."""
+        original_rootdir = self.rootdir
+        async with self.vcs.apreserve_state(config=config.vcs) as current_project_dir:
+            self.rootdir = str(current_project_dir)
+            self.explorer.set_rootdir(newdir=str(current_project_dir))
+
+            yield
+
+        self.rootdir = original_rootdir
+        self.explorer.set_rootdir(newdir=self.rootdir)
+
     def apply_changes(self):
         self.explorer.flush()
 
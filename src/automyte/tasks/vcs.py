@@ -5,6 +5,7 @@ from pathlib import Path
 from automyte.automaton.run_context import RunContext
 from automyte.automaton.types import TaskReturn
 from automyte.discovery import File
+from automyte.utils.bash import CMDOutput
 
 
 class WithFlagsMixin:
@@ -16,12 +17,29 @@ class WithFlagsMixin:
 
 
 class VCSTask(WithFlagsMixin):
+    """Base class for vcs tasks, subclasses only have to provide `subcommand()` to be run via `ctx.vcs`.
+
+    Supports both plain calls and `acall` coroutine, used by `Automaton.arun()`.
+    """
+
     def __init__(self):
         self._flags: list[str] = []
 
     def __call__(self, ctx: RunContext, file: File | None = None):
+        return self._to_task_return(ctx.vcs.run(*self.subcommand()))
+
+    async def acall(self, ctx: RunContext, file: File | None = None):
+        return self._to_task_return(await ctx.vcs.arun(*self.subcommand()))
+
+    def subcommand(self) -> list[str]:
         raise NotImplementedError
 
+    def _to_task_return(self, result: CMDOutput) -> TaskReturn:
+        if result.status == "fail":
+            return TaskReturn(status="errored", instruction="abort", value=result.output)
+        else:
+            return TaskReturn(status="processed", instruction="continue", value=result.output)
+
 
 class add(VCSTask):
     def __init__(self, paths: str | Path | list[str | Path]):
@@ -31,13 +49,8 @@ class add(VCSTask):
         else:
             self.paths = paths
 
-    def __call__(self, ctx: RunContext, file: File | None = None):
-        result = ctx.vcs.run("add", "--", *[str(p) for p in self.paths], *self._flags)
-
-        if result.status == "fail":
-            return TaskReturn(status="errored", instruction="abort", value=result.output)
-        else:
-            return TaskReturn(status="processed", instruction="continue", value=result.output)
+    def subcommand(self) -> list[str]:
+        return ["add", "--", *[str(p) for p in self.paths], *self._flags]
 
 
 class commit(VCSTask):
@@ -45,13 +58,8 @@ class commit(VCSTask):
         super().__init__()
         self.msg = msg
 
-    def __call__(self, ctx: RunContext, file: File | None = None):
-        result = ctx.vcs.run("commit", "-m", self.msg, *self._flags)
-
-        if result.status == "fail":
-            return TaskReturn(status="errored", instruction="abort", value=result.output)
-        else:
-            return TaskReturn(status="processed", instruction="continue", value=result.output)
+    def subcommand(self) -> list[str]:
+        return ["commit", "-m", self.msg, *self._flags]
 
 
 class push(VCSTask):
@@ -60,13 +68,8 @@ class push(VCSTask):
         self.to = to
         self.remote = remote
 
-    def __call__(self, ctx: RunContext, file: File | None = None):
-        result = ctx.vcs.run("push", *self._flags, self.remote, self.to)
-
-        if result.status == "fail":
-            return TaskReturn(status="errored", instruction="abort", value=result.output)
-        else:
-            return TaskReturn(status="processed", instruction="continue", value=result.output)
+    def subcommand(self) -> list[str]:
+        return ["push", *self._flags, self.remote, self.to]
 
 
 class pull(VCSTask):
@@ -75,10 +78,5 @@ class pull(VCSTask):
         self.branch = branch
         self.remote = remote
 
-    def __call__(self, ctx: RunContext, file: File | None = None):
-        result = ctx.vcs.run("pull", *self._flags, self.remote, self.branch)
-
-        if result.status == "fail":
-            return TaskReturn(status="errored", instruction="abort", value=result.output)
-        else:
-            return TaskReturn(status="processed", instruction="continue", value=result.output)
+    def subcommand(self) -> list[str]:
+        return ["pull", *self._flags, self.remote, self.branch]
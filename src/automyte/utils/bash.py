@@ -1,3 +1,4 @@
+import asyncio
 import logging
 import subprocess
 import typing as t
@@ -22,3 +23,18 @@ def execute(command: list[str], path: str | Path | None = None):
     else:
         logging.warning("[CMD]: Failed running %s:\n%s", command, result.stderr.strip())
         return CMDOutput(output=result.stderr.strip(), status="fail")
+
+
+async def aexecute(command: list[str], path: str | Path | None = None):
+    """Coroutine counterpart of `execute`, which doesn't block event loop while waiting for the process."""
+    logging.debug("[CMD]: Running %s.", command)
+    process = await asyncio.create_subprocess_exec(
+        *command, cwd=path, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
+    )
+    stdout, stderr = await process.communicate()
+
+    if process.returncode == 0:
+        return CMDOutput(output=stdout.decode().strip())
+    else:
+        logging.warning("[CMD]: Failed running %s:\n%s", command, stderr.decode().strip())
+        return CMDOutput(output=stderr.decode().strip(), status="fail")
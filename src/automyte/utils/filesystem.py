@@ -1,5 +1,12 @@
+import contextlib
+import os
 from pathlib import Path
 
+try:
+    import fcntl
+except ImportError:  # Windows, advisory locks are not available.
+    fcntl = None
+
 
 def parse_dir(directory: str | Path) -> Path:
     if isinstance(directory, str):
@@ -11,3 +18,45 @@ def parse_dir(directory: str | Path) -> Path:
         raise ValueError(f"Received invalid directory: {directory}.")
 
     return path
+
+
+def resolve_storage_path(filepath: str | Path | None, default_filename: str) -> Path:
+    """Resolve location of a file used for storing data, like history.
+
+    If filepath is a directory - will point to <default_filename> inside of it;
+    Can set filepath to either None, "./", "current", "local" to use the script launch dir.
+    """
+    result = Path(os.getcwd())
+
+    if isinstance(filepath, str):
+        if filepath == "." or filepath == "./" or filepath == "current" or filepath == "local":
+            pass
+        else:
+            result = Path(filepath)
+
+    elif isinstance(filepath, Path):
+        result = filepath
+
+    if result.is_dir():
+        result = result / default_filename
+    return result
+
+
+@contextlib.contextmanager
+def locked(filepath: Path):
+    """Hold an exclusive advisory lock for the file, to serialize writers across threads and processes.
+
+    Lock is taken on a separate "<filename>.lock" file next to it,
+        so that it outlives the file itself being replaced (like after atomic rewrites).
+    On platforms without fcntl it doesn't lock anything.
+    """
+    if fcntl is None:
+        yield
+        return
+
+    with open(filepath.with_name(f"{filepath.name}.lock"), "a") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
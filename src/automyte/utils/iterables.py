@@ -0,0 +1,14 @@
+import itertools
+import typing as t
+
+T = t.TypeVar("T")
+
+
+def batched(iterable: t.Iterable[T], size: int) -> t.Iterator[tuple[T, ...]]:
+    """Same as `itertools.batched`, which is only available since python 3.12."""
+    if size < 1:
+        raise ValueError("Batch size must be at least 1.")
+
+    iterator = iter(iterable)
+    while batch := tuple(itertools.islice(iterator, size)):
+        yield batch
@@ -0,0 +1,9 @@
+import multiprocessing
+
+
+def workers_mp_context():
+    """Prefer forking, so that lambdas or local functions don't have to be picklable for worker processes."""
+    if "fork" in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("fork")
+
+    return multiprocessing.get_context()
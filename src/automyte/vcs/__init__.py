@@ -1,8 +1,10 @@
 from .base import VCS, VCSException
 from .git import Git
+from .git_grep import GitGrepIndex
 
 __all__ = [
     "VCS",
     "VCSException",
     "Git",
+    "GitGrepIndex",
 ]
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import abc
+import asyncio
 import contextlib
 import typing as t
 from pathlib import Path
@@ -25,6 +26,9 @@ class VCS(abc.ABC):
     'run' method basically accepts args as a bash executable array of commands to call any vcs command
     of arbitrary difficulty; it will call those commands inside project's current working dir.
 
+    'arun' and 'apreserve_state' are their coroutine counterparts, used by `Automaton.arun()`;
+    by default they just offload sync implementations to a thread, override them for native async support.
+
     NOTE: VCS tasks in contrib or core utils are to rely on RunContext to get access to project rootdir and stuff
         and then call corresponding vcs commands or directly call 'run' method for any vcs command with flags, etc.
     """
@@ -36,6 +40,21 @@ class VCS(abc.ABC):
     def run(self, *subcommand_with_flags) -> CMDOutput:
         raise NotImplementedError
 
+    @contextlib.asynccontextmanager
+    async def apreserve_state(self, config: VCSConfig):
+        state = self.preserve_state(config=config)
+        workdir = await asyncio.to_thread(state.__enter__)
+        try:
+            yield workdir
+        except BaseException as e:
+            if not await asyncio.to_thread(state.__exit__, type(e), e, e.__traceback__):
+                raise
+        else:
+            await asyncio.to_thread(state.__exit__, None, None, None)
+
+    async def arun(self, *subcommand_with_flags) -> CMDOutput:
+        return await asyncio.to_thread(self.run, *subcommand_with_flags)
+
 
 class VCSCmdBuilder:
     def __init__(self, vcs: SupportedVCS):
@@ -31,43 +31,77 @@ class Git(VCS):
     def run(self, *subcommand_with_flags: str):
         return self._exec(subcommand_with_flags[0], *subcommand_with_flags[1:])
 
+    async def arun(self, *subcommand_with_flags: str):
+        return await bash.aexecute(self._build_cmd(subcommand_with_flags[0], *subcommand_with_flags[1:]))
+
     @contextlib.contextmanager
     def preserve_state(self, config: VCSConfig):
         if config.dont_disrupt_prior_state:
             relative_worktree_path = f"./auto_{random_hash()}"
-            result = bash.execute(
-                VCSCmdBuilder("git")
-                .cmd("worktree")
-                .in_dir(self.original_rootdir)
-                .args("add", "-b", config.work_branch)
-                .args(relative_worktree_path)
-                .to_cmd()
-            )
-            if result.status == "fail":
-                logger.error(
-                    "[Git]: Failed to create worktree at %s for %s branch:\n%s",
-                    relative_worktree_path,
-                    config.work_branch,
-                    result.output,
-                )
-                raise VCSException("[Git]: Failed to create worktree")
-
-            self.workdir = str(Path(self.original_rootdir) / relative_worktree_path)
+            result = bash.execute(self._add_worktree_cmd(relative_worktree_path, config=config))
+            self._on_worktree_added(result, relative_worktree_path, config=config)
+
             yield str(self.workdir)
 
-            result = bash.execute(
-                VCSCmdBuilder("git")
-                .cmd("worktree")
-                .in_dir(self.original_rootdir)
-                .args("remove", "-f", relative_worktree_path)
-                .to_cmd()
-            )
-            if result.status == "fail":
-                logger.warning("[Git]: Failed to remove worktree %s:\n%s", relative_worktree_path, result.output)
-            self.workdir = self.original_rootdir
+            result = bash.execute(self._remove_worktree_cmd(relative_worktree_path))
+            self._on_worktree_removed(result, relative_worktree_path)
+
+        else:
+            yield self.original_rootdir
+
+    @contextlib.asynccontextmanager
+    async def apreserve_state(self, config: VCSConfig):
+        if config.dont_disrupt_prior_state:
+            relative_worktree_path = f"./auto_{random_hash()}"
+            result = await bash.aexecute(self._add_worktree_cmd(relative_worktree_path, config=config))
+            self._on_worktree_added(result, relative_worktree_path, config=config)
+
+            yield str(self.workdir)
+
+            result = await bash.aexecute(self._remove_worktree_cmd(relative_worktree_path))
+            self._on_worktree_removed(result, relative_worktree_path)
 
         else:
             yield self.original_rootdir
 
+    def _add_worktree_cmd(self, relative_worktree_path: str, config: VCSConfig):
+        return (
+            VCSCmdBuilder("git")
+            .cmd("worktree")
+            .in_dir(self.original_rootdir)
+            .args("add", "-b", config.work_branch)
+            .args(relative_worktree_path)
+            .to_cmd()
+        )
+
+    def _remove_worktree_cmd(self, relative_worktree_path: str):
+        return (
+            VCSCmdBuilder("git")
+            .cmd("worktree")
+            .in_dir(self.original_rootdir)
+            .args("remove", "-f", relative_worktree_path)
+            .to_cmd()
+        )
+
+    def _on_worktree_added(self, result: bash.CMDOutput, relative_worktree_path: str, config: VCSConfig):
+        if result.status == "fail":
+            logger.error(
+                "[Git]: Failed to create worktree at %s for %s branch:\n%s",
+                relative_worktree_path,
+                config.work_branch,
+                result.output,
+            )
+            raise VCSException("[Git]: Failed to create worktree")
+
+        self.workdir = str(Path(self.original_rootdir) / relative_worktree_path)
+
+    def _on_worktree_removed(self, result: bash.CMDOutput, relative_worktree_path: str):
+        if result.status == "fail":
+            logger.warning("[Git]: Failed to remove worktree %s:\n%s", relative_worktree_path, result.output)
+        self.workdir = self.original_rootdir
+
     def _exec(self, cmd: str, *flags: str):
-        return bash.execute(VCSCmdBuilder("git").cmd(cmd).in_dir(self.workdir).args(*flags).to_cmd())
+        return bash.execute(self._build_cmd(cmd, *flags))
+
+    def _build_cmd(self, cmd: str, *flags: str):
+        return VCSCmdBuilder("git").cmd(cmd).in_dir(self.workdir).args(*flags).to_cmd()
@@ -0,0 +1,96 @@
+import logging
+import typing as t
+
+from automyte.discovery import ContentIndex
+from automyte.discovery.explorers.local_files import IGNORE_FILES_LIST_PATTERNS
+
+from .git import Git
+
+logger = logging.getLogger(__name__)
+
+
+class GitGrepIndex(ContentIndex):
+    """Find candidate files for content filters with `git grep`, which searches files in parallel.
+
+    Runs in the current workdir of the given git instance (same as explorer rootdir while project is being worked on),
+        searching all files in the working tree, including untracked and ignored ones, same as explorer sees them.
+    `exclude` are gitignore-like patterns for folders and files not to search in at all, which should be
+        the same as `ignore_locations` of the explorer (defaults are the same as well).
+    Regexps are searched for as perl-compatible ones, if git can't do that (or anything else goes wrong) -
+        explorer just falls back to checking all of the files.
+    Git doesn't search inside of nested repositories and submodules, while explorer walks them,
+        so it falls back to checking all of the files if there are any of those as well.
+    """
+
+    def __init__(self, git: Git, exclude: t.Sequence[str] = IGNORE_FILES_LIST_PATTERNS) -> None:
+        self.git = git
+        self.exclude = exclude
+        self._exclude_pathspecs = _exclude_pathspecs(exclude)
+
+    def files_containing(self, texts: list[str]) -> set[str] | None:
+        return self._grep("--fixed-strings", patterns=texts)
+
+    def files_matching(self, patterns: list[str]) -> set[str] | None:
+        return self._grep("--perl-regexp", patterns=patterns)
+
+    def _grep(self, mode: str, patterns: list[str]) -> set[str] | None:
+        if not patterns:
+            return set()
+
+        if self._has_nested_repositories():
+            logger.debug("[Git %s]: Can't grep inside of nested repositories, checking all files.", self.git.workdir)
+            return None
+
+        result = self.git.run(
+            "grep",
+            "--files-with-matches",
+            "-z",
+            "--untracked",
+            "--no-exclude-standard",
+            mode,
+            *(arg for pattern in patterns for arg in ("-e", pattern)),
+            "--",
+            *self._exclude_pathspecs,
+        )
+        if result.status == "fail":
+            # Exit code 1 without any errors just means nothing was found.
+            if not result.output:
+                return set()
+
+            logger.warning("[Git %s]: Failed to grep, checking all files instead: %s", self.git.workdir, result.output)
+            return None
+
+        return {path for path in result.output.split("\0") if path}
+
+    def _has_nested_repositories(self) -> bool:
+        # Untracked nested repositories are listed as folders (ending with "/"), submodules have their own mode.
+        result = self.git.run("ls-files", "-z", "--stage", "--others", "--", *self._exclude_pathspecs)
+        if result.status == "fail":
+            return True
+
+        return any(entry.endswith("/") or entry.startswith("160000 ") for entry in result.output.split("\0"))
+
+
+def _exclude_pathspecs(patterns: t.Sequence[str]) -> list[str]:
+    """Translate gitignore-like patterns into git pathspecs excluding the same paths.
+
+    Searching more files than explorer walks only costs time, so patterns which can't be translated as is
+        are just left out, and so are all of them if some paths are re-included by negated ones.
+    """
+    if any(pattern.startswith("!") for pattern in patterns):
+        return []
+
+    pathspecs = []
+    for pattern in patterns:
+        pattern = pattern.strip()
+        if not pattern or pattern.startswith("#") or "\\" in pattern:
+            continue
+
+        dir_only, pattern = pattern.endswith("/"), pattern.rstrip("/")
+        # Same as in .gitignore, patterns without slashes match at any depth, others are relative to the rootdir.
+        glob = pattern.lstrip("/") if "/" in pattern else f"**/{pattern}"
+        if not dir_only:
+            pathspecs.append(f":(exclude,glob){glob}")
+        pathspecs.append(f":(exclude,glob){glob}/**")
+
+    return pathspecs
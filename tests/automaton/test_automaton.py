@@ -1,3 +1,4 @@
+import asyncio
 import contextlib
 
 import pytest
@@ -5,7 +6,7 @@ import pytest
 from automyte import Automaton
 from automyte.automaton.flow import TasksFlow
 from automyte.config import Config
-from automyte.discovery import ProjectExplorer
+from automyte.discovery import LocalFilesExplorer, ProjectExplorer
 from automyte.discovery.file.os_file import OSFile
 from automyte.history.in_memory import InMemoryHistory
 from automyte.history.types import AutomatonRunResult
@@ -38,6 +39,15 @@ class DummyVCS(VCS):
         yield "newdir"
 
 
+def _is_on_event_loop() -> bool:
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return False
+
+    return True
+
+
 class TestAutomatonInit:
     def test_accepts_plain_list_of_tasks(self):
         dummy_task = lambda ctx, file: ...
@@ -148,3 +158,212 @@ class TestAutomatonUpdatesHistory:
         ).run(skip_validation=True)
 
         assert history.get_status("auto", "proj1") == AutomatonRunResult(status="fail", error="oops")
+
+
+class TestAutomatonRunMetrics:
+    def test_saves_run_metrics_to_history(self, tmp_local_project):
+        dir = tmp_local_project(structure={"src": {"hello.txt": "hello", "bye.txt": "bye"}})
+        history = InMemoryHistory()
+
+        def edit_hello(ctx, file):
+            if file.name == "hello.txt":
+                file.edit("hello there")
+
+        automaton = Automaton(
+            "auto",
+            history=history,
+            config=Config.get_default().set_vcs(dont_disrupt_prior_state=False),
+            projects=[Project("proj1", explorer=LocalFilesExplorer(rootdir=dir))],
+            tasks=[lambda ctx, file: file.get_contents(), edit_hello],
+        )
+        automaton.run(skip_validation=True)
+
+        metrics = history.get_status("auto", "proj1").metrics
+        assert metrics is not None
+        assert metrics.run_id == automaton.run_id
+        assert metrics.finished_at >= metrics.started_at
+        assert metrics.wall_time >= 0 and metrics.cpu_time >= 0
+        assert (metrics.files_scanned, metrics.files_modified) == (2, 1)
+        assert (metrics.bytes_read, metrics.bytes_written) == (len("hello") + len("bye"), len("hello there"))
+
+    @pytest.mark.parametrize("run_async", [False, True])
+    def test_runs_failed_before_exploring_dont_report_stats_of_previous_ones(self, tmp_local_project, run_async):
+        dir = tmp_local_project(structure={"src": {"hello.txt": "hello"}})
+        history = InMemoryHistory()
+        should_fail = False
+
+        def fail_second_run(ctx, file):
+            if should_fail:
+                raise Exception("oops")
+
+        automaton = Automaton(
+            "auto",
+            history=history,
+            config=Config.get_default().set_vcs(dont_disrupt_prior_state=False),
+            projects=[Project("proj1", explorer=LocalFilesExplorer(rootdir=dir))],
+            tasks=TasksFlow(lambda ctx, file: file.get_contents(), preprocess=[fail_second_run]),
+        )
+        automaton.run(skip_validation=True)
+        assert history.get_status("auto", "proj1").metrics.bytes_read == len("hello")
+
+        should_fail = True
+        if run_async:
+            asyncio.run(automaton.arun(skip_validation=True))
+        else:
+            automaton.run(skip_validation=True)
+
+        status = history.get_status("auto", "proj1")
+        assert status.status == "fail"
+        assert (status.metrics.files_scanned, status.metrics.bytes_read) == (0, 0)
+
+    def test_each_run_gets_new_run_id(self):
+        history = InMemoryHistory()
+        automaton = Automaton(
+            "auto",
+            history=history,
+            projects=[Project("proj1", explorer=DummyExplorer(), vcs=DummyVCS())],
+            tasks=[lambda ctx, file: None],
+        )
+
+        automaton.run(skip_validation=True)
+        first_run_id = history.get_status("auto", "proj1").metrics.run_id
+        automaton.run(skip_validation=True)
+
+        assert history.get_status("auto", "proj1").metrics.run_id != first_run_id
+
+
+class TestAutomatonWorkerProcesses:
+    def test_updates_history_for_all_projects(self):
+        history = InMemoryHistory()
+        config = Config.get_default(workers=2)
+
+        Automaton(
+            "auto",
+            history=history,
+            config=config,
+            projects=[Project(f"proj{i}", explorer=DummyExplorer(), vcs=DummyVCS()) for i in range(4)],
+            tasks=[lambda ctx, file: True],
+        ).run(skip_validation=True)
+
+        assert all(history.get_status("auto", f"proj{i}").status == "success" for i in range(4))
+
+    def test_task_failures_are_saved_to_history(self):
+        history = InMemoryHistory()
+        config = Config.get_default(workers=2, stop_on_fail=False)
+
+        def failed_task(ctx, file):
+            raise Exception(f"oops in {ctx.project.project_id}")
+
+        Automaton(
+            "auto",
+            history=history,
+            config=config,
+            projects=[Project(f"proj{i}", explorer=DummyExplorer(), vcs=DummyVCS()) for i in range(3)],
+            tasks=[failed_task],
+        ).run(skip_validation=True)
+
+        for i in range(3):
+            assert history.get_status("auto", f"proj{i}") == AutomatonRunResult("fail", error=f"oops in proj{i}")
+
+    def test_stop_on_fail_doesnt_start_new_projects(self):
+        history = InMemoryHistory()
+        config = Config.get_default(workers=2, stop_on_fail=True)
+
+        def failed_task(ctx, file):
+            raise Exception("oops")
+
+        Automaton(
+            "auto",
+            history=history,
+            config=config,
+            projects=[Project(f"proj{i}", explorer=DummyExplorer(), vcs=DummyVCS()) for i in range(6)],
+            tasks=[failed_task],
+        ).run(skip_validation=True)
+
+        statuses = [history.get_status("auto", f"proj{i}").status for i in range(6)]
+        # Only projects that were already in flight when the first failure came back are allowed to finish.
+        assert 1 <= statuses.count("fail") <= 2
+        assert statuses.count("new") == 6 - statuses.count("fail")
+
+
+class TestAutomatonArun:
+    def test_updates_history(self):
+        history = InMemoryHistory()
+
+        asyncio.run(
+            Automaton(
+                "auto",
+                history=history,
+                projects=[Project(f"proj{i}", explorer=DummyExplorer(), vcs=DummyVCS()) for i in range(3)],
+                tasks=[lambda ctx, file: True],
+            ).arun(skip_validation=True, concurrency=3)
+        )
+
+        assert all(history.get_status("auto", f"proj{i}").status == "success" for i in range(3))
+
+    def test_history_is_not_accessed_from_the_event_loop(self):
+        calls_on_loop = []
+
+        class LoopCheckingHistory(InMemoryHistory):
+            def get_status(self, automaton_name: str, project_id: str) -> AutomatonRunResult:
+                calls_on_loop.append(_is_on_event_loop())
+                return super().get_status(automaton_name, project_id)
+
+            def set_status(self, automaton_name: str, project_id: str, status: AutomatonRunResult):
+                calls_on_loop.append(_is_on_event_loop())
+                super().set_status(automaton_name, project_id, status)
+
+            def mark_running(self, automaton_name: str, project_ids: list[str]):
+                calls_on_loop.append(_is_on_event_loop())
+
+        history = LoopCheckingHistory()
+        asyncio.run(
+            Automaton(
+                "auto",
+                history=history,
+                projects=[Project(f"proj{i}", explorer=DummyExplorer(), vcs=DummyVCS()) for i in range(3)],
+                tasks=[lambda ctx, file: True],
+            ).arun(skip_validation=True, concurrency=3)
+        )
+
+        assert len(calls_on_loop) == 9
+        assert not any(calls_on_loop)
+        assert all(history.get_status("auto", f"proj{i}").status == "success" for i in range(3))
+
+    def test_awaits_async_tasks_and_respects_concurrency_limit(self):
+        running, max_running = [], []
+
+        async def track_concurrency(ctx, file):
+            running.append(ctx.project.project_id)
+            max_running.append(len(running))
+            await asyncio.sleep(0.01)
+            running.remove(ctx.project.project_id)
+
+        asyncio.run(
+            Automaton(
+                "auto",
+                projects=[Project(f"proj{i}", explorer=DummyExplorer(), vcs=DummyVCS()) for i in range(6)],
+                tasks=[track_concurrency],
+            ).arun(skip_validation=True, concurrency=2)
+        )
+
+        assert len(max_running) == 6
+        assert max(max_running) == 2
+
+    def test_stop_on_fail_doesnt_start_new_projects(self):
+        history = InMemoryHistory()
+
+        async def failed_task(ctx, file):
+            raise Exception("oops")
+
+        asyncio.run(
+            Automaton(
+                "auto",
+                history=history,
+                projects=[Project(f"proj{i}", explorer=DummyExplorer(), vcs=DummyVCS()) for i in range(4)],
+                tasks=[failed_task],
+            ).arun(skip_validation=True, concurrency=1)
+        )
+
+        assert history.get_status("auto", "proj0") == AutomatonRunResult(status="fail", error="oops")
+        assert all(history.get_status("auto", f"proj{i}").status == "new" for i in range(1, 4))
@@ -1,10 +1,13 @@
+import asyncio
+import time
+from pathlib import Path
 from unittest.mock import ANY, patch
 
 import pytest
 
 from automyte import Project, TasksFlow
 from automyte.automaton.run_context import RunContext
-from automyte.automaton.types import TaskReturn
+from automyte.automaton.types import BatchFileTask, TaskReturn
 from automyte.discovery.file.base import File
 from automyte.discovery.file.os_file import OSFile
 from automyte.history.types import AutomatonRunResult
@@ -130,3 +133,232 @@ class TestFlowExecute:
 
         assert not has_next_task_been_called
         assert output == AutomatonRunResult(status="fail", error="oops")
+
+
+class TestFlowAexecute:
+    def test_tasks_calls_ordering(self, tmp_local_project, run_ctx):
+        outputs = []
+        preprocess = lambda ctx, file: outputs.append("preprocess")
+        postprocess = lambda ctx, file: outputs.append("postprocess")
+
+        async def normal_task(ctx, file):
+            outputs.append("normal task")
+
+        ctx = run_ctx(dir=tmp_local_project({"hello.txt": "hello flow"}))
+
+        asyncio.run(
+            TasksFlow([normal_task], preprocess=[preprocess], postprocess=[postprocess]).aexecute(ctx.project, ctx)
+        )
+
+        assert outputs == ["preprocess", "normal task", "postprocess"]
+
+    def test_awaits_async_task_returns(self, tmp_local_project, run_ctx):
+        ctx = run_ctx(dir=tmp_local_project({"src": {"hello.txt": "hello flow"}}))
+
+        async def instruct(ctx, file):
+            return TaskReturn(instruction="abort", value="oops")
+
+        output = asyncio.run(TasksFlow(instruct).aexecute(ctx.project, ctx))
+
+        assert output == AutomatonRunResult(status="fail", error="oops")
+
+    def test_exception_raised_inside_async_task_results_in_abort(self, tmp_local_project, run_ctx):
+        ctx = run_ctx(dir=tmp_local_project({"src": {"hello.txt": "hello flow"}}))
+
+        async def failure_of_a_task(ctx, file):
+            raise Exception("oops")
+
+        output = asyncio.run(TasksFlow(failure_of_a_task).aexecute(ctx.project, ctx))
+
+        assert output == AutomatonRunResult(status="fail", error="oops")
+
+    def test_changes_are_applied_before_postprocess_tasks(self, tmp_local_project, run_ctx):
+        ctx = run_ctx(dir=tmp_local_project({"src": {"hello.txt": "hello flow"}}))
+        update_file = lambda ctx, file: file.edit("changed")
+        read_file = lambda ctx, file: OSFile(fullname=f"{ctx.project.rootdir}/src/hello.txt").get_contents()
+
+        asyncio.run(TasksFlow(update_file, postprocess=[read_file]).aexecute(ctx.project, ctx))
+
+        assert ctx.previous_return.value == "changed"
+
+
+class TestFlowConcurrentFiles:
+    def test_tasks_are_called_once_per_file(self, tmp_local_project, run_ctx):
+        files_called_for = []
+        track_calls = lambda ctx, file: files_called_for.append(file.name)
+        ctx = run_ctx(dir=tmp_local_project({"src": {f"file{i}.txt": "hello flow" for i in range(20)}}))
+
+        result = TasksFlow(track_calls, file_workers=4).execute(ctx.project, ctx)
+
+        assert result == AutomatonRunResult(status="success")
+        assert sorted(files_called_for) == sorted(f"file{i}.txt" for i in range(20))
+
+    def test_files_have_isolated_tasks_returns(self, tmp_local_project, run_ctx):
+        mismatches = []
+        ctx = run_ctx(dir=tmp_local_project({"src": {f"file{i}.txt": "hello flow" for i in range(20)}}))
+
+        def return_name(ctx, file):
+            time.sleep(0.001)
+            return file.name
+
+        def check_previous_return(ctx, file):
+            if ctx.previous_return.value != file.name or len(ctx.file_tasks_returns) != 1:
+                mismatches.append(file.name)
+
+        TasksFlow(return_name, check_previous_return, file_workers=4).execute(ctx.project, ctx)
+
+        assert not mismatches
+        assert not ctx.file_tasks_returns
+
+    def test_changes_are_applied_before_postprocess_tasks(self, tmp_local_project, run_ctx):
+        dir = tmp_local_project({"src": {f"file{i}.txt": "hello flow" for i in range(10)}})
+        ctx = run_ctx(dir=dir)
+        update_file = lambda ctx, file: file.edit(f"changed {file.name}")
+        read_files = lambda ctx, file: [(Path(dir) / "src" / f"file{i}.txt").read_text() for i in range(10)]
+
+        TasksFlow(update_file, postprocess=[read_files], file_workers=4).execute(ctx.project, ctx)
+
+        assert ctx.previous_return.value == [f"changed file{i}.txt" for i in range(10)]
+
+    def test_abort_cancels_outstanding_files(self, tmp_local_project, run_ctx):
+        files_called_for = []
+        ctx = run_ctx(dir=tmp_local_project({"src": {f"file{i}.txt": "hello flow" for i in range(50)}}))
+
+        def abort_right_away(ctx, file):
+            files_called_for.append(file.name)
+            return TaskReturn(instruction="abort", value=f"oops in {file.name}")
+
+        output = TasksFlow(abort_right_away, file_workers=2).execute(ctx.project, ctx)
+
+        assert output.status == "fail"
+        assert output.error == ctx.previous_return.value
+        assert len(files_called_for) < 50
+
+    def test_skip_returns_skipped_status(self, tmp_local_project, run_ctx):
+        ctx = run_ctx(dir=tmp_local_project({"src": {f"file{i}.txt": "hello flow" for i in range(5)}}))
+        instruct = lambda ctx, file: TaskReturn(instruction="skip") if file.name == "file3.txt" else None
+
+        output = TasksFlow(instruct, file_workers=2).execute(ctx.project, ctx)
+
+        assert output == AutomatonRunResult(status="skipped")
+
+    def test_aexecute_processes_up_to_file_workers_files_at_a_time(self, tmp_local_project, run_ctx):
+        files_called_for, running, max_running = [], [0], [0]
+        ctx = run_ctx(dir=tmp_local_project({"src": {f"file{i}.txt": "hello flow" for i in range(10)}}))
+
+        async def track_calls(ctx, file):
+            running[0] += 1
+            max_running[0] = max(max_running[0], running[0])
+            await asyncio.sleep(0.01)
+            running[0] -= 1
+            files_called_for.append(file.name)
+
+        result = asyncio.run(TasksFlow(track_calls, file_workers=3).aexecute(ctx.project, ctx))
+
+        assert result == AutomatonRunResult(status="success")
+        assert sorted(files_called_for) == sorted(f"file{i}.txt" for i in range(10))
+        assert max_running[0] == 3
+
+    def test_aexecute_changes_are_applied_before_postprocess_tasks(self, tmp_local_project, run_ctx):
+        dir = tmp_local_project({"src": {f"file{i}.txt": "hello flow" for i in range(10)}})
+        ctx = run_ctx(dir=dir)
+        update_file = lambda ctx, file: file.edit(f"changed {file.name}")
+        read_files = lambda ctx, file: [(Path(dir) / "src" / f"file{i}.txt").read_text() for i in range(10)]
+
+        asyncio.run(TasksFlow(update_file, postprocess=[read_files], file_workers=4).aexecute(ctx.project, ctx))
+
+        assert ctx.previous_return.value == [f"changed file{i}.txt" for i in range(10)]
+
+    def test_aexecute_abort_cancels_outstanding_files(self, tmp_local_project, run_ctx):
+        files_called_for = []
+        ctx = run_ctx(dir=tmp_local_project({"src": {f"file{i}.txt": "hello flow" for i in range(50)}}))
+
+        async def abort_right_away(ctx, file):
+            files_called_for.append(file.name)
+            return TaskReturn(instruction="abort", value=f"oops in {file.name}")
+
+        output = asyncio.run(TasksFlow(abort_right_away, file_workers=2).aexecute(ctx.project, ctx))
+
+        assert output.status == "fail"
+        assert output.error == ctx.previous_return.value
+        assert len(files_called_for) < 50
+
+
+class CollectNamesBatch(BatchFileTask):
+    batch_size = 3
+
+    def __init__(self):
+        self.chunks = []
+
+    def __call__(self, ctx, files):
+        self.chunks.append(sorted(f.name for f in files))
+        return [f.name for f in files]
+
+
+class TestFlowBatchTasks:
+    def test_batch_task_is_called_once_per_chunk(self, tmp_local_project, run_ctx):
+        ctx = run_ctx(dir=tmp_local_project({"src": {f"file{i}.txt": "hello flow" for i in range(7)}}))
+        batch_task = CollectNamesBatch()
+
+        result = TasksFlow(batch_task).execute(ctx.project, ctx)
+
+        assert result == AutomatonRunResult(status="success")
+        assert [len(chunk) for chunk in batch_task.chunks] == [3, 3, 1]
+        assert sorted(sum(batch_task.chunks, [])) == sorted(f"file{i}.txt" for i in range(7))
+
+    def test_plain_tasks_see_per_file_batch_returns(self, tmp_local_project, run_ctx):
+        mismatches = []
+        ctx = run_ctx(dir=tmp_local_project({"src": {f"file{i}.txt": "hello flow" for i in range(7)}}))
+
+        def check_previous_return(ctx, file):
+            if ctx.previous_return.value != file.name:
+                mismatches.append(file.name)
+
+        TasksFlow(CollectNamesBatch(), check_previous_return).execute(ctx.project, ctx)
+
+        assert not mismatches
+
+    @pytest.mark.parametrize("file_workers", [1, 2])
+    def test_changes_from_plain_tasks_are_applied(self, tmp_local_project, run_ctx, file_workers):
+        dir = tmp_local_project({"src": {f"file{i}.txt": "hello flow" for i in range(5)}})
+        ctx = run_ctx(dir=dir)
+        update_file = lambda ctx, file: file.edit(f"changed {ctx.previous_return.value}")
+
+        TasksFlow(CollectNamesBatch(), update_file, file_workers=file_workers).execute(ctx.project, ctx)
+
+        assert all((Path(dir) / "src" / f"file{i}.txt").read_text() == f"changed file{i}.txt" for i in range(5))
+
+    def test_abort_for_a_single_file_returns_immediately(self, tmp_local_project, run_ctx):
+        ctx = run_ctx(dir=tmp_local_project({"src": {f"file{i}.txt": "hello flow" for i in range(7)}}))
+        has_next_task_been_called = []
+
+        class AbortOne(BatchFileTask):
+            def __call__(self, ctx, files):
+                return [TaskReturn(instruction="abort", value="oops") if i == 1 else None for i in range(len(files))]
+
+        output = TasksFlow(AbortOne(), lambda ctx, file: has_next_task_been_called.append(1)).execute(ctx.project, ctx)
+
+        assert output == AutomatonRunResult(status="fail", error="oops")
+        assert not has_next_task_been_called
+
+    def test_exception_raised_inside_batch_task_results_in_abort(self, tmp_local_project, run_ctx):
+        ctx = run_ctx(dir=tmp_local_project({"src": {"hello.txt": "hello flow"}}))
+
+        class FailingBatch(BatchFileTask):
+            def __call__(self, ctx, files):
+                raise Exception("oops")
+
+        output = TasksFlow(FailingBatch()).execute(ctx.project, ctx)
+
+        assert output == AutomatonRunResult(status="fail", error="oops")
+
+    def test_wrong_number_of_returns_results_in_abort(self, tmp_local_project, run_ctx):
+        ctx = run_ctx(dir=tmp_local_project({"src": {"hello.txt": "hello flow"}}))
+
+        class WrongReturns(BatchFileTask):
+            def __call__(self, ctx, files):
+                return []
+
+        output = TasksFlow(WrongReturns()).execute(ctx.project, ctx)
+
+        assert output == AutomatonRunResult(status="fail", error="Batch task returned 0 results for 1 files.")
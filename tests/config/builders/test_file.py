@@ -55,6 +55,7 @@ class TestConfigClassParsesFile:
     mode = run
     target = failed
     stop_on_fail = false
+    workers = 4
 
     [vcs]
     default_vcs = git
@@ -72,6 +73,7 @@ class TestConfigClassParsesFile:
             mode="run",
             target="failed",
             stop_on_fail=False,
+            workers=4,
             vcs=VCSConfigParams(
                 default_vcs="git",
                 base_branch="main",
@@ -80,3 +82,9 @@ class TestConfigClassParsesFile:
                 allow_publishing=True,
             ),
         )
+
+    def test_missing_options_are_left_for_other_sources(self, tmp_os_file):
+        file = tmp_os_file("[config]\nmode = amend\n\n[vcs]\n", filename="automyte.cfg")
+        overrides = Config._load_from_config_file(config_file_path=file.fullpath)
+
+        assert overrides == ConfigParams(mode="amend")
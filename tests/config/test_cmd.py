@@ -43,6 +43,8 @@ class TestConfigCmdGetConfigParamsFromArgv:
             "--dont-disrupt",
             "true",
             "--publish",
+            "--workers",
+            "4",
         ],
     )
     def test_works_for_all_supported_fields(self):
@@ -52,6 +54,7 @@ class TestConfigCmdGetConfigParamsFromArgv:
             mode="run",
             stop_on_fail=False,
             target="skipped",
+            workers=4,
             vcs=VCSConfigParams(
                 default_vcs="git",
                 allow_publishing=True,
@@ -17,7 +17,8 @@ class TestConfigEnvVar:
         monkeypatch.setenv("AUTOMYTE_MODE", "run")
         monkeypatch.setenv("AUTOMYTE_STOP_ON_FAIL", "false")
         monkeypatch.setenv("AUTOMYTE_TARGET", "new")
-        expected_result = ConfigParams(mode="run", stop_on_fail=False, target="new")
+        monkeypatch.setenv("AUTOMYTE_WORKERS", "4")
+        expected_result = ConfigParams(mode="run", stop_on_fail=False, target="new", workers=4)
 
         result = Config._load_from_env()
 
@@ -0,0 +1,93 @@
+import os
+from pathlib import Path
+
+import pytest
+
+from automyte import ContainsFilter, ExtensionFilter, LocalFilesExplorer, ModifiedFilter, PathFilter, SizeFilter
+from automyte.discovery.explorers.file_table import FileTable
+
+np = pytest.importorskip("numpy")
+
+
+@pytest.fixture
+def project_dir(tmp_local_project):
+    dir = tmp_local_project(
+        {
+            "src": {"api": {"users.py": "import os", "README.md": "docs"}, "main.py": "import sys" * 10},
+            "tests": {"test_api.py": "import os", "data.tar.gz": "", "data.gz": ""},
+            "Makefile": "all:",
+            ".env": "X=1",
+        }
+    )
+    os.utime(Path(dir) / "src" / "main.py", (1000, 1000))
+    return dir
+
+
+class TestFileTable:
+    def test_builds_columns_for_all_files(self, project_dir):
+        explorer = LocalFilesExplorer(project_dir)
+        table = FileTable()
+        table.build(explorer._walk_key(), project_dir, ((prefix, entry) for prefix, entry, _ in explorer._walk(None)))
+
+        rows = {table.relative_path(row): row for row in range(len(table))}
+        assert len(table) == 8
+        assert table.sizes[rows["src/main.py"]] == len("import sys" * 10)
+        assert table.mtimes[rows["src/main.py"]] == 1000
+        assert table.extensions[table.extension_ids[rows["tests/data.tar.gz"]]] == ".gz"
+        assert table.fullpath(rows["src/api/users.py"]) == os.path.join(project_dir, "src/api/users.py")
+
+
+class TestLocalFilesExplorerWithFileTable:
+    @pytest.mark.parametrize(
+        "filter",
+        [
+            None,
+            PathFilter(filename=r"test_.*"),
+            PathFilter(folder="api"),
+            PathFilter(folder="src", anchored=True) & ExtensionFilter(".py"),
+            ExtensionFilter("tar.gz") | SizeFilter(min_size=50),
+            ~ModifiedFilter(before=2000),
+            ~(ExtensionFilter(".py") & ContainsFilter("os")),
+            ContainsFilter("import") & ~PathFilter(folder="tests", anchored=True),
+        ],
+    )
+    def test_yields_same_files_as_walking(self, project_dir, filter):
+        walked = LocalFilesExplorer(rootdir=project_dir, filter_by=filter).explore()
+        from_table = LocalFilesExplorer(rootdir=project_dir, filter_by=filter, file_table=FileTable()).explore()
+
+        assert sorted(f.fullpath for f in from_table) == sorted(f.fullpath for f in walked)
+
+    def test_table_is_reused_until_files_are_changed(self, project_dir):
+        table = FileTable()
+        list(LocalFilesExplorer(rootdir=project_dir, filter_by=ExtensionFilter(".py"), file_table=table).explore())
+
+        explorer = LocalFilesExplorer(rootdir=project_dir, filter_by=ExtensionFilter(".md"), file_table=table)
+        explorer._walk = lambda *args: pytest.fail("Table should not be built again.")
+        files = []
+        for file in explorer.explore():
+            files.append(file.name)
+            file.edit("new docs")
+        explorer.flush()
+
+        assert files == ["README.md"]
+        assert not table.is_built_for(explorer._walk_key())
+
+    def test_table_is_not_reused_by_explorers_ignoring_other_files(self, tmp_local_project):
+        dir = tmp_local_project({"src": {"a.js": "a"}, "node_modules": {"pkg": {"i.js": "i"}}})
+        table = FileTable()
+        list(LocalFilesExplorer(rootdir=dir, ignore_locations=[], file_table=table).explore())
+
+        files = LocalFilesExplorer(rootdir=dir, file_table=table).explore()
+
+        assert [f.fullpath for f in files] == [Path(dir) / "src" / "a.js"]
+
+    def test_table_is_rebuilt_once_ignore_files_change(self, tmp_local_project):
+        dir = tmp_local_project({".gitignore": "*.log", "src": {"a.py": "a", "b.log": "b"}})
+        table = FileTable()
+        list(LocalFilesExplorer(rootdir=dir, respect_ignore_files=True, file_table=table).explore())
+
+        with open(Path(dir) / ".gitignore", "w") as ignore_file:
+            ignore_file.write("*.py")
+        files = LocalFilesExplorer(rootdir=dir, respect_ignore_files=True, file_table=table).explore()
+
+        assert sorted(f.name for f in files) == [".gitignore", "b.log"]
@@ -0,0 +1,53 @@
+import pytest
+
+from automyte.discovery.explorers.ignore import IgnoreMatcher
+
+
+class TestIgnoreMatcher:
+    @pytest.mark.parametrize(
+        "pattern, path, is_dir, expected",
+        [
+            (".git", ".git", True, True),
+            (".git", "src/.git", False, True),
+            (".git", ".github", True, False),
+            (".git", "src/.gitignore", False, False),
+            ("node_modules/", "web/node_modules", True, True),
+            ("node_modules/", "node_modules", False, False),
+            ("*.pyc", "pkg/module.pyc", False, True),
+            ("*.pyc", "pkg/module.py", False, False),
+            ("/build", "build", True, True),
+            ("/build", "src/build", True, False),
+            ("docs/_build", "docs/_build", True, True),
+            ("docs/_build", "src/docs/_build", True, False),
+            ("**/logs", "a/b/logs", True, True),
+            ("a/**/b", "a/b", True, True),
+            ("a/**/b", "a/x/y/b", True, True),
+            ("vendor/**", "vendor/lib/x.go", False, True),
+            ("file?.txt", "file1.txt", False, True),
+            ("file?.txt", "file10.txt", False, False),
+            ("[abc].txt", "b.txt", False, True),
+            ("[!abc].txt", "b.txt", False, False),
+            ("*.txt", "src/nested/a.txt", False, True),
+            ("src/*.txt", "src/nested/a.txt", False, False),
+        ],
+    )
+    def test_gitignore_semantics(self, pattern, path, is_dir, expected):
+        assert IgnoreMatcher([pattern]).is_ignored(path, is_dir=is_dir) is expected
+
+    def test_negation_reincludes_paths_and_last_match_wins(self):
+        matcher = IgnoreMatcher(["*.log", "!important.log", "debug/important.log"])
+
+        assert matcher.is_ignored("app.log")
+        assert not matcher.is_ignored("src/important.log")
+        assert matcher.is_ignored("debug/important.log")
+
+    def test_comments_and_blank_lines_are_skipped(self):
+        matcher = IgnoreMatcher(["# comment", "", "   ", "\\#hash"])
+
+        assert len(matcher.rules) == 1
+        assert matcher.is_ignored("#hash")
+        assert not matcher.is_ignored("# comment")
+
+    def test_empty_matcher_is_falsy(self):
+        assert not IgnoreMatcher([])
+        assert IgnoreMatcher(["*.pyc"])
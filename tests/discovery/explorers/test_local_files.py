@@ -1,7 +1,11 @@
+import os
 from pathlib import Path
 from tempfile import TemporaryDirectory
 
-from automyte import LocalFilesExplorer
+import pytest
+
+from automyte import ContainsFilter, LocalFilesExplorer, PathFilter, SizeFilter
+from automyte.discovery.explorers.ignore import IgnoreMatcher
 from automyte.discovery.file.os_file import File, OSFile
 from automyte.discovery.filters.base import Filter
 
@@ -42,6 +46,36 @@ class TestLocalFilesExplorerExplore:
         assert len(all_files) == 1
         assert filter.has_been_called
 
+    def test_walks_in_the_same_order_as_os_walk(self, tmp_local_project):
+        dir = tmp_local_project(
+            {"a.txt": "", "src": {"b.txt": "", "nested": {"c.txt": ""}}, "upper": {"d.txt": "", "e": {"f.txt": ""}}}
+        )
+        walked = [os.path.join(root, f) for root, _, files in os.walk(dir) for f in files]
+
+        assert [str(f) for f in LocalFilesExplorer(rootdir=dir, ignore_locations=[]).explore()] == walked
+
+    def test_yielded_files_are_stat_ed_once(self, tmp_local_project, monkeypatch):
+        dir = tmp_local_project({"src": {"hello.txt": "hello explorer"}})
+        stat, stat_ed = os.stat, []
+        monkeypatch.setattr(
+            os, "stat", lambda path, *args, **kwargs: stat_ed.append(path) or stat(path, *args, **kwargs)
+        )
+        monkeypatch.setattr(os.path, "islink", lambda *args: pytest.fail("Symlink check comes from the listing."))
+
+        files = list(LocalFilesExplorer(rootdir=dir, filter_by=SizeFilter(min_size=5)).explore())
+
+        assert [f.size for f in files] == [len("hello explorer")]
+        assert not files[0].is_symlink
+        assert stat_ed == [str(files[0])]
+
+    def test_symlinked_folders_are_not_followed(self, tmp_local_project):
+        dir = tmp_local_project({"src": {"hello.txt": "hello"}})
+        os.symlink(Path(dir) / "src", Path(dir) / "link")
+
+        files = list(LocalFilesExplorer(rootdir=dir).explore())
+
+        assert [f.name for f in files] == ["hello.txt"]
+
 
 class TestLocalFilesExplorerRootdir:
     def test_get_rootdir_returns_proper_field(self):
@@ -84,6 +118,20 @@ class TestLocalFilesExplorerFlush:
         with open(f"{dir}/upper/inner/nested.py", "r") as nested_file:
             assert nested_file.read() == "print(123)"
 
+    def test_flushes_files_marked_as_changed_after_explore_moved_on(self, tmp_local_project):
+        dir = tmp_local_project({"src": {"hello.txt": "hello explorer", "bye.txt": "bye explorer"}})
+        explorer = LocalFilesExplorer(rootdir=dir)
+        files = list(explorer.explore())
+        for file in files:
+            file.edit("changed")
+            explorer.mark_changed(file)
+        explorer.mark_changed(files[0])
+
+        explorer.flush()
+
+        assert (Path(dir) / "src" / "hello.txt").read_text() == "changed"
+        assert (Path(dir) / "src" / "bye.txt").read_text() == "changed"
+
 
 class TestLocalFilesExplorerIgnoreUtilFiles:
     def test_ignores_files_by_default(self, tmp_git_repo):
@@ -102,3 +150,228 @@ class TestLocalFilesExplorerIgnoreUtilFiles:
         assert len(files) > 1
         assert next(f for f in files if f.name == "bun.txt")
         assert next(f for f in files if ".git" in f.folder)
+
+    def test_ignored_folders_are_not_walked(self, tmp_local_project, monkeypatch):
+        dir = tmp_local_project(
+            {"src": {"hello.txt": "hello"}, "web": {"node_modules": {"pkg": {"index.js": "module"}}}}
+        )
+        walked = []
+        original_is_ignored = IgnoreMatcher.is_ignored
+
+        def record_is_ignored(self, relative_path, is_dir=False):
+            walked.append(relative_path)
+            return original_is_ignored(self, relative_path, is_dir=is_dir)
+
+        monkeypatch.setattr(IgnoreMatcher, "is_ignored", record_is_ignored)
+        files = list(LocalFilesExplorer(rootdir=dir).explore())
+
+        assert [f.name for f in files] == ["hello.txt"]
+        assert "web/node_modules" in walked
+        assert not any(path.startswith("web/node_modules/") for path in walked)
+
+    def test_patterns_match_path_components_rather_than_substrings(self, tmp_local_project):
+        dir = tmp_local_project({".github": {"ci.yml": "on: push"}, "src": {"build.py": "", "build": {"out.o": ""}}})
+
+        files = list(LocalFilesExplorer(rootdir=dir, ignore_locations=["build/"]).explore())
+
+        assert sorted(f.name for f in files) == ["build.py", "ci.yml"]
+
+
+class TestLocalFilesExplorerIgnoreFiles:
+    def test_ignore_files_are_not_respected_by_default(self, tmp_local_project):
+        dir = tmp_local_project({".gitignore": "*.log", "app.log": "logs"})
+
+        files = list(LocalFilesExplorer(rootdir=dir).explore())
+
+        assert sorted(f.name for f in files) == [".gitignore", "app.log"]
+
+    def test_nested_ignore_files_take_precedence(self, tmp_local_project):
+        dir = tmp_local_project(
+            {
+                ".gitignore": "*.log\n/build/\n",
+                "app.log": "",
+                "build": {"out.js": ""},
+                "src": {
+                    ".ignore": "!keep.log\ngenerated/",
+                    "keep.log": "",
+                    "drop.log": "",
+                    "build": {"module.py": ""},
+                    "generated": {"schema.py": ""},
+                },
+            }
+        )
+
+        files = list(LocalFilesExplorer(rootdir=dir, respect_ignore_files=True, global_ignore_files=[]).explore())
+
+        assert sorted(str(f.fullpath.relative_to(dir)) for f in files) == [
+            ".gitignore",
+            "src/.ignore",
+            "src/build/module.py",
+            "src/keep.log",
+        ]
+
+    def test_global_ignore_files_apply_to_the_whole_project(self, tmp_local_project):
+        excludes_dir = tmp_local_project({"excludes": "*.tmp\n"})
+        dir = tmp_local_project({"a.tmp": "", "src": {"b.tmp": "", "c.py": ""}})
+
+        files = list(
+            LocalFilesExplorer(
+                rootdir=dir, respect_ignore_files=True, global_ignore_files=[Path(excludes_dir) / "excludes"]
+            ).explore()
+        )
+
+        assert [f.name for f in files] == ["c.py"]
+
+    def test_ignore_files_are_compiled_once_until_changed(self, tmp_local_project):
+        dir = tmp_local_project({".gitignore": "*.log\n", "app.log": "", "app.py": ""})
+        explorer = LocalFilesExplorer(rootdir=dir, respect_ignore_files=True, global_ignore_files=[])
+
+        list(explorer.explore())
+        matcher = explorer._ignore_files_cache[str(Path(dir) / ".gitignore")][1]
+        list(explorer.explore())
+        assert explorer._ignore_files_cache[str(Path(dir) / ".gitignore")][1] is matcher
+
+        (Path(dir) / ".gitignore").write_text("*.py\n")
+        files = list(explorer.explore())
+
+        assert sorted(f.name for f in files) == [".gitignore", "app.log"]
+
+
+class TestLocalFilesExplorerFilterPushdown:
+    def test_only_folders_which_can_match_are_walked(self, tmp_local_project, monkeypatch):
+        dir = tmp_local_project(
+            {
+                "src": {"api": {"users.py": "", "v1": {"items.py": ""}}, "web": {"index.js": ""}},
+                "docs": {"index.md": ""},
+                "tests": {"test_api.py": ""},
+            }
+        )
+        listed = []
+        original_scandir = os.scandir
+        monkeypatch.setattr(os, "scandir", lambda path: listed.append(path) or original_scandir(path))
+
+        filter = PathFilter(folder="src/api", anchored=True) | PathFilter(folder="docs", anchored=True)
+        files = list(LocalFilesExplorer(rootdir=dir, filter_by=filter).explore())
+
+        assert sorted(f.name for f in files) == ["index.md", "items.py", "users.py"]
+        assert sorted(str(Path(path).relative_to(dir)) for path in listed) == [
+            ".",
+            "docs",
+            "src",
+            "src/api",
+            "src/api/v1",
+        ]
+
+    def test_non_pushable_parts_are_still_evaluated_per_file(self, tmp_local_project):
+        dir = tmp_local_project(
+            {"src": {"api": {"users.py": "import os", "items.py": "import sys"}}, "tests": {"test.py": "import os"}}
+        )
+
+        filter = PathFilter(folder="src/api", anchored=True) & ~ContainsFilter("sys")
+        files = list(LocalFilesExplorer(rootdir=dir, filter_by=filter).explore())
+
+        assert [f.name for f in files] == ["users.py"]
+
+
+class TestLocalFilesExplorerSkipping:
+    def test_binary_and_oversized_files_are_skipped_before_filtering(self, tmp_local_project):
+        dir = tmp_local_project({"hello.txt": "hello", "big.txt": "hello" * 100, "empty.txt": ""})
+        (Path(dir) / "image.png").write_bytes(b"\x89PNG\r\n\x1a\n\0\0\0\rIHDR")
+        read_files = []
+
+        class TrackingFilter(Filter):
+            def filter(self, file: File) -> bool:
+                read_files.append(file.name)
+                return True
+
+        explorer = LocalFilesExplorer(rootdir=dir, filter_by=TrackingFilter(), skip_binary=True, max_file_size=100)
+        files = [f.name for f in explorer.explore()]
+
+        assert sorted(files) == sorted(read_files) == ["empty.txt", "hello.txt"]
+        stats = explorer.get_stats()
+        assert (stats.files_scanned, stats.files_skipped_binary, stats.files_skipped_oversized) == (4, 1, 1)
+
+    def test_nothing_is_skipped_by_default(self, tmp_local_project):
+        dir = tmp_local_project({"hello.txt": "hello" * 100})
+        (Path(dir) / "image.png").write_bytes(b"\0\0")
+
+        explorer = LocalFilesExplorer(rootdir=dir)
+
+        assert len(list(explorer.explore())) == 2
+        assert explorer.get_stats().files_skipped == 0
+
+
+class TestLocalFilesExplorerFilterWorkers:
+    @pytest.fixture
+    def project_dir(self, tmp_local_project):
+        return tmp_local_project(
+            {f"dir{i}": {f"file{j}.txt": "import os" if j % 3 else "import sys" for j in range(10)} for i in range(60)}
+        )
+
+    def test_yields_same_files_in_the_same_order(self, project_dir):
+        filter = ContainsFilter("os", regexp=True) | PathFilter(folder="dir1", anchored=True)
+
+        sequential = LocalFilesExplorer(rootdir=project_dir, filter_by=filter)
+        parallel = LocalFilesExplorer(rootdir=project_dir, filter_by=filter, filter_workers=2)
+
+        assert [f.fullpath for f in parallel.explore()] == [f.fullpath for f in sequential.explore()]
+        assert parallel.get_stats().bytes_read == sequential.get_stats().bytes_read
+
+    def test_unordered_yields_same_files(self, project_dir):
+        filter = ContainsFilter("os")
+
+        sequential = LocalFilesExplorer(rootdir=project_dir, filter_by=filter)
+        parallel = LocalFilesExplorer(rootdir=project_dir, filter_by=filter, filter_workers=2, filter_ordered=False)
+
+        assert sorted(f.fullpath for f in parallel.explore()) == sorted(f.fullpath for f in sequential.explore())
+
+    def test_passed_files_can_be_edited(self, project_dir):
+        explorer = LocalFilesExplorer(rootdir=project_dir, filter_by=ContainsFilter("sys"), filter_workers=2)
+        for file in explorer.explore():
+            file.edit("import json")
+        explorer.flush()
+
+        assert not list(LocalFilesExplorer(rootdir=project_dir, filter_by=ContainsFilter("sys")).explore())
+
+
+class TestLocalFilesExplorerAnalyze:
+    def test_reports_walk_and_each_filter_node(self, tmp_local_project):
+        dir = tmp_local_project(
+            {
+                "src": {"a.py": "import os", "b.py": "import sys", "c.txt": "import os"},
+                "docs": {"d.py": "import os"},
+                "node_modules": {"e.py": "import os"},
+            }
+        )
+        filter = PathFilter(folder="src", anchored=True) & PathFilter(filename=r".*\.py") & ContainsFilter("os")
+        explorer = LocalFilesExplorer(rootdir=dir, filter_by=filter, analyze=True)
+
+        files = list(explorer.explore())
+        analysis = explorer.get_analysis()
+
+        assert [f.name for f in files] == ["a.py"]
+        assert (analysis.dirs_walked, analysis.dirs_pruned, analysis.dirs_ignored) == (2, 1, 1)
+        assert analysis.filter.name == "AllOf"
+        assert analysis.filter.evaluations == 3 and analysis.filter.passes == 1
+        contains_analysis = analysis.filter.children[-1]
+        assert contains_analysis.name == "ContainsFilter(('os',), False)"
+        assert (contains_analysis.evaluations, contains_analysis.passes) == (2, 1)
+        assert contains_analysis.bytes_read == len("import os") + len("import sys")
+        assert "ContainsFilter(('os',), False): 2 evaluated, 1 passed" in str(analysis)
+
+    def test_shared_nodes_are_still_evaluated_once_per_file(self, tmp_local_project):
+        dir = tmp_local_project({"a.py": "import os", "b.txt": "import os"})
+        shared = ContainsFilter("import")
+        filter = (shared & PathFilter(filename=r".*\.py")) | (shared & PathFilter(filename=r".*\.txt"))
+        explorer = LocalFilesExplorer(rootdir=dir, filter_by=filter, analyze=True)
+
+        assert len(list(explorer.explore())) == 2
+        shared_analysis = explorer.get_analysis().filter.children[0].children[-1]
+        assert shared_analysis.name.startswith("Shared")
+        assert shared_analysis.children[0].evaluations == 2
+
+    def test_is_not_available_by_default(self, tmp_local_project):
+        explorer = LocalFilesExplorer(rootdir=tmp_local_project({"a.py": ""}))
+        list(explorer.explore())
+
+        assert explorer.get_analysis() is None
@@ -1,7 +1,13 @@
+import gc
 import os
+import re
+import sys
+import tracemalloc
 from pathlib import Path
 
-from automyte import OSFile
+import pytest
+
+from automyte import LocalFilesExplorer, OSFile
 
 
 class TestOSFileGetContents:
@@ -132,3 +138,94 @@ class TestOSFileProperties:
     def test_extension_is_included_in_the_name(self, tmp_os_file):
         file: OSFile = tmp_os_file("whatever", filename="my_file.txt")
         assert file.name == "my_file.txt"
+
+    def test_files_in_the_same_folder_share_the_folder_path(self, tmp_local_project):
+        dir = tmp_local_project({"src": {"a.txt": "a", "b.txt": "b"}})
+        a, b = OSFile(fullname=f"{dir}/src/a.txt"), OSFile(fullname=f"{dir}/src/b.txt")
+
+        assert a.folder == f"{dir}/src"
+        assert a.folder is b.folder
+
+    def test_folder_is_normalized(self):
+        assert OSFile(fullname="smth//./nested/hello.txt").folder == "smth/nested"
+        assert OSFile(fullname="hello.txt").folder == "."
+
+    def test_fullpath_is_updated_after_move(self, tmp_os_file):
+        file: OSFile = tmp_os_file("revision 1")
+        old_path = file.fullpath
+        file.move(new_name="newname")
+
+        assert file.fullpath == old_path.parent / "newname"
+        assert str(file) == str(old_path.parent / "newname")
+
+    def test_path_is_kept_as_given(self, tmp_local_project):
+        dir = tmp_local_project({"src": {"a.txt": "a"}})
+
+        assert str(OSFile(fullname=f"{dir}/./src/a.txt")) == f"{dir}/./src/a.txt"
+
+    def test_doesnt_keep_per_instance_dict(self, tmp_os_file):
+        file: OSFile = tmp_os_file("whatever")
+
+        assert not hasattr(file, "__dict__")
+
+    def test_explored_files_take_little_more_memory_than_their_paths(self, tmp_local_project):
+        dir = tmp_local_project({f"folder_{i}": {f"file_{j}.py": "" for j in range(100)} for i in range(10)})
+        explorer = LocalFilesExplorer(rootdir=dir)
+
+        gc.collect()
+        tracemalloc.start()
+        try:
+            files = list(explorer.explore())
+            gc.collect()
+            bytes_per_file = tracemalloc.get_traced_memory()[0] / len(files)
+        finally:
+            tracemalloc.stop()
+
+        # Object itself, its path and a pointer to it in the list, with some room for allocator rounding.
+        expected = sys.getsizeof(files[0]) + sys.getsizeof(str(files[0])) + 8
+        assert bytes_per_file < expected + 16
+
+
+class TestOSFileMetadata:
+    def test_metadata_is_read_from_the_disk(self, tmp_os_file):
+        file = tmp_os_file("hello")
+
+        assert file.size == 5
+        assert file.mtime == os.stat(file.fullpath).st_mtime
+        assert file.inode == os.stat(file.fullpath).st_ino
+        assert not file.is_symlink
+
+    def test_metadata_is_stat_ed_once(self, tmp_os_file, monkeypatch):
+        file = tmp_os_file("hello")
+        expected_stat = file.stat()
+
+        monkeypatch.setattr(os, "stat", lambda *args, **kwargs: pytest.fail("File should not be stat-ed again."))
+
+        assert file.size == 5
+        assert file.mtime == expected_stat.st_mtime
+        assert file.inode == expected_stat.st_ino
+
+    def test_symlink_check_comes_from_directory_entry(self, tmp_os_file, monkeypatch):
+        file = tmp_os_file("hello")
+        entry = next(e for e in os.scandir(file.folder) if e.name == file.name)
+        file = OSFile(fullname=entry.path, entry=entry)
+
+        monkeypatch.setattr(os.path, "islink", lambda *args: pytest.fail("File should not be checked again."))
+
+        assert not file.is_symlink
+        assert entry not in gc.get_referents(file)
+
+
+class TestOSFileSearchRaw:
+    @pytest.mark.parametrize("contents", ["hello world", "hello world" * 10000, ""])
+    def test_searches_bytes_without_reading_contents(self, tmp_os_file, contents):
+        file = tmp_os_file(contents)
+
+        assert file.search_raw(re.compile(b"world")) is bool(contents)
+        assert file._contents is None
+
+    def test_defers_to_contents_once_they_are_loaded(self, tmp_os_file):
+        file = tmp_os_file("hello")
+        file.edit("world")
+
+        assert file.search_raw(re.compile(b"world")) is None
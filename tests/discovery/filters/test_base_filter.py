@@ -1,4 +1,5 @@
-from automyte import File, Filter, OSFile
+from automyte import File, Filter, OSFile, PathFilter
+from automyte.discovery.filters.base import AndFilter, NotFilter, OrFilter
 
 
 class ExampleFilter1(Filter):
@@ -59,3 +60,26 @@ class TestFilter:
 
         assert filter1.filter(file=file)
         assert not filter2.filter(file=file)
+
+
+class TestFilterDirVerdict:
+    def test_combined_filters_verdicts(self):
+        api = PathFilter(folder="src/api", anchored=True)
+        docs = PathFilter(folder="docs", anchored=True)
+        contents = ExampleFilter1()
+
+        assert (api | docs).dir_verdict("docs/guides") is True
+        assert (api | docs).dir_verdict("tests") is False
+        assert (api & contents).dir_verdict("src/api") is None
+        assert (api & contents).dir_verdict("tests") is False
+        assert (api | contents).dir_verdict("tests") is None
+        assert (~api).dir_verdict("src/api/v1") is False
+        assert (~api).dir_verdict("tests") is True
+        assert (~contents).dir_verdict("tests") is None
+
+    def test_combinators_are_regular_classes(self):
+        filter = ExampleFilter1() & ~ExampleFilter2()
+
+        assert isinstance(filter, AndFilter)
+        assert isinstance(filter.filter2, NotFilter)
+        assert isinstance(ExampleFilter1() | ExampleFilter2(), OrFilter)
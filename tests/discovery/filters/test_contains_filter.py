@@ -1,3 +1,5 @@
+import pytest
+
 from automyte import ContainsFilter
 
 
@@ -25,3 +27,79 @@ class TestContainsFilter:
 
         assert ContainsFilter(contains=[r"su.string", r"text"], regexp=True).filter(file=file)
         assert not ContainsFilter(contains=[r"si.*", r"what.*"], regexp=True).filter(file=file)
+
+
+class TestContainsFilterMultiplePatterns:
+    @pytest.mark.parametrize(
+        "contents, expected",
+        [
+            ("call foo() here", True),
+            ("fob", True),
+            ("football", True),
+            ("fo bar", False),
+            ("prefix_barbaz", True),
+            ("ba", False),
+            ("a.b", True),
+            ("axb", False),
+        ],
+    )
+    def test_literals_with_common_prefixes(self, tmp_os_file, contents, expected):
+        needles = ["foo", "foobar", "fob", "barbaz", "bar_", "a.b"]
+
+        assert ContainsFilter(contains=needles).filter(file=tmp_os_file(contents)) is expected
+        assert any(needle in contents for needle in needles) is expected
+
+    def test_many_literals_are_scanned_with_single_regex(self):
+        needles = [f"deprecated_api_{i}" for i in range(200)]
+
+        filter = ContainsFilter(contains=needles)
+
+        assert filter._combined is not None
+        assert filter._combined.search("x = deprecated_api_150()")
+        assert not filter._combined.search("x = deprecated_api_()")
+
+    def test_long_literals_dont_hit_recursion_limit(self, tmp_os_file):
+        needles = ["a" * 5000, "a" * 4999 + "b"]
+
+        assert ContainsFilter(contains=needles).filter(file=tmp_os_file("x" + "a" * 4999 + "b"))
+
+    def test_patterns_with_backreferences_are_searched_one_by_one(self, tmp_os_file):
+        filter = ContainsFilter(contains=[r"(\w)\1", r"(?P<q>['\"]).*(?P=q)"], regexp=True)
+
+        assert filter._combined is None
+        assert filter.filter(file=tmp_os_file("hello"))
+        assert filter.filter(file=tmp_os_file("say 'hi'"))
+        assert not filter.filter(file=tmp_os_file("abc 'd"))
+
+    def test_patterns_which_cant_be_combined_are_searched_one_by_one(self, tmp_os_file):
+        filter = ContainsFilter(contains=[r"(?i)hello", r"world"], regexp=True)
+
+        assert filter._combined is None
+        assert filter.filter(file=tmp_os_file("HELLO"))
+
+
+class TestContainsFilterRawSearch:
+    @pytest.mark.parametrize(
+        "contains, regexp",
+        [("привет", False), (["hello", "bye"], False), (r"hel+o", True), ([r"hello", r"[a-z]+ld"], True)],
+    )
+    def test_rejected_files_are_not_decoded(self, tmp_os_file, contains, regexp):
+        file = tmp_os_file("nothing to see here")
+
+        assert not ContainsFilter(contains=contains, regexp=regexp).filter(file=file)
+        assert file._contents is None
+
+    @pytest.mark.parametrize(
+        "contains, regexp", [("a\nb", False), (r"a.c", True), (r"\w+", True), (r"end$", True), (r"[^x]", True)]
+    )
+    def test_texts_matching_differently_in_bytes_search_decoded_text(self, contains, regexp):
+        assert ContainsFilter(contains=contains, regexp=regexp)._raw_pattern is None
+
+    def test_multibyte_texts_are_found(self, tmp_os_file):
+        assert ContainsFilter(contains=["приём", "привет"]).filter(file=tmp_os_file("всем привет!"))
+
+    def test_edited_contents_are_searched(self, tmp_os_file):
+        file = tmp_os_file("hello")
+        file.edit("world")
+
+        assert ContainsFilter(contains="world").filter(file=file)
@@ -0,0 +1,119 @@
+import sqlite3
+import time
+from pathlib import Path
+
+from automyte import Automaton, ContainsFilter, FilterCache, InMemoryHistory, LocalFilesExplorer, PathFilter, Project
+from automyte.config import Config
+from automyte.discovery.file import File
+from automyte.discovery.filters.base import Filter
+
+
+class CountingFilter(Filter):
+    cacheable = True
+
+    def __init__(self, text: str) -> None:
+        self.text = text
+        self.calls: list[str] = []
+
+    def filter(self, file: File) -> bool:
+        self.calls.append(file.name)
+        return self.text in file.get_contents()
+
+    def _params(self) -> tuple | None:
+        return (self.text,)
+
+
+class TestFilterFingerprint:
+    def test_is_same_for_filters_with_the_same_params(self):
+        assert ContainsFilter(["a", "b"]).fingerprint() == ContainsFilter(["a", "b"]).fingerprint()
+        assert ContainsFilter(["a", "b"]).fingerprint() != ContainsFilter(["a", "b"], regexp=True).fingerprint()
+        and_fingerprint = (PathFilter("x") & ContainsFilter("a")).fingerprint()
+        assert and_fingerprint is not None
+        assert and_fingerprint != (PathFilter("x") | ContainsFilter("a")).fingerprint()
+
+    def test_is_none_for_filters_without_params(self):
+        assert Filter().fingerprint() is None
+        assert (Filter() & ContainsFilter("a")).fingerprint() is None
+
+
+class TestFilterCache:
+    def test_unchanged_files_are_not_filtered_again(self, tmp_local_project):
+        dir = tmp_local_project({"a.txt": "hello", "b.txt": "world"})
+        cache = FilterCache(Path(tmp_local_project({})) / "cache.db")
+        first, second = CountingFilter("hello"), CountingFilter("hello")
+
+        first_files = [f.name for f in LocalFilesExplorer(rootdir=dir, filter_by=first, filter_cache=cache).explore()]
+        explorer = LocalFilesExplorer(rootdir=dir, filter_by=second, filter_cache=cache)
+        second_files = [f.name for f in explorer.explore()]
+
+        assert first_files == second_files == ["a.txt"]
+        assert sorted(first.calls) == ["a.txt", "b.txt"]
+        assert second.calls == []
+        assert explorer.get_stats().bytes_read == 0
+
+    def test_files_with_changed_contents_are_filtered_again(self, tmp_local_project):
+        dir = tmp_local_project({"a.txt": "hello", "b.txt": "world"})
+        cache = FilterCache(Path(tmp_local_project({})) / "cache.db")
+        list(LocalFilesExplorer(rootdir=dir, filter_by=CountingFilter("hello"), filter_cache=cache).explore())
+
+        Path(dir, "b.txt").write_text("hello world")
+        filter = CountingFilter("hello")
+        files = [f.name for f in LocalFilesExplorer(rootdir=dir, filter_by=filter, filter_cache=cache).explore()]
+
+        assert sorted(files) == ["a.txt", "b.txt"]
+        assert filter.calls == ["b.txt"]
+
+    def test_changed_files_are_filtered_again_in_subfolders_of_repository(self, tmp_git_repo, tmp_local_project):
+        dir = tmp_git_repo({"sub": {"a.txt": "hello"}})
+        cache = FilterCache(Path(tmp_local_project({})) / "cache.db")
+        explorer = LocalFilesExplorer(rootdir=f"{dir}/sub", filter_by=ContainsFilter("hello"), filter_cache=cache)
+        list(explorer.explore())
+
+        Path(dir, "sub", "a.txt").write_text("changed\n")
+
+        assert list(explorer.explore()) == []
+
+    def test_least_recently_used_results_are_evicted(self, tmp_local_project):
+        cache = FilterCache(Path(tmp_local_project({})) / "cache.db", max_entries=2)
+        for content_hash in ["old", "newer", "newest"]:
+            cache.set("filter", content_hash, True)
+            cache.evict()
+            time.sleep(0.01)
+
+        cache.get("filter", "newer")
+        cache.set("filter", "latest", False)
+        cache.evict()
+
+        assert [cache.get("filter", h) for h in ["old", "newer", "newest", "latest"]] == [None, True, None, False]
+
+    def test_least_recently_used_hashes_are_evicted(self, tmp_local_project):
+        dir = tmp_local_project({"a.txt": "hello", "b.txt": "world", "c.txt": "bye"})
+        cache = FilterCache(Path(tmp_local_project({})) / "cache.db", max_entries=2)
+        list(LocalFilesExplorer(rootdir=dir, filter_by=CountingFilter("hello"), filter_cache=cache).explore())
+
+        cache.evict()
+
+        with sqlite3.connect(cache.filepath) as connection:
+            assert connection.execute("SELECT COUNT(*) FROM hashes").fetchone()[0] == 2
+
+    def test_tracked_files_are_not_read_again_in_new_worktrees(self, tmp_git_repo, tmp_local_project):
+        dir = tmp_git_repo({"a.txt": "hello", "src": {"b.txt": "world"}})
+        history = InMemoryHistory()
+        cache = FilterCache(Path(tmp_local_project({})) / "cache.db")
+        explorer = LocalFilesExplorer(rootdir=dir, filter_by=ContainsFilter("hello"), filter_cache=cache)
+        automaton = Automaton(
+            "auto",
+            history=history,
+            config=Config.get_default().set_vcs(work_branch="run1"),
+            projects=[Project("proj1", explorer=explorer)],
+            tasks=[lambda ctx, file: None],
+        )
+
+        automaton.run(skip_validation=True)
+        assert history.get_status("auto", "proj1").metrics.bytes_read == len("hello") + len("world")
+
+        automaton.config.set_vcs(work_branch="run2")
+        automaton.run(skip_validation=True)
+        assert history.get_status("auto", "proj1").metrics.bytes_read == 0
+        with sqlite3.connect(cache.filepath) as connection:
+            assert connection.execute("SELECT COUNT(*) FROM hashes").fetchone()[0] == 0
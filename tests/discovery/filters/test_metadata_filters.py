@@ -0,0 +1,33 @@
+import os
+from datetime import datetime, timedelta
+
+from automyte.discovery.filters import ExtensionFilter, ModifiedFilter, SizeFilter
+
+
+class TestSizeFilter:
+    def test_filters_by_size_range(self, tmp_os_file):
+        file = tmp_os_file("hello")
+
+        assert SizeFilter(min_size=5, max_size=5).filter(file)
+        assert SizeFilter(max_size=10).filter(file)
+        assert not SizeFilter(min_size=6).filter(file)
+        assert not SizeFilter(max_size=4).filter(file)
+
+
+class TestModifiedFilter:
+    def test_filters_by_modification_window(self, tmp_os_file):
+        file = tmp_os_file("hello")
+        os.utime(file.fullpath, (1_700_000_000, 1_700_000_000))
+
+        assert ModifiedFilter(after=1_600_000_000, before=1_800_000_000).filter(file)
+        assert not ModifiedFilter(after=datetime.fromtimestamp(1_700_000_000) + timedelta(days=1)).filter(file)
+        assert not ModifiedFilter(before=datetime.fromtimestamp(1_700_000_000) - timedelta(days=1)).filter(file)
+
+
+class TestExtensionFilter:
+    def test_filters_by_extension(self, tmp_os_file):
+        file = tmp_os_file("", filename="archive.TAR.gz")
+
+        assert ExtensionFilter("gz").filter(file)
+        assert ExtensionFilter(".py", ".tar.gz").filter(file)
+        assert not ExtensionFilter(".py", "zip").filter(file)
@@ -1,3 +1,5 @@
+import pytest
+
 from automyte.discovery import OSFile
 from automyte.discovery.filters import PathFilter
 
@@ -39,3 +41,31 @@ class TestPathFilter:
 
         assert PathFilter(folder="subdir", filename=r"bye.py").filter(file=file)
         assert not PathFilter(folder="subdir", filename=r"bye.py").filter(file=wrong_file)
+
+
+class TestAnchoredPathFilter:
+    def test_matches_files_inside_folder_relative_to_rootdir(self, tmp_local_project):
+        dir = tmp_local_project({"src": {"api": {"v1": {"users.py": ""}}, "web": {"api": {"client.py": ""}}}})
+        filter = PathFilter(folder="src/api", anchored=True)
+
+        assert filter.filter(OSFile(fullname=f"{dir}/src/api/v1/users.py", rootdir=dir))
+        assert not filter.filter(OSFile(fullname=f"{dir}/src/web/api/client.py", rootdir=dir))
+
+    @pytest.mark.parametrize(
+        "relative_dir, expected",
+        [
+            ("src", None),
+            ("src/api", True),
+            ("src/api/v1", True),
+            ("src/apis", False),
+            ("docs", False),
+            ("web/src/api", False),
+        ],
+    )
+    def test_dir_verdict(self, relative_dir, expected):
+        assert PathFilter(folder="src/api", anchored=True).dir_verdict(relative_dir) is expected
+
+    def test_dir_verdict_is_unknown_with_filename_or_when_not_anchored(self):
+        assert PathFilter(filename=r".*\.py", folder="src/api", anchored=True).dir_verdict("src/api") is None
+        assert PathFilter(filename=r".*\.py", folder="src/api", anchored=True).dir_verdict("docs") is False
+        assert PathFilter(folder="src/api").dir_verdict("docs") is None
@@ -0,0 +1,81 @@
+import itertools
+
+from automyte import ContainsFilter, ExtensionFilter, File, Filter, LocalFilesExplorer, PathFilter, SizeFilter
+from automyte.discovery.filters.base import NotFilter
+from automyte.discovery.filters.planner import AllOf, AnyOf, plan_filter
+
+
+class CountingFilter(Filter):
+    calls = 0
+
+    def __init__(self, text: str) -> None:
+        self.text = text
+
+    def filter(self, file: File) -> bool:
+        CountingFilter.calls += 1
+        return file.contains(self.text)
+
+    def _params(self) -> tuple | None:
+        return (self.text,)
+
+
+class TestPlanFilter:
+    def test_cheap_filters_are_evaluated_first(self):
+        contains, path = ContainsFilter("hello"), PathFilter(filename=r".*\.py")
+
+        planned = plan_filter(contains & path)
+
+        assert isinstance(planned, AllOf)
+        assert planned.filters == (path, contains)
+
+    def test_nested_filters_are_flattened(self):
+        a, b, c, d = ContainsFilter("a"), SizeFilter(max_size=10), PathFilter("c"), ExtensionFilter(".py")
+
+        planned = plan_filter((a & b) & (c & d))
+
+        assert isinstance(planned, AllOf)
+        assert planned.filters == (c, d, b, a)
+        assert isinstance(plan_filter((a | b) | (c | d)), AnyOf)
+
+    def test_duplicates_and_double_negations_are_removed(self):
+        assert plan_filter(ContainsFilter("a") & ContainsFilter("a")) == ContainsFilter("a")
+        assert plan_filter(~~PathFilter("a")) == PathFilter("a")
+        assert isinstance(plan_filter(~~~PathFilter("a")), NotFilter)
+
+    def test_repeated_subexpressions_are_evaluated_once_per_file(self, tmp_os_file):
+        file = tmp_os_file("hello there")
+        filter = (CountingFilter("hello") & PathFilter("nope")) | (CountingFilter("hello") & ~PathFilter("nope"))
+        CountingFilter.calls = 0
+
+        assert plan_filter(filter).filter(file)
+        assert CountingFilter.calls == 1
+
+    def test_results_are_the_same_as_for_original_filters(self, tmp_local_project):
+        dir = tmp_local_project(
+            {"a.py": "import os", "b.py": "print(1)", "c.txt": "import os", "d.md": "", "big.py": "x" * 100}
+        )
+        leaves = [
+            ContainsFilter("import"),
+            PathFilter(filename=r"^[ab]"),
+            ExtensionFilter(".py"),
+            SizeFilter(max_size=50),
+        ]
+        filters = []
+        for f1, f2, f3 in itertools.permutations(leaves, 3):
+            filters.extend([f1 & (f2 | ~f3), (f1 | f2) & ~(f3 & f1), ~f1 | (f2 & f3 & f1)])
+
+        files = list(LocalFilesExplorer(rootdir=dir).explore())
+        for filter in filters:
+            planned = plan_filter(filter)
+            assert [planned.filter(f) for f in files] == [filter.filter(f) for f in files]
+
+
+class TestExplorerUsesPlanner:
+    def test_files_are_not_read_if_cheaper_filters_rule_them_out(self, tmp_local_project):
+        dir = tmp_local_project({"src": {"a.py": "hello", "b.txt": "hello there", "c.md": "hello again"}})
+        explorer = LocalFilesExplorer(rootdir=dir, filter_by=ContainsFilter("hello") & PathFilter(filename=r".*\.py"))
+
+        files = list(explorer.explore())
+
+        assert [f.name for f in files] == ["a.py"]
+        assert explorer.stats.bytes_read == len("hello")
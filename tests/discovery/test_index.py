@@ -0,0 +1,162 @@
+import os
+from pathlib import Path
+
+from automyte import (
+    Automaton,
+    ContainsFilter,
+    InMemoryHistory,
+    LocalFilesExplorer,
+    OSFile,
+    PathFilter,
+    Project,
+    TrigramIndex,
+)
+from automyte.config import Config
+from automyte.utils import bash
+
+
+def _files(dir: str) -> dict[str, OSFile]:
+    files = {}
+    for root, folders, names in os.walk(dir):
+        if ".git" in folders:
+            folders.remove(".git")
+
+        for name in names:
+            if name != ".git":  # Worktrees have a file pointing to the repository instead of a folder.
+                relative_path = os.path.relpath(os.path.join(root, name), dir).replace(os.sep, "/")
+                files[relative_path] = OSFile(os.path.join(root, name))
+
+    return files
+
+
+class TestTrigramIndex:
+    def test_returns_files_which_have_all_trigrams_of_text(self, tmp_local_project):
+        dir = tmp_local_project({"src": {"a.py": "import os", "b.py": "import sys", "c.py": "os = 'import'"}})
+        index = TrigramIndex(Path(tmp_local_project({})) / "index.db")
+        index.update(_files(dir))
+
+        assert index.files_containing(["import os"]) == {"src/a.py"}
+        assert index.files_containing(["import"]) == {"src/a.py", "src/b.py", "src/c.py"}
+        assert index.files_containing(["missing"]) == set()
+
+    def test_texts_shorter_than_trigram_cant_be_looked_up(self, tmp_local_project):
+        index = TrigramIndex(Path(tmp_local_project({})) / "index.db")
+
+        assert index.files_containing(["os"]) is None
+
+    def test_only_changed_files_are_reindexed(self, tmp_local_project):
+        dir = tmp_local_project({"a.txt": "hello", "b.txt": "world"})
+        index = TrigramIndex(Path(tmp_local_project({})) / "index.db")
+        index.update(_files(dir))
+
+        Path(dir, "b.txt").write_text("hello world")
+        files = _files(dir)
+        files["a.txt"].stats = files["b.txt"].stats = stats = LocalFilesExplorer(rootdir=dir).stats
+        index.update(files)
+
+        assert stats.bytes_read == len("hello world")
+        assert index.files_containing(["hello"]) == {"a.txt", "b.txt"}
+        assert index.files_containing(["world"]) == {"b.txt"}
+
+    def test_regexps_are_looked_up_by_their_literal_parts(self, tmp_local_project):
+        dir = tmp_local_project({"a.py": "def run(self):", "b.py": "def run(cls):", "c.py": "self.run()"})
+        index = TrigramIndex(Path(tmp_local_project({})) / "index.db")
+        index.update(_files(dir))
+
+        assert index.files_matching([r"def \w+\(self"]) == {"a.py"}
+        assert index.files_matching([r"def \w+\(self", r"\.run\("]) == {"a.py", "c.py"}
+
+    def test_regexps_without_literal_parts_cant_be_looked_up(self, tmp_local_project):
+        index = TrigramIndex(Path(tmp_local_project({})) / "index.db")
+
+        assert index.files_matching([r"(os|sys)", r"\w+\(\)"]) is None
+        assert index.files_matching([r"(?i)import os"]) is None
+
+    def test_tracked_files_are_not_read_again_in_project_copies(self, tmp_git_repo, tmp_local_project):
+        dir = tmp_git_repo({"a.txt": "hello", "src": {"b.txt": "world"}})
+        index = TrigramIndex(Path(tmp_local_project({})) / "index.db")
+        index.update(_files(dir), rootdir=dir)
+
+        copy = f"{tmp_local_project({})}/copy"
+        bash.execute(["git", "-C", dir, "worktree", "add", copy])
+        Path(copy, "untracked.txt").write_text("hello again")
+        files = _files(copy)
+        stats = LocalFilesExplorer(rootdir=copy).stats
+        for file in files.values():
+            file.stats = stats
+        index.update(files, rootdir=copy)
+
+        assert stats.bytes_read == len("hello again")
+        assert index.files_containing(["hello"]) == {"a.txt", "untracked.txt"}
+
+    def test_big_files_are_always_candidates(self, tmp_local_project):
+        dir = tmp_local_project({"small.txt": "hello", "big.txt": "bye" * 100})
+        index = TrigramIndex(Path(tmp_local_project({})) / "index.db", max_file_size=100)
+        index.update(_files(dir))
+
+        assert index.files_containing(["hello"]) == {"small.txt", "big.txt"}
+
+
+class TestLocalFilesExplorerWithIndex:
+    def test_only_candidate_files_are_read(self, tmp_local_project):
+        dir = tmp_local_project({"src": {"a.py": "import os", "b.py": "import sys"}, "docs": {"c.md": "os"}})
+        index = TrigramIndex(Path(tmp_local_project({})) / "index.db")
+        filter = ContainsFilter(["import os", "import json"]) & PathFilter(filename=r".*\.py")
+
+        list(LocalFilesExplorer(rootdir=dir, filter_by=filter, index=index).explore())
+        explorer = LocalFilesExplorer(rootdir=dir, filter_by=filter, index=index)
+        files = list(explorer.explore())
+
+        assert [f.name for f in files] == ["a.py"]
+        assert explorer.get_stats().bytes_read == len("import os")
+
+    def test_changed_and_deleted_files_are_picked_up(self, tmp_local_project):
+        dir = tmp_local_project({"a.txt": "hello", "b.txt": "world"})
+        index = TrigramIndex(Path(tmp_local_project({})) / "index.db")
+        explorer = LocalFilesExplorer(rootdir=dir, filter_by=ContainsFilter("hello"), index=index)
+        list(explorer.explore())
+
+        Path(dir, "a.txt").unlink()
+        Path(dir, "b.txt").write_text("hello world")
+
+        assert [f.name for f in explorer.explore()] == ["b.txt"]
+        assert index.files_containing(["hello"]) == {"b.txt"}
+
+    def test_changed_files_are_picked_up_in_subfolders_of_repository(self, tmp_git_repo, tmp_local_project):
+        dir = tmp_git_repo({"sub": {"a.txt": "hello"}})
+        index = TrigramIndex(Path(tmp_local_project({})) / "index.db")
+        explorer = LocalFilesExplorer(rootdir=f"{dir}/sub", filter_by=ContainsFilter("needle"), index=index)
+        list(explorer.explore())
+
+        Path(dir, "sub", "a.txt").write_text("needle")
+
+        assert [f.name for f in explorer.explore()] == ["a.txt"]
+
+    def test_filters_which_cant_use_index_check_all_files(self, tmp_local_project):
+        dir = tmp_local_project({"a.txt": "hello", "b.txt": "world"})
+        index = TrigramIndex(Path(tmp_local_project({})) / "index.db")
+        filter = ContainsFilter("hello") | ContainsFilter("w.r.d", regexp=True)
+
+        files = LocalFilesExplorer(rootdir=dir, filter_by=filter, index=index).explore()
+
+        assert sorted(f.name for f in files) == ["a.txt", "b.txt"]
+
+    def test_unchanged_files_are_not_reindexed_in_new_worktrees(self, tmp_git_repo, tmp_local_project):
+        dir = tmp_git_repo({"a.txt": "hello", "b.txt": "world"})
+        history = InMemoryHistory()
+        index = TrigramIndex(Path(tmp_local_project({})) / "index.db")
+        explorer = LocalFilesExplorer(rootdir=dir, filter_by=ContainsFilter("hello"), index=index)
+        automaton = Automaton(
+            "auto",
+            history=history,
+            config=Config.get_default().set_vcs(work_branch="run1"),
+            projects=[Project("proj1", explorer=explorer)],
+            tasks=[lambda ctx, file: None],
+        )
+
+        automaton.run(skip_validation=True)
+        assert history.get_status("auto", "proj1").metrics.bytes_read == len("hello") * 2 + len("world")
+
+        automaton.config.set_vcs(work_branch="run2")
+        automaton.run(skip_validation=True)
+        assert history.get_status("auto", "proj1").metrics.bytes_read == len("hello")
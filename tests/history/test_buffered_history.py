@@ -0,0 +1,196 @@
+import gc
+import time
+import typing as t
+import weakref
+
+import pytest
+
+from automyte import Automaton, AutomatonRunResult, BufferedHistory, InMemoryHistory, Project
+from automyte.config import Config
+
+
+def wait_until(condition, timeout: float = 2.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            pytest.fail("Condition was not met in time.")
+        time.sleep(0.01)
+
+
+@pytest.fixture
+def buffered_history():
+    histories = []
+
+    def _buffered_history_factory(flush_every: int = 1000, flush_interval: float = 1000):
+        history = BufferedHistory(InMemoryHistory(), flush_every=flush_every, flush_interval=flush_interval)
+        histories.append(history)
+        return history
+
+    yield _buffered_history_factory
+
+    for history in histories:
+        history.close()
+
+
+class TestBufferedHistoryWrites:
+    def test_updates_are_not_written_until_flushed(self, buffered_history):
+        history = buffered_history()
+
+        history.set_status("auto", "proj1", AutomatonRunResult("success"))
+        assert history.history.read("auto") == {}
+
+        history.flush()
+        assert history.history.read("auto") == {"proj1": AutomatonRunResult("success")}
+
+    def test_flushes_in_background_after_enough_updates(self, buffered_history):
+        history = buffered_history(flush_every=3)
+
+        for i in range(3):
+            history.set_status("auto", f"proj{i}", AutomatonRunResult("success"))
+
+        wait_until(lambda: len(history.history.read("auto")) == 3)
+
+    def test_flushes_in_background_after_interval(self, buffered_history):
+        history = buffered_history(flush_interval=0.05)
+
+        history.set_status("auto", "proj1", AutomatonRunResult("success"))
+
+        wait_until(lambda: history.history.read("auto") == {"proj1": AutomatonRunResult("success")})
+
+    def test_only_latest_update_is_written(self, buffered_history):
+        history = buffered_history()
+
+        history.mark_running("auto", ["proj1"])
+        history.set_status("auto", "proj1", AutomatonRunResult("fail", error="oops"))
+        history.flush()
+
+        assert history.history.read("auto") == {"proj1": AutomatonRunResult("fail", error="oops")}
+
+    def test_running_marks_are_written_in_background(self, buffered_history):
+        history = buffered_history(flush_interval=0.05)
+
+        history.set_status("auto", "proj1", AutomatonRunResult("fail", error="oops"))
+        history.mark_running("auto", ["proj1", "proj2"])
+
+        wait_until(
+            lambda: history.history.read("auto")
+            == {"proj1": AutomatonRunResult("running"), "proj2": AutomatonRunResult("running")}
+        )
+
+    def test_closed_history_can_be_garbage_collected(self):
+        history = BufferedHistory(InMemoryHistory())
+        history.set_status("auto", "proj1", AutomatonRunResult("success"))
+        history.close()
+
+        history_ref = weakref.ref(history)
+        del history
+        gc.collect()
+
+        assert history_ref() is None
+
+
+class TestBufferedHistoryReads:
+    def test_pending_updates_are_visible_right_away(self, buffered_history):
+        history = buffered_history()
+        history.history.set_status("auto", "proj1", AutomatonRunResult("fail", error="oops"))
+        history.history.set_status("auto", "proj2", AutomatonRunResult("success"))
+
+        history.set_status("auto", "proj1", AutomatonRunResult("success"))
+        history.set_status("other", "proj3", AutomatonRunResult("success"))
+
+        assert history.get_status("auto", "proj1") == AutomatonRunResult("success")
+        assert history.read("auto") == {
+            "proj1": AutomatonRunResult("success"),
+            "proj2": AutomatonRunResult("success"),
+        }
+
+    def test_query_prefers_pending_updates(self, buffered_history):
+        history = buffered_history()
+        history.history.set_status("auto", "proj1", AutomatonRunResult("fail", error="oops"))
+        history.history.set_status("auto", "proj2", AutomatonRunResult("fail", error="oops"))
+
+        history.set_status("auto", "proj1", AutomatonRunResult("success"))
+        history.set_status("auto", "proj3", AutomatonRunResult("fail", error="oops"))
+
+        assert set(dict(history.query("auto", statuses=["fail"]))) == {"proj2", "proj3"}
+        assert set(dict(history.query("auto", project_ids=["proj1", "proj3"]))) == {"proj1", "proj3"}
+
+
+class CountingHistory(InMemoryHistory):
+    def __init__(self) -> None:
+        super().__init__()
+        self.writes = 0
+
+    def set_status(self, automaton_name: str, project_id: str, status: AutomatonRunResult):
+        self.writes += 1
+        super().set_status(automaton_name, project_id, status)
+
+
+class TestBufferedHistoryWithAutomaton:
+    @pytest.mark.parametrize("workers", [1, 2])
+    def test_each_project_is_written_once(self, tmp_local_project, workers):
+        history = BufferedHistory(CountingHistory(), flush_every=1000, flush_interval=1000)
+        dir = tmp_local_project(structure={"src": {"hello.txt": "hello"}})
+
+        Automaton(
+            "auto",
+            history=history,
+            config=Config.get_default(workers=workers).set_vcs(dont_disrupt_prior_state=False),
+            projects=[Project(f"proj{i}", rootdir=dir) for i in range(5)],
+            tasks=[lambda ctx, file: None],
+        ).run(skip_validation=True)
+        history.close()
+
+        assert t.cast(CountingHistory, history.history).writes == 5
+        assert {run.status for run in history.history.read("auto").values()} == {"success"}
+
+    def test_pending_updates_are_flushed_at_the_end_of_run(self, buffered_history, tmp_local_project):
+        history = buffered_history()
+        dir = tmp_local_project(structure={"src": {"hello.txt": "hello"}})
+
+        Automaton(
+            "auto",
+            history=history,
+            config=Config.get_default().set_vcs(dont_disrupt_prior_state=False),
+            projects=[Project("proj1", rootdir=dir)],
+            tasks=[lambda ctx, file: None],
+        ).run(skip_validation=True)
+
+        assert history.history.get_status("auto", "proj1").status == "success"
+
+    def test_pending_updates_are_flushed_on_stop_on_fail(self, buffered_history, tmp_local_project):
+        history = buffered_history()
+        dir = tmp_local_project(structure={"src": {"hello.txt": "hello"}})
+
+        def failing_task(ctx, file):
+            raise Exception("oops")
+
+        Automaton(
+            "auto",
+            history=history,
+            config=Config.get_default(stop_on_fail=True).set_vcs(dont_disrupt_prior_state=False),
+            projects=[Project("proj1", rootdir=dir), Project("proj2", rootdir=dir)],
+            tasks=[failing_task],
+        ).run(skip_validation=True)
+
+        assert history.history.read("auto") == {"proj1": AutomatonRunResult("fail", error="oops")}
+
+    def test_projects_are_marked_as_running_while_processed(self, buffered_history, tmp_local_project):
+        history = buffered_history()
+        dir = tmp_local_project(structure={"src": {"hello.txt": "hello"}})
+        seen_statuses = []
+
+        def check_status(ctx, file):
+            history.flush()
+            seen_statuses.append(history.history.get_status("auto", "proj1").status)
+
+        Automaton(
+            "auto",
+            history=history,
+            config=Config.get_default().set_vcs(dont_disrupt_prior_state=False),
+            projects=[Project("proj1", rootdir=dir)],
+            tasks=[check_status],
+        ).run(skip_validation=True)
+
+        assert seen_statuses == ["running"]
+        assert history.history.get_status("auto", "proj1").status == "success"
@@ -1,8 +1,9 @@
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
 import pytest
 
-from automyte import AutomatonRunResult, InFileHistory
+from automyte import AutomatonRunResult, InFileHistory, RunMetrics
 
 
 class TestInFileHistoryRead:
@@ -149,3 +150,164 @@ class TestInFileHistorySetStatus:
 
         separate_history_instance = InFileHistory(filename=filename)
         assert separate_history_instance.get_status("auto", "proj1") == AutomatonRunResult("success")
+
+
+class TestInFileHistoryQuery:
+    def test_filters_by_statuses_and_project_ids(self, tmp_csv_file):
+        data = [
+            ["automaton", "project", "status", "error"],
+            ["auto", "proj1", "fail", "oops"],
+            ["auto", "proj2", "success", ""],
+            ["auto", "proj3", "fail", ""],
+            ["auto2", "proj1", "fail", ""],
+        ]
+        history = InFileHistory(filename=tmp_csv_file(data))
+
+        assert set(dict(history.query("auto", statuses=["fail"]))) == {"proj1", "proj3"}
+        assert set(dict(history.query("auto", statuses=["fail"], project_ids=["proj2", "proj3"]))) == {"proj3"}
+
+
+class TestInFileHistoryMetrics:
+    @pytest.mark.parametrize("append_only", [False, True])
+    def test_metrics_are_saved_and_read_back(self, tmp_csv_file, append_only):
+        metrics = RunMetrics("run1", 100.5, 102.0, 1.5, 0.25, files_scanned=10, files_modified=2, bytes_read=1024)
+        history = InFileHistory(tmp_csv_file([[]]), append_only=append_only)
+
+        history.set_status("auto", "proj1", AutomatonRunResult("success", metrics=metrics))
+        history.set_status("auto", "proj2", AutomatonRunResult("skipped"))
+
+        result = InFileHistory(history.filepath, append_only=append_only).read("auto")
+        assert result["proj1"].metrics == metrics
+        assert result["proj2"].metrics is None
+
+    def test_reads_records_without_metrics_columns(self, tmp_csv_file):
+        data = [
+            ["automaton", "project", "status", "error"],
+            ["auto", "proj1", "success", ""],
+        ]
+
+        result = InFileHistory(filename=tmp_csv_file(data)).get_status("auto", "proj1")
+
+        assert result == AutomatonRunResult(status="success")
+        assert result.metrics is None
+
+
+class TestInFileHistoryAppendOnly:
+    def test_set_status_appends_single_record(self, tmp_csv_file):
+        data = [
+            ["automaton", "project", "status", "error"],
+            ["auto", "proj1", "skipped", ""],
+        ]
+        filename = tmp_csv_file(data)
+        original_contents = filename.read_text()
+
+        InFileHistory(filename, append_only=True).set_status("auto", "proj1", AutomatonRunResult("fail", "oops"))
+
+        contents = filename.read_text()
+        assert contents.startswith(original_contents)
+        assert contents[len(original_contents) :].strip() == "auto|proj1|fail|oops||||||||||"
+
+    def test_latest_record_wins(self, tmp_csv_file):
+        history = InFileHistory(filename=tmp_csv_file([[]]), append_only=True)
+
+        history.set_status("auto", "proj1", AutomatonRunResult("fail", "oops"))
+        history.set_status("auto", "proj1", AutomatonRunResult("success"))
+
+        assert history.get_status("auto", "proj1") == AutomatonRunResult("success")
+        assert InFileHistory(filename=history.filepath).get_status("auto", "proj1") == AutomatonRunResult("success")
+
+    def test_creates_file_with_header_on_the_first_run(self, tmp_local_project):
+        dir = tmp_local_project(structure={"src": {}})
+        history = InFileHistory(filename=f"{dir}/src", append_only=True)
+
+        history.set_status("auto", "proj1", AutomatonRunResult("success"))
+
+        assert history.filepath.read_text().splitlines()[0].startswith("automaton|project|status|error|run_id|")
+        assert history.read("auto") == {"proj1": AutomatonRunResult("success")}
+
+    def test_picks_up_records_appended_by_other_instances(self, tmp_csv_file):
+        filename = tmp_csv_file([["automaton", "project", "status", "error"]])
+        history = InFileHistory(filename, append_only=True)
+        other_history = InFileHistory(filename, append_only=True)
+        assert history.read("auto") == {}
+
+        other_history.set_status("auto", "proj1", AutomatonRunResult("success"))
+        other_history.set_status("auto", "proj2", AutomatonRunResult("skipped"))
+
+        assert history.read("auto") == {
+            "proj1": AutomatonRunResult("success"),
+            "proj2": AutomatonRunResult("skipped"),
+        }
+
+    def test_rebuilds_index_if_file_was_rewritten(self, tmp_csv_file):
+        filename = tmp_csv_file([["automaton", "project", "status", "error"], ["auto", "proj1", "fail", "oops"]])
+        history = InFileHistory(filename, append_only=True)
+        assert history.get_status("auto", "proj1") == AutomatonRunResult("fail", "oops")
+
+        filename.write_text("automaton|project|status|error\nauto|proj2|success|\n")
+
+        assert history.read("auto") == {"proj2": AutomatonRunResult("success")}
+
+    def test_compact_collapses_superseded_records(self, tmp_csv_file):
+        history = InFileHistory(filename=tmp_csv_file([[]]), append_only=True)
+        for status in ("fail", "skipped", "success"):
+            history.set_status("auto", "proj1", AutomatonRunResult(status))
+        history.set_status("auto", "proj2", AutomatonRunResult("fail", "oops"))
+
+        history.compact()
+
+        assert len(history.filepath.read_text().splitlines()) == 3
+        assert history.read("auto") == {
+            "proj1": AutomatonRunResult("success"),
+            "proj2": AutomatonRunResult("fail", "oops"),
+        }
+
+    def test_compact_applies_retention_policy(self, tmp_csv_file):
+        history = InFileHistory(filename=tmp_csv_file([[]]), append_only=True)
+        history.set_status("auto", "proj1", AutomatonRunResult("success"))
+        history.set_status("old_auto", "proj1", AutomatonRunResult("success"))
+
+        history.compact(retain=lambda automaton, project, run: automaton != "old_auto")
+
+        assert history.read("auto") == {"proj1": AutomatonRunResult("success")}
+        assert history.read("old_auto") == {}
+
+    def test_compacts_automatically_after_threshold(self, tmp_csv_file):
+        history = InFileHistory(filename=tmp_csv_file([[]]), append_only=True, compact_after=3)
+
+        for status in ("fail", "skipped", "fail", "success"):
+            history.set_status("auto", "proj1", AutomatonRunResult(status))
+
+        assert len(history.filepath.read_text().splitlines()) == 2
+        assert history.get_status("auto", "proj1") == AutomatonRunResult("success")
+
+
+def write_statuses(filename: Path, append_only: bool, worker: int, count: int):
+    history = InFileHistory(filename, append_only=append_only)
+    for i in range(count):
+        history.set_status("auto", f"proj{worker}_{i}", AutomatonRunResult("success"))
+
+
+class TestInFileHistoryConcurrentWriters:
+    @pytest.mark.parametrize("append_only", [False, True])
+    def test_no_updates_are_lost_between_processes(self, tmp_csv_file, append_only):
+        filename = tmp_csv_file([["automaton", "project", "status", "error"]])
+
+        with ProcessPoolExecutor(max_workers=4) as executor:
+            for future in [executor.submit(write_statuses, filename, append_only, worker, 25) for worker in range(4)]:
+                future.result()
+
+        history = InFileHistory(filename, append_only=append_only)
+        assert len(history.read("auto")) == 100
+        assert all(run == AutomatonRunResult("success") for run in history.read("auto").values())
+
+    def test_file_is_never_seen_half_written(self, tmp_csv_file):
+        filename = tmp_csv_file([["automaton", "project", "status", "error"]])
+        history = InFileHistory(filename)
+        history.set_status("auto", "proj", AutomatonRunResult("success"))
+
+        with ProcessPoolExecutor(max_workers=2) as executor:
+            writer = executor.submit(write_statuses, filename, False, 0, 50)
+            while not writer.done():
+                assert history.get_status("auto", "proj") == AutomatonRunResult("success")
+            writer.result()
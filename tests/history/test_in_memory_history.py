@@ -0,0 +1,26 @@
+from automyte import AutomatonRunResult, InMemoryHistory
+
+
+class TestInMemoryHistory:
+    def test_keeps_automatons_separate(self):
+        history = InMemoryHistory()
+
+        history.set_status("auto1", "proj1", AutomatonRunResult("success"))
+        history.set_status("auto2", "proj1", AutomatonRunResult("fail", error="oops"))
+
+        assert history.read("auto1") == {"proj1": AutomatonRunResult("success")}
+        assert history.get_status("auto2", "proj1") == AutomatonRunResult("fail", error="oops")
+        assert history.get_status("auto3", "proj1") == AutomatonRunResult("new")
+
+    def test_query_follows_status_changes(self):
+        history = InMemoryHistory()
+        history.set_status("auto", "proj1", AutomatonRunResult("fail"))
+        history.set_status("auto", "proj2", AutomatonRunResult("fail"))
+
+        history.set_status("auto", "proj1", AutomatonRunResult("success"))
+
+        assert dict(history.query("auto", statuses=["fail"])) == {"proj2": AutomatonRunResult("fail")}
+        assert dict(history.query("auto", statuses=["success", "fail"], project_ids=["proj1"])) == {
+            "proj1": AutomatonRunResult("success")
+        }
+        assert dict(history.query("auto", project_ids=["proj2", "missing"])) == {"proj2": AutomatonRunResult("fail")}
@@ -0,0 +1,155 @@
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+from automyte import AutomatonRunResult, RunMetrics, SqliteHistory
+
+
+@pytest.fixture
+def tmp_sqlite_history(tmp_local_project):
+    def _tmp_sqlite_history_factory(statuses: list[tuple[str, str, AutomatonRunResult]] | None = None):
+        dir = tmp_local_project(structure={"history": {}})
+        history = SqliteHistory(filename=Path(dir) / "history" / "history.db")
+        for automaton_name, project_id, status in statuses or []:
+            history.set_status(automaton_name=automaton_name, project_id=project_id, status=status)
+
+        return history
+
+    return _tmp_sqlite_history_factory
+
+
+class TestSqliteHistoryRead:
+    def test_read_returns_only_given_automaton_projects(self, tmp_sqlite_history):
+        history = tmp_sqlite_history(
+            [
+                ("auto1", "proj1", AutomatonRunResult("success")),
+                ("auto1", "proj2", AutomatonRunResult("skipped")),
+                ("auto2", "proj1", AutomatonRunResult("fail", error="oops")),
+            ]
+        )
+
+        assert history.read("auto1") == {
+            "proj1": AutomatonRunResult("success"),
+            "proj2": AutomatonRunResult("skipped"),
+        }
+        assert history.read("auto2") == {"proj1": AutomatonRunResult("fail", error="oops")}
+
+    def test_read_from_empty_history(self, tmp_sqlite_history):
+        assert tmp_sqlite_history().read("whatever") == {}
+
+    def test_read_will_raise_if_dir_doesnt_exist(self):
+        with pytest.raises(ValueError, match=".*does not exist*"):
+            SqliteHistory(filename="some/nonexistant/like/definitely/path/").read("whatever")
+
+    def test_creates_default_file_in_existing_dir(self, tmp_local_project):
+        dir = tmp_local_project(structure={"src": {}})
+
+        SqliteHistory(filename=f"{dir}/src/").read("whatever")
+
+        assert (Path(dir) / "src" / "automyte_history.db").exists()
+
+
+class TestSqliteHistoryStatus:
+    def test_retrieval_for_new_project(self, tmp_sqlite_history):
+        assert tmp_sqlite_history().get_status("auto", "proj1") == AutomatonRunResult("new")
+
+    def test_override_of_previous_status(self, tmp_sqlite_history):
+        history = tmp_sqlite_history([("auto", "proj1", AutomatonRunResult("skipped"))])
+
+        history.set_status("auto", "proj1", AutomatonRunResult("fail", error="whoops"))
+
+        assert history.get_status("auto", "proj1") == AutomatonRunResult("fail", error="whoops")
+
+    def test_override_doesnt_touch_other_projects(self, tmp_sqlite_history):
+        history = tmp_sqlite_history(
+            [
+                ("auto", "proj2", AutomatonRunResult("skipped")),
+                ("auto2", "proj1", AutomatonRunResult("fail", "oops")),
+            ]
+        )
+
+        history.set_status("auto", "proj1", AutomatonRunResult("success"))
+
+        assert history.get_status("auto", "proj2") == AutomatonRunResult("skipped")
+        assert history.get_status("auto2", "proj1") == AutomatonRunResult("fail", "oops")
+
+    def test_data_is_persisted_between_instances(self, tmp_sqlite_history):
+        history = tmp_sqlite_history([("auto", "proj1", AutomatonRunResult("success"))])
+
+        assert SqliteHistory(filename=history.filepath).get_status("auto", "proj1") == AutomatonRunResult("success")
+
+
+class TestSqliteHistoryQuery:
+    def test_returns_only_projects_with_given_status(self, tmp_sqlite_history):
+        history = tmp_sqlite_history(
+            [
+                ("auto", "proj1", AutomatonRunResult("fail", error="oops")),
+                ("auto", "proj2", AutomatonRunResult("success")),
+                ("auto", "proj3", AutomatonRunResult("fail", error="whoops")),
+                ("auto2", "proj4", AutomatonRunResult("fail")),
+            ]
+        )
+
+        assert dict(history.query("auto", statuses=["fail"])) == {
+            "proj1": AutomatonRunResult("fail", error="oops"),
+            "proj3": AutomatonRunResult("fail", error="whoops"),
+        }
+
+    def test_filters_by_statuses_and_project_ids(self, tmp_sqlite_history):
+        history = tmp_sqlite_history(
+            [
+                ("auto", "proj1", AutomatonRunResult("fail")),
+                ("auto", "proj2", AutomatonRunResult("success")),
+                ("auto", "proj3", AutomatonRunResult("skipped")),
+            ]
+        )
+
+        assert set(dict(history.query("auto", statuses=["fail", "success"], project_ids=["proj2", "proj3"]))) == {
+            "proj2"
+        }
+        assert set(dict(history.query("auto", project_ids=["proj1", "proj3", "missing"]))) == {"proj1", "proj3"}
+
+    def test_looks_up_project_ids_in_chunks(self, tmp_sqlite_history):
+        history = tmp_sqlite_history([("auto", f"proj{i}", AutomatonRunResult("success")) for i in range(5)])
+        history._query_chunk_size = 2
+
+        assert len(list(history.query("auto", project_ids=[f"proj{i}" for i in range(10)]))) == 5
+
+    def test_lookup_uses_status_index(self, tmp_sqlite_history):
+        history = tmp_sqlite_history([("auto", "proj1", AutomatonRunResult("fail"))])
+
+        with sqlite3.connect(history.filepath) as connection:
+            plan = connection.execute(
+                "EXPLAIN QUERY PLAN SELECT project, error FROM history WHERE automaton = ? AND status = ?",
+                ("auto", "fail"),
+            ).fetchall()
+
+        assert "history_by_status" in str(plan)
+
+
+class TestSqliteHistoryMetrics:
+    def test_metrics_are_saved_and_read_back(self, tmp_sqlite_history):
+        metrics = RunMetrics("run1", 100.5, 102.0, 1.5, 0.25, files_scanned=10, files_modified=2, bytes_read=1024)
+        history = tmp_sqlite_history([("auto", "proj1", AutomatonRunResult("success", metrics=metrics))])
+        history.set_status("auto", "proj2", AutomatonRunResult("skipped"))
+
+        assert history.get_status("auto", "proj1").metrics == metrics
+        assert history.read("auto")["proj2"].metrics is None
+        assert dict(history.query("auto", statuses=["success"]))["proj1"].metrics == metrics
+
+    def test_migrates_database_created_without_metrics_columns(self, tmp_local_project):
+        filepath = Path(tmp_local_project(structure={"history": {}})) / "history" / "history.db"
+        with sqlite3.connect(filepath) as connection:
+            connection.execute(
+                "CREATE TABLE history (automaton TEXT, project TEXT, status TEXT, error TEXT, "
+                "PRIMARY KEY (automaton, project))"
+            )
+            connection.execute("INSERT INTO history VALUES ('auto', 'proj1', 'fail', 'oops')")
+        connection.close()
+
+        history = SqliteHistory(filename=filepath)
+        history.set_status("auto", "proj2", AutomatonRunResult("success", metrics=RunMetrics("run1", 1, 2, 1, 0.5)))
+
+        assert history.get_status("auto", "proj1") == AutomatonRunResult("fail", error="oops")
+        assert history.get_status("auto", "proj2").metrics == RunMetrics("run1", 1, 2, 1, 0.5)
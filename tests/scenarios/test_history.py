@@ -8,6 +8,7 @@ from automyte import (
     LocalFilesExplorer,
     Project,
     RunContext,
+    SqliteHistory,
     TasksFlow,
     guards,
 )
@@ -58,3 +59,31 @@ def test_updates_to_fail(tmp_local_project):
     assert history.get_status("hello", "proj1") == AutomatonRunResult(status="fail", error="forced")
     # Config.stop_on_fail = True by default, so we should never reach proj2, so it should be in "not_run" status.
     assert history.get_status("hello", "proj2") == AutomatonRunResult(status="new")
+
+
+def test_sqlite_history_reruns_only_failed_projects(tmp_local_project):
+    rootdir1 = tmp_local_project(structure={"src": {"hello.txt": "hello there"}})
+    rootdir2 = tmp_local_project(structure={"src": {"bye.txt": "bye there"}})
+    ran_for = []
+
+    def fail_for_hello(ctx: RunContext, file: File):
+        ran_for.append(ctx.project.project_id)
+        if file.name == "hello.txt":
+            raise ValueError("forced")
+
+    history = SqliteHistory(filename=tmp_local_project(structure={"history": {}}))
+    automaton = Automaton(
+        name="hello",
+        config=Config.get_default(stop_on_fail=False).set_vcs(dont_disrupt_prior_state=False),
+        projects=[Project(rootdir=rootdir1, project_id="proj1"), Project(rootdir=rootdir2, project_id="proj2")],
+        tasks=TasksFlow([fail_for_hello]),
+        history=history,
+    )
+
+    automaton.run()
+    automaton.config.target = "failed"
+    automaton.run()
+
+    assert ran_for == ["proj1", "proj2", "proj1"]
+    assert history.get_status("hello", "proj1") == AutomatonRunResult(status="fail", error="forced")
+    assert history.get_status("hello", "proj2") == AutomatonRunResult(status="success")
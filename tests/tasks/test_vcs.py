@@ -1,3 +1,4 @@
+import asyncio
 from datetime import datetime, timedelta
 from unittest.mock import patch
 
@@ -103,6 +104,21 @@ class TestVCSTaskCommit:
             result = vcs.commit("failure")(ctx, file)
             assert result == TaskReturn(instruction="abort", status="errored", value="oops")
 
+    def test_acall_creates_commit_for_git_vcs(self, tmp_git_repo, run_ctx):
+        dir = tmp_git_repo(
+            initial_structure={"src": {"hello.txt": "hello vcs task"}},
+            unstaged_structure={"src": {"hello.txt": "hello new commit"}},
+        )
+        ctx = run_ctx(dir=dir)
+        file = OSFile(fullname=f"{dir}/src/hello.txt")
+        asyncio.run(vcs.add(".").acall(ctx, file))
+
+        result = asyncio.run(vcs.commit("commit #2").acall(ctx, file))
+
+        commits_list = bash.execute(["git", "-C", dir, "log", "--oneline"]).output.split("\n")
+        assert result.status == "processed"
+        assert "commit #2" in commits_list[0]
+
 
 class TestVCSTaskPush:
     def test_calls_correct_cmd_for_git_vcs(self, tmp_git_repo, run_ctx):
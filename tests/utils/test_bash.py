@@ -1,3 +1,5 @@
+import asyncio
+
 from automyte.utils import bash
 
 
@@ -11,3 +13,15 @@ def test_failure_execution():
     result = bash.execute(["ls", "/kladjslkajdslkjasd"])
     assert result.status == "fail"
     assert "no such file or directory" in result.output.lower()
+
+
+def test_async_plain_execution():
+    result = asyncio.run(bash.aexecute(["echo", "stdout test"]))
+    assert result.status == "success"
+    assert result.output == "stdout test"
+
+
+def test_async_failure_execution():
+    result = asyncio.run(bash.aexecute(["ls", "/kladjslkajdslkjasd"]))
+    assert result.status == "fail"
+    assert "no such file or directory" in result.output.lower()
@@ -0,0 +1,22 @@
+import pytest
+
+from automyte.utils.iterables import batched
+
+
+class TestBatched:
+    def test_splits_into_batches_with_shorter_last_one(self):
+        assert list(batched(range(7), 3)) == [(0, 1, 2), (3, 4, 5), (6,)]
+
+    def test_consumes_iterators_lazily(self):
+        numbers = iter(range(10))
+        batches = batched(numbers, 4)
+
+        assert next(batches) == (0, 1, 2, 3)
+        assert next(numbers) == 4
+
+    def test_empty_iterable_has_no_batches(self):
+        assert list(batched([], 3)) == []
+
+    def test_rejects_non_positive_size(self):
+        with pytest.raises(ValueError):
+            list(batched([1], 0))
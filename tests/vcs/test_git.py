@@ -1,3 +1,4 @@
+import asyncio
 from pathlib import Path
 from unittest.mock import patch
 
@@ -94,3 +95,32 @@ class TestGitPreserveState:
         with git.preserve_state(Config.get_default().set_vcs(dont_disrupt_prior_state=False).vcs) as new_workdir:
             assert len(bash.execute(["git", "-C", dir, "worktree", "list"]).output.splitlines()) == 1
             assert new_workdir == original_workdir
+
+
+class TestGitAsync:
+    def test_arun_actually_runs_command(self, tmp_git_repo):
+        dir = tmp_git_repo(
+            initial_structure={"src": {"hello.txt": "hello git"}}, unstaged_structure={"src": {"hello.txt": ""}}
+        )
+
+        result = asyncio.run(Git(rootdir=dir).arun("add", "src"))
+
+        staged_files_diff = bash.execute(["git", "-C", dir, "diff", "--name-only", "--cached"]).output
+        assert result.status == "success"
+        assert "src/hello.txt" in staged_files_diff
+
+    def test_apreserve_state_creates_and_removes_worktree(self, tmp_git_repo):
+        dir = tmp_git_repo(initial_structure={"src": {"hello.txt": "hello git"}})
+        git = Git(rootdir=dir)
+        worktrees = []
+
+        async def work_in_worktree():
+            async with git.apreserve_state(Config.get_default().set_vcs(work_branch="verify").vcs) as new_workdir:
+                worktrees.append(bash.execute(["git", "-C", dir, "worktree", "list"]).output)
+                assert git.workdir == new_workdir
+
+        asyncio.run(work_in_worktree())
+
+        assert "[verify]" in worktrees[0]
+        assert len(bash.execute(["git", "-C", dir, "worktree", "list"]).output.splitlines()) == 1
+        assert git.workdir == dir
@@ -0,0 +1,83 @@
+from pathlib import Path
+
+from automyte import ContainsFilter, Git, GitGrepIndex, LocalFilesExplorer
+from automyte.utils import bash
+
+
+class TestGitGrepIndex:
+    def test_finds_files_containing_any_of_the_texts(self, tmp_git_repo):
+        dir = tmp_git_repo(
+            {"src": {"a.py": "import os", "b.py": "import sys"}, "c.txt": "nothing"},
+            unstaged_structure={"untracked.py": "import os.path"},
+        )
+        index = GitGrepIndex(Git(rootdir=dir))
+
+        assert index.files_containing(["import os"]) == {"src/a.py", "untracked.py"}
+        assert index.files_containing(["import sys", "nothing"]) == {"src/b.py", "c.txt"}
+        assert index.files_containing(["missing"]) == set()
+
+    def test_finds_files_matching_patterns(self, tmp_git_repo):
+        dir = tmp_git_repo({"a.py": "import os", "b.py": "import sys"})
+        index = GitGrepIndex(Git(rootdir=dir))
+
+        assert index.files_matching([r"import (os|json)"]) in ({"a.py"}, None)  # None if git is built without pcre.
+
+    def test_ignored_files_are_searched_as_well(self, tmp_git_repo):
+        dir = tmp_git_repo(
+            {".gitignore": "build/", "src": {"a.py": "hello"}}, unstaged_structure={"build": {"b.py": "hello"}}
+        )
+
+        assert GitGrepIndex(Git(rootdir=dir)).files_containing(["hello"]) == {"src/a.py", "build/b.py"}
+
+    def test_locations_ignored_by_explorer_are_not_searched(self, tmp_git_repo):
+        dir = tmp_git_repo(
+            {"src": {"a.py": "hello"}, "docs": {"b.md": "hello"}, "c.log": "hello"},
+            unstaged_structure={"node_modules": {"pkg": {"i.js": "hello"}}, "src": {"node_modules": {"j.js": "hello"}}},
+        )
+
+        assert GitGrepIndex(Git(rootdir=dir)).files_containing(["hello"]) == {"src/a.py", "docs/b.md", "c.log"}
+        assert GitGrepIndex(Git(rootdir=dir), exclude=["/docs", "*.log"]).files_containing(["hello"]) == {
+            "src/a.py",
+            "node_modules/pkg/i.js",
+            "src/node_modules/j.js",
+        }
+
+    def test_can_not_tell_anything_if_there_are_nested_repositories(self, tmp_git_repo):
+        dir = tmp_git_repo({"a.txt": "needle"}, unstaged_structure={"vendored": {"inner.txt": "needle"}})
+        bash.execute(["git", "-C", f"{dir}/vendored", "init"])
+
+        assert GitGrepIndex(Git(rootdir=dir)).files_containing(["needle"]) is None
+
+    def test_can_not_tell_anything_if_there_are_submodules(self, tmp_git_repo):
+        submodule = tmp_git_repo({"inner.txt": "needle"})
+        dir = tmp_git_repo({"a.txt": "needle"})
+        bash.execute(["git", "-C", dir, "-c", "protocol.file.allow=always", "submodule", "add", submodule, "sub"])
+
+        assert GitGrepIndex(Git(rootdir=dir)).files_containing(["needle"]) is None
+
+    def test_can_not_tell_anything_if_grep_fails(self, tmp_local_project):
+        dir = tmp_local_project({"a.py": "hello"})
+
+        assert GitGrepIndex(Git(rootdir=dir)).files_containing(["hello"]) is None
+
+
+class TestLocalFilesExplorerWithGitGrep:
+    def test_files_of_nested_repositories_are_found(self, tmp_git_repo):
+        dir = tmp_git_repo({"a.txt": "hello"}, unstaged_structure={"vendored": {"inner.txt": "needle"}})
+        bash.execute(["git", "-C", f"{dir}/vendored", "init"])
+        explorer = LocalFilesExplorer(
+            rootdir=dir, filter_by=ContainsFilter("needle"), index=GitGrepIndex(Git(rootdir=dir))
+        )
+
+        assert [f.name for f in explorer.explore()] == ["inner.txt"]
+
+    def test_only_candidate_files_are_read(self, tmp_git_repo):
+        dir = tmp_git_repo({"src": {"a.py": "import os", "b.py": "import sys"}, "c.txt": "import"})
+        explorer = LocalFilesExplorer(
+            rootdir=dir, filter_by=ContainsFilter("import os"), index=GitGrepIndex(Git(rootdir=dir))
+        )
+
+        files = list(explorer.explore())
+
+        assert [f.fullpath for f in files] == [Path(dir) / "src" / "a.py"]
+        assert explorer.get_stats().bytes_read == len("import os")